@@ -0,0 +1,74 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+
+Times expanding recurring series of a given number of occurrences locally: the whole series, and a one month
+window at its end - found by jumping straight to it, and by expanding everything and filtering. Run from the root of
+the repository:
+
+    python -m benchmarks.expand_recurrence [number of occurrences]
+"""
+from __future__ import print_function
+
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+from pytz import timezone, utc
+
+from pyexchange import recurrence
+from pyexchange.exchange2010 import Exchange2010CalendarEventRecord
+
+START = datetime(2020, 1, 6, 15, tzinfo=utc)
+
+SERIES = [
+  (u'daily', None, timedelta(days=1)),
+  (u'weekly', u'Monday Wednesday Friday', timedelta(days=7) // 3),
+  (u'monthly', None, timedelta(days=31)),
+]
+
+
+def make_series(recurrence_type, days, count, step):
+  # A rough end date - expansion is capped at count occurrences below either way
+  return Exchange2010CalendarEventRecord(
+    start=START, end=START + timedelta(hours=1), recurrence=recurrence_type, recurrence_days=days,
+    recurrence_end_date=(START + step * (count + 7)).date(),
+  )
+
+
+def expand_all(event, count, tz):
+  return [occurrence for _, occurrence in zip(range(count), recurrence.expand(event, tz=tz))]
+
+
+def main(count):
+  tz = timezone(u'America/Chicago')
+
+  for recurrence_type, days, step in SERIES:
+    event = make_series(recurrence_type, days, count, step)
+    occurrences = expand_all(event, count, tz)
+    window_end = occurrences[-1].end
+    window_start = window_end - timedelta(days=31)
+
+    def filtered():
+      return [o for o in expand_all(event, count, tz) if o.end > window_start and o.start < window_end]
+
+    def windowed():
+      return list(recurrence.expand(event, start=window_start, end=window_end, tz=tz))
+
+    assert filtered() == windowed()
+
+    everything = min(timeit.repeat(lambda: expand_all(event, count, tz), number=1, repeat=3))
+    by_filtering = min(timeit.repeat(filtered, number=1, repeat=3))
+    by_seeking = min(timeit.repeat(windowed, number=10, repeat=3)) / 10
+
+    print(u'%s, %s occurrences' % (recurrence_type, len(occurrences)))
+    print(u'  whole series:           %.4fs (%.1fus per occurrence)' % (everything, everything / len(occurrences) * 1e6))
+    print(u'  last month, filtered:   %.4fs' % by_filtering)
+    print(u'  last month, seeked:     %.4fs' % by_seeking)
+    print(u'  speedup:                %.0fx' % (by_filtering / by_seeking))
+
+
+if __name__ == '__main__':
+  main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,84 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+
+Compares the single pass CalendarItem parser against the old approach of running one absolute XPath query per
+property. Run from the root of the repository:
+
+    python -m benchmarks.parse_calendar_items [number of events]
+"""
+from __future__ import print_function
+
+import sys
+import timeit
+from copy import deepcopy
+
+from lxml import etree
+
+from pyexchange import Exchange2010Service
+from pyexchange.exchange2010 import Exchange2010CalendarEvent, soap_request
+from tests.exchange2010.fixtures import GET_ITEM_RESPONSE
+
+NAMESPACES = soap_request.NAMESPACES
+
+LEGACY_PROPERTY_MAP = {
+  u'subject': {u'xpath': u'//m:Items/t:CalendarItem/t:Subject'},
+  u'location': {u'xpath': u'//m:Items/t:CalendarItem/t:Location'},
+  u'availability': {u'xpath': u'//m:Items/t:CalendarItem/t:LegacyFreeBusyStatus'},
+  u'start': {u'xpath': u'//m:Items/t:CalendarItem/t:Start', u'cast': u'datetime'},
+  u'end': {u'xpath': u'//m:Items/t:CalendarItem/t:End', u'cast': u'datetime'},
+  u'html_body': {u'xpath': u'//m:Items/t:CalendarItem/t:Body[@BodyType="HTML"]'},
+  u'text_body': {u'xpath': u'//m:Items/t:CalendarItem/t:Body[@BodyType="Text"]'},
+  u'_type': {u'xpath': u'//m:Items/t:CalendarItem/t:CalendarItemType'},
+  u'reminder_minutes_before_start': {u'xpath': u'//m:Items/t:CalendarItem/t:ReminderMinutesBeforeStart', u'cast': u'int'},
+  u'is_all_day': {u'xpath': u'//m:Items/t:CalendarItem/t:IsAllDayEvent', u'cast': u'bool'},
+  u'recurrence_end_date': {u'xpath': u'//m:Items/t:CalendarItem/t:Recurrence/t:EndDateRecurrence/t:EndDate', u'cast': u'date_only_naive'},
+  u'recurrence_interval': {u'xpath': u'//m:Items/t:CalendarItem/t:Recurrence/*/t:Interval', u'cast': u'int'},
+  u'recurrence_days': {u'xpath': u'//m:Items/t:CalendarItem/t:Recurrence/t:WeeklyRecurrence/t:DaysOfWeek'},
+}
+
+LEGACY_PERSON_MAP = {
+  u'name': {u'xpath': u't:Mailbox/t:Name'},
+  u'email': {u'xpath': u't:Mailbox/t:EmailAddress'},
+  u'response': {u'xpath': u't:ResponseType'},
+  u'last_response': {u'xpath': u't:LastResponseTime', u'cast': u'datetime'},
+}
+
+
+def legacy_parse(service, response):
+  """ The pre single pass parser: one absolute XPath per property, plus a rescan for each group of people. """
+  result = service._xpath_to_dict(element=response, property_map=LEGACY_PROPERTY_MAP, namespace_map=NAMESPACES)
+  response.xpath(u'//m:Items/t:CalendarItem/t:Recurrence', namespaces=NAMESPACES)
+
+  for organizer in response.xpath(u'//m:Items/t:CalendarItem/t:Organizer/t:Mailbox', namespaces=NAMESPACES):
+    service._xpath_to_dict(element=organizer, property_map={u'name': {u'xpath': u't:Name'}, u'email': {u'xpath': u't:EmailAddress'}}, namespace_map=NAMESPACES)
+
+  for path in (u'RequiredAttendees', u'OptionalAttendees', u'Resources'):
+    for attendee in response.xpath(u'//m:Items/t:CalendarItem/t:%s/t:Attendee' % path, namespaces=NAMESPACES):
+      service._xpath_to_dict(element=attendee, property_map=LEGACY_PERSON_MAP, namespace_map=NAMESPACES)
+
+  response.xpath(u'//m:Items/t:CalendarItem/t:ConflictingMeetings/t:CalendarItem/t:ItemId', namespaces=NAMESPACES)
+  return result
+
+
+def main(count):
+  service = Exchange2010Service(connection=None)
+  parser = Exchange2010CalendarEvent(service=service)
+
+  template = etree.XML(GET_ITEM_RESPONSE.encode(u'utf-8'))
+  calendar_item = template.xpath(u'//m:Items/t:CalendarItem', namespaces=NAMESPACES)[0]
+  responses = [soap_request.M.Items(deepcopy(calendar_item)) for _ in range(count)]
+
+  legacy = min(timeit.repeat(lambda: [legacy_parse(service, response) for response in responses], number=1, repeat=3))
+  single_pass = min(timeit.repeat(lambda: [parser._parse_response_for_get_event(response) for response in responses], number=1, repeat=3))
+
+  print(u'%s events' % count)
+  print(u'  XPath per property: %.3fs' % legacy)
+  print(u'  single pass:        %.3fs' % single_pass)
+  print(u'  speedup:            %.1fx' % (legacy / single_pass))
+
+
+if __name__ == '__main__':
+  main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,135 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+
+asyncio connections to Exchange. These need Python 3.5+ and the httpx and httpx-ntlm packages
+(``pip install pyexchange[async]``), so nothing in pyexchange imports this module for you.
+"""
+import asyncio
+import logging
+
+import httpx
+from httpx_ntlm import HttpNtlmAuth
+
+from .connection import _trace
+from .async_retry import call_with_retries
+from .exceptions import FailedExchangeException, ExchangeTransientConnectionException
+from .retry import RetryPolicy
+
+log = logging.getLogger('pyexchange')
+
+
+class AsyncExchangeBaseConnection(object):
+  """ Base class for asyncio Exchange connections. send is a coroutine. """
+
+  async def send(self, body, headers=None, retries=2, timeout=30, encoding="utf-8"):
+    raise NotImplementedError
+
+  async def close(self):
+    pass
+
+  async def __aenter__(self):
+    return self
+
+  async def __aexit__(self, exc_type, exc_value, traceback):
+    await self.close()
+
+
+class AsyncExchangeNTLMAuthConnection(AsyncExchangeBaseConnection):
+  """
+  Connection to Exchange that uses NTLM authentication. All requests go through one httpx.AsyncClient, so
+  connections are kept alive and reused between requests - call close() (or use ``async with``) when you're done.
+  """
+
+  # Statuses that mean something between us and Exchange is having a bad moment, so the request is worth retrying
+  RETRY_STATUS_CODES = (502, 503, 504)
+
+  def __init__(self, url, username, password, verify_certificate=True, max_connections=10, retry_policy=None, **kwargs):
+    self.url = url
+    self.username = username
+    self.password = password
+    self.verify_certificate = verify_certificate
+    self.max_connections = max_connections
+    self.retry_policy = retry_policy or RetryPolicy()
+    self.client = None
+    self.password_manager = None
+
+  def build_password_manager(self):
+    if self.password_manager:
+      return self.password_manager
+
+    log.debug(u'Constructing password manager')
+
+    self.password_manager = HttpNtlmAuth(self.username, self.password)
+
+    return self.password_manager
+
+  def build_client(self):
+    if self.client:
+      return self.client
+
+    log.debug(u'Constructing async client')
+
+    self.client = httpx.AsyncClient(
+      auth=self.build_password_manager(),
+      verify=self.verify_certificate,
+      limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+    )
+
+    return self.client
+
+  async def send(self, body, headers=None, retries=2, timeout=30, encoding=u"utf-8"):
+    """
+    Posts body to Exchange and returns the response text. Connection errors, timeouts and 502/503/504 responses
+    are retried up to retries times, backing off in between. timeout is the most seconds the whole call may take,
+    retries included.
+    """
+    client = self.build_client()
+
+    _trace(u'request to %s' % self.url, body, encoding)
+
+    def attempt(remaining):
+      return self._post_once(client, body, headers=headers, timeout=remaining)
+
+    response = await call_with_retries(self.retry_policy, attempt, retries, timeout, retry_on=(ExchangeTransientConnectionException,))
+
+    text = response.text
+    _trace(u'response', text)
+    if log.isEnabledFor(logging.DEBUG):
+      log.debug(u'Got body: %s', text)
+
+    return text
+
+  async def _post_once(self, client, body, headers=None, timeout=30):
+    try:
+      # httpx's timeout is per network operation, so wait_for holds the whole request to what's left of the deadline
+      response = await asyncio.wait_for(client.post(self.url, content=body, headers=headers, timeout=timeout), timeout)
+    except (httpx.TransportError, asyncio.TimeoutError) as err:
+      raise ExchangeTransientConnectionException(u'Unable to connect to Exchange: %s' % err)
+    except httpx.HTTPError as err:
+      raise FailedExchangeException(u'Unable to connect to Exchange: %s' % err)
+
+    log.info(u'Got response: %s', response.status_code)
+    log.debug(u'Got response headers: %s', response.headers)
+
+    # Exchange reports SOAP faults - including "server busy" - as a 500 with an XML body. Hand those back so the
+    # service can tell what went wrong.
+    if response.status_code == 500 and u'xml' in response.headers.get(u'Content-Type', u''):
+      return response
+
+    try:
+      response.raise_for_status()
+    except httpx.HTTPError as err:
+      log.debug(response.content)
+      if response.status_code in self.RETRY_STATUS_CODES:
+        raise ExchangeTransientConnectionException(u'Unable to connect to Exchange: %s' % err)
+      raise FailedExchangeException(u'Unable to connect to Exchange: %s' % err)
+
+    return response
+
+  async def close(self):
+    if self.client is not None:
+      await self.client.aclose()
+      self.client = None
@@ -0,0 +1,33 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+
+Retrying for coroutines, with the same RetryPolicy the blocking code uses. Needs Python 3.5+, so nothing in
+pyexchange imports this module for you.
+"""
+import asyncio
+import logging
+
+log = logging.getLogger('pyexchange')
+
+
+async def call_with_retries(retry_policy, func, retries, timeout, retry_on):
+  """
+  RetryPolicy.call for coroutines: awaits func(remaining_seconds) until it returns, retrying up to retries times
+  when it raises one of the exceptions in retry_on, and waiting with asyncio.sleep in between.
+  """
+  deadline = retry_policy.deadline(timeout)
+  attempt = 0
+
+  while True:
+    try:
+      return await func(retry_policy.remaining(deadline))
+    except retry_on as err:
+      log.info(u'Attempt %s failed: %s', attempt + 1, err)
+      delay = retry_policy.next_delay(attempt, retries, deadline, getattr(err, 'back_off', None))
+      if delay is None:
+        raise
+      await asyncio.sleep(delay)
+      attempt += 1
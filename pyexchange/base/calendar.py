@@ -10,6 +10,9 @@ ExchangeEventOrganizer = namedtuple('ExchangeEventOrganizer', ['name', 'email'])
 ExchangeEventAttendee = namedtuple('ExchangeEventAttendee', ['name', 'email', 'required'])
 ExchangeEventResponse = namedtuple('ExchangeEventResponse', ['name', 'email', 'response', 'last_response', 'required'])
 
+# An occurrence of a recurring event that was moved or changed. original_start is when it would otherwise have been.
+ExchangeModifiedOccurrence = namedtuple('ExchangeModifiedOccurrence', ['id', 'change_key', 'start', 'end', 'original_start'])
+
 
 RESPONSE_ACCEPTED = u'Accept'
 RESPONSE_DECLINED = u'Decline'
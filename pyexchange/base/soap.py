@@ -5,19 +5,27 @@ Licensed under the Apache License, Version 2.0 (the "License");?you may not use
 Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 """
 import logging
+import re
 
 from lxml import etree
 from lxml.builder import ElementMaker
 from datetime import datetime
 from pytz import utc
 
-from ..exceptions import FailedExchangeException
+from ..exceptions import (
+  FailedExchangeException, ExchangeServerBusyException, ExchangeInternalServerTransientErrorException,
+  ExchangeTransientConnectionException,
+)
+from ..retry import RetryPolicy
 
 SOAP_NS = u'http://schemas.xmlsoap.org/soap/envelope/'
 
 SOAP_NAMESPACES = {u's': SOAP_NS}
 S = ElementMaker(namespace=SOAP_NS, nsmap=SOAP_NAMESPACES)
 
+# Where one response ends in a stream of back to back SOAP envelopes
+ENVELOPE_END = re.compile(br'</(?:[\w.-]+:)?Envelope\s*>')
+
 log = logging.getLogger('pyexchange')
 
 
@@ -25,26 +33,156 @@ class ExchangeServiceSOAP(object):
 
   EXCHANGE_DATE_FORMAT = u"%Y-%m-%dT%H:%M:%SZ"
 
-  def __init__(self, connection):
+  # Errors that mean the same request is worth sending again a little later. Connection errors are in here too: the
+  # service does all the retrying and asks the connection for a single attempt, so a request is sent at most
+  # retries + 1 times rather than that squared.
+  RETRY_ON = (ExchangeServerBusyException, ExchangeInternalServerTransientErrorException, ExchangeTransientConnectionException)
+
+  def __init__(self, connection, retry_policy=None):
     self.connection = connection
+    self.retry_policy = retry_policy or RetryPolicy()
 
   def send(self, xml, headers=None, retries=4, timeout=30, encoding="utf-8"):
+    """
+    Sends xml to Exchange and returns the parsed response. If Exchange can't be reached, says it's busy or had a
+    transient error, the request is sent again up to retries times, backing off in between. timeout is the most
+    seconds the whole call may take, retries included.
+    """
     request_xml = self._wrap_soap_xml_request(xml)
-    log.info(etree.tostring(request_xml, encoding=encoding, pretty_print=True))
-    response = self._send_soap_request(request_xml, headers=headers, retries=retries, timeout=timeout, encoding=encoding)
-    return self._parse(response, encoding=encoding)
+    if log.isEnabledFor(logging.INFO):
+      log.info(etree.tostring(request_xml, encoding=encoding, pretty_print=True))
+
+    def attempt(remaining):
+      response = self._send_soap_request(request_xml, headers=headers, retries=0, timeout=remaining, encoding=encoding)
+      return self._parse(response, encoding=encoding)
+
+    return self.retry_policy.call(attempt, retries, timeout, retry_on=self.RETRY_ON)
 
   def _parse(self, response, encoding="utf-8"):
 
+    tree = self._parse_xml(response, encoding=encoding)
+    self._check_for_errors(tree)
+
+    if log.isEnabledFor(logging.INFO):
+      log.info(etree.tostring(tree, encoding=encoding, pretty_print=True))
+    return tree
+
+  def _parse_xml(self, response, encoding="utf-8"):
+
     try:
-      tree = etree.XML(response.encode(encoding))
+      return etree.XML(response.encode(encoding))
     except (etree.XMLSyntaxError, TypeError) as err:
       raise FailedExchangeException(u"Unable to parse response from Exchange - check your login information. Error: %s" % err)
 
-    self._check_for_errors(tree)
+  def send_streaming(self, xml, tags, headers=None, retries=4, timeout=30, encoding="utf-8"):
+    """
+    Like send, but parses the response as it arrives and yields each element whose tag is in tags as soon as it has
+    been parsed, instead of returning the whole tree. Elements nested inside another element with the same tag
+    aren't yielded on their own.
 
-    log.info(etree.tostring(tree, encoding=encoding, pretty_print=True))
-    return tree
+    Each yielded element is cleared and dropped from the tree when the next one is asked for, so memory use stays
+    flat no matter how big the response is. Don't hold on to yielded elements - pull out what you need right away.
+
+    Errors are retried like send does, as long as nothing has been yielded yet. timeout covers reading the response
+    too, so a response that takes longer than that to arrive raises part way through.
+    """
+    request_xml = self._wrap_soap_xml_request(xml)
+    if log.isEnabledFor(logging.INFO):
+      log.info(etree.tostring(request_xml, encoding=encoding, pretty_print=True))
+
+    deadline = self.retry_policy.deadline(timeout)
+    attempt = 0
+
+    while True:
+      yielded = False
+      try:
+        remaining = self.retry_policy.remaining(deadline)
+        for element in self._stream_response(request_xml, tags, headers, 0, remaining, encoding):
+          yielded = True
+          yield element
+        return
+      except self.RETRY_ON as err:
+        log.info(u'Attempt %s failed: %s', attempt + 1, err)
+        if yielded or not self.retry_policy.wait(attempt, retries, deadline, getattr(err, 'back_off', None)):
+          raise
+        attempt += 1
+
+  def iter_envelopes(self, xml, headers=None, timeout=30, encoding="utf-8"):
+    """
+    Sends xml to Exchange and yields each SOAP envelope in the response, parsed and checked for errors, as soon as
+    it has arrived. This is for requests like GetStreamingEvents, where Exchange keeps the connection open and
+    writes a whole new envelope every time it has something to say.
+
+    Nothing is retried - if the connection drops, it's up to the caller to send the request again.
+    """
+    request_xml = self._wrap_soap_xml_request(xml)
+    if log.isEnabledFor(logging.INFO):
+      log.info(etree.tostring(request_xml, encoding=encoding, pretty_print=True))
+
+    chunks = self._send_soap_request_streaming(request_xml, headers=headers, retries=0, timeout=timeout, encoding=encoding)
+    buffer = b''
+
+    for chunk in chunks:
+      buffer += chunk
+
+      end = ENVELOPE_END.search(buffer)
+      while end is not None:
+        envelope, buffer = buffer[:end.end()].strip(), buffer[end.end():]
+        yield self._parse(envelope.decode(encoding), encoding=encoding)
+        end = ENVELOPE_END.search(buffer)
+
+    if buffer.strip():
+      raise FailedExchangeException(u"Exchange closed the connection in the middle of a response")
+
+  def _stream_response(self, request_xml, tags, headers=None, retries=4, timeout=30, encoding="utf-8"):
+    chunks = self._send_soap_request_streaming(request_xml, headers=headers, retries=retries, timeout=timeout, encoding=encoding)
+
+    tags = set(tags)
+    parser = etree.XMLPullParser(events=(u'end',), tag=list(tags | set(self._streaming_status_tags())))
+    statuses_seen = 0
+
+    try:
+      for chunk in chunks:
+        parser.feed(chunk)
+
+        for _, element in parser.read_events():
+          if self._check_streamed_status(element):
+            statuses_seen += 1
+
+          if element.tag in tags and next(element.iterancestors(element.tag), None) is None:
+            yield element
+            self._release_streamed_element(element)
+
+      parser.close()
+    except (etree.XMLSyntaxError, TypeError) as err:
+      raise FailedExchangeException(u"Unable to parse response from Exchange - check your login information. Error: %s" % err)
+
+    self._check_end_of_stream(statuses_seen)
+
+  def _release_streamed_element(self, element):
+    element.clear()
+    parent = element.getparent()
+    if parent is not None:
+      while element.getprevious() is not None:
+        del parent[0]
+
+  def _streaming_status_tags(self):
+    """
+    Tags - lxml wildcards like {namespace}* are fine - that send_streaming passes to _check_streamed_status as soon
+    as they're parsed.
+    """
+    return [u'{%s}Fault' % SOAP_NS]
+
+  def _check_streamed_status(self, element):
+    """ Raises if element says the request failed. Returns True if it says the request went through. """
+    if element.tag == u'{%s}Fault' % SOAP_NS:
+      self._raise_for_fault(element)
+      return True
+
+    return False
+
+  def _check_end_of_stream(self, statuses_seen):
+    pass
 
   def _check_for_errors(self, xml_tree):
     self._check_for_SOAP_fault(xml_tree)
@@ -55,9 +193,12 @@ class ExchangeServiceSOAP(object):
     fault_nodes = xml_tree.xpath(u'//s:Fault', namespaces=SOAP_NAMESPACES)
 
     if fault_nodes:
-      fault = fault_nodes[0]
+      self._raise_for_fault(fault_nodes[0])
+
+  def _raise_for_fault(self, fault):
+    if log.isEnabledFor(logging.DEBUG):
       log.debug(etree.tostring(fault, pretty_print=True))
-      raise FailedExchangeException(u"SOAP Fault from Exchange server", fault.text)
+    raise FailedExchangeException(u"SOAP Fault from Exchange server", fault.text)
 
   def _send_soap_request(self, xml, headers=None, retries=2, timeout=30, encoding="utf-8"):
     body = etree.tostring(xml, encoding=encoding)
@@ -65,10 +206,23 @@ class ExchangeServiceSOAP(object):
     response = self.connection.send(body, headers, retries, timeout)
     return response
 
+  def _send_soap_request_streaming(self, xml, headers=None, retries=2, timeout=30, encoding="utf-8"):
+    body = etree.tostring(xml, encoding=encoding)
+
+    return self.connection.send_streaming(body, headers, retries, timeout, encoding)
+
   def _wrap_soap_xml_request(self, exchange_xml):
+    header = self._soap_header()
+    if header is not None:
+      return S.Envelope(header, S.Body(exchange_xml))
+
     root = S.Envelope(S.Body(exchange_xml))
     return root
 
+  def _soap_header(self):
+    """ The <s:Header> to send with every request, or None for no header. """
+    return None
+
   def _parse_date(self, date_string):
     date = datetime.strptime(date_string, self.EXCHANGE_DATE_FORMAT)
     date = date.replace(tzinfo=utc)
@@ -80,6 +234,19 @@ class ExchangeServiceSOAP(object):
 
     return date.date()
 
+  def _cast_text(self, text, cast_as=None):
+    """ Converts the text of a node to the python type named by cast_as - see _xpath_to_dict. """
+    if cast_as == u'datetime':
+      return self._parse_date(text)
+    elif cast_as == u'date_only_naive':
+      return self._parse_date_only_naive(text)
+    elif cast_as == u'int':
+      return int(text)
+    elif cast_as == u'bool':
+      return text.lower() == u'true'
+    else:
+      return text
+
   def _xpath_to_dict(self, element, property_map, namespace_map):
     """
     property_map = {
@@ -95,32 +262,19 @@ class ExchangeServiceSOAP(object):
 
     result = {}
 
-    log.info(etree.tostring(element, pretty_print=True))
+    if log.isEnabledFor(logging.INFO):
+      log.info(etree.tostring(element, pretty_print=True))
 
     for key in property_map:
       item = property_map[key]
-      log.info(u'Pulling xpath {xpath} into key {key}'.format(key=key, xpath=item[u'xpath']))
+      log.info(u'Pulling xpath %s into key %s', item[u'xpath'], key)
       nodes = element.xpath(item[u'xpath'], namespaces=namespace_map)
 
       if nodes:
         result_for_node = []
 
         for node in nodes:
-          cast_as = item.get(u'cast', None)
-
-          if cast_as == u'datetime':
-            result_for_node.append(self._parse_date(node.text))
-          elif cast_as == u'date_only_naive':
-            result_for_node.append(self._parse_date_only_naive(node.text))
-          elif cast_as == u'int':
-            result_for_node.append(int(node.text))
-          elif cast_as == u'bool':
-            if node.text.lower() == u'true':
-              result_for_node.append(True)
-            else:
-              result_for_node.append(False)
-          else:
-            result_for_node.append(node.text)
+          result_for_node.append(self._cast_text(node.text, item.get(u'cast', None)))
 
         if not result_for_node:
           result[key] = None
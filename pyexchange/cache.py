@@ -0,0 +1,150 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import sqlite3
+import threading
+import time
+from collections import namedtuple, OrderedDict
+
+# What a cache hands back: the change key the event had when it was stored, the serialized <t:CalendarItem>, and
+# when it was stored
+CachedEvent = namedtuple('CachedEvent', ['change_key', 'data', 'stored_at'])
+
+
+class BaseEventCache(object):
+  """
+  Where the calendar service keeps events it has already fetched, keyed by item id. Pass one to
+  Exchange2010Service(event_cache=...).
+
+  Entries older than ttl seconds are dropped. Entries younger than revalidate_after seconds are served as they are;
+  older ones are only served after Exchange confirms, with a cheap IdOnly GetItem, that their change key is current.
+  The default of 0 always checks.
+
+  Subclasses implement get, set, discard and clear.
+  """
+
+  def __init__(self, ttl=3600, revalidate_after=0, clock=time.time):
+    self.ttl = ttl
+    self.revalidate_after = revalidate_after
+    self.clock = clock
+
+  def get(self, item_id):
+    """ Returns the CachedEvent for item_id, or None if there isn't one or it has expired. """
+    raise NotImplementedError
+
+  def set(self, item_id, change_key, data):
+    raise NotImplementedError
+
+  def discard(self, item_id):
+    """ Forgets item_id, if it was cached. """
+    raise NotImplementedError
+
+  def clear(self):
+    raise NotImplementedError
+
+  def is_fresh(self, entry):
+    """ True if entry is young enough to serve without asking Exchange. """
+    return self.clock() - entry.stored_at < self.revalidate_after
+
+  def _expired(self, stored_at):
+    return self.ttl is not None and self.clock() - stored_at >= self.ttl
+
+
+class MemoryEventCache(BaseEventCache):
+  """
+  Keeps up to max_size events in memory, dropping the least recently used first. Safe to share between threads.
+  """
+
+  def __init__(self, max_size=1000, ttl=3600, revalidate_after=0, clock=time.time):
+    super(MemoryEventCache, self).__init__(ttl=ttl, revalidate_after=revalidate_after, clock=clock)
+    self.max_size = max_size
+    self._entries = OrderedDict()
+    self._lock = threading.Lock()
+
+  def get(self, item_id):
+    with self._lock:
+      entry = self._entries.pop(item_id, None)
+      if entry is None or self._expired(entry.stored_at):
+        return None
+
+      self._entries[item_id] = entry
+      return entry
+
+  def set(self, item_id, change_key, data):
+    with self._lock:
+      self._entries.pop(item_id, None)
+      self._entries[item_id] = CachedEvent(change_key, data, self.clock())
+
+      while len(self._entries) > self.max_size:
+        self._entries.popitem(last=False)
+
+  def discard(self, item_id):
+    with self._lock:
+      self._entries.pop(item_id, None)
+
+  def clear(self):
+    with self._lock:
+      self._entries.clear()
+
+  def __len__(self):
+    return len(self._entries)
+
+
+class SQLiteEventCache(BaseEventCache):
+  """
+  Keeps events in a SQLite database at path, so they survive restarts and can be shared between processes. Use
+  ':memory:' for a throwaway database.
+  """
+
+  def __init__(self, path, ttl=3600, revalidate_after=0, clock=time.time):
+    super(SQLiteEventCache, self).__init__(ttl=ttl, revalidate_after=revalidate_after, clock=clock)
+    self.path = path
+    self._lock = threading.Lock()
+    self._db = sqlite3.connect(path, check_same_thread=False)
+    self._db.execute(
+      u'CREATE TABLE IF NOT EXISTS events (item_id TEXT PRIMARY KEY, change_key TEXT, data BLOB, stored_at REAL)'
+    )
+    self._db.commit()
+
+  def get(self, item_id):
+    with self._lock:
+      row = self._db.execute(u'SELECT change_key, data, stored_at FROM events WHERE item_id = ?', (item_id,)).fetchone()
+
+      if row is None:
+        return None
+
+      if self._expired(row[2]):
+        self._db.execute(u'DELETE FROM events WHERE item_id = ?', (item_id,))
+        self._db.commit()
+        return None
+
+      return CachedEvent(row[0], bytes(row[1]), row[2])
+
+  def set(self, item_id, change_key, data):
+    with self._lock:
+      self._db.execute(
+        u'INSERT OR REPLACE INTO events (item_id, change_key, data, stored_at) VALUES (?, ?, ?, ?)',
+        (item_id, change_key, sqlite3.Binary(data), self.clock())
+      )
+      self._db.commit()
+
+  def discard(self, item_id):
+    with self._lock:
+      self._db.execute(u'DELETE FROM events WHERE item_id = ?', (item_id,))
+      self._db.commit()
+
+  def clear(self):
+    with self._lock:
+      self._db.execute(u'DELETE FROM events')
+      self._db.commit()
+
+  def close(self):
+    with self._lock:
+      self._db.close()
+
+  def __len__(self):
+    with self._lock:
+      return self._db.execute(u'SELECT COUNT(*) FROM events').fetchone()[0]
@@ -5,14 +5,88 @@ Licensed under the Apache License, Version 2.0 (the "License");?you may not use
 Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 """
 import requests
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.connection import HTTPConnection
 from requests_ntlm import HttpNtlmAuth
 
 import logging
+import socket
+import threading
+from logging.handlers import RotatingFileHandler
 
-from .exceptions import FailedExchangeException
+from .exceptions import FailedExchangeException, ExchangeTransientConnectionException
+from .retry import RetryPolicy
 
 log = logging.getLogger('pyexchange')
 
+# Raw request and response bodies go here, exactly as sent and received. Off unless you turn it on.
+wire_log = logging.getLogger('pyexchange.wire')
+
+
+def enable_wire_trace(filename, max_bytes=10 * 1024 * 1024, backup_count=5):
+  """
+  Writes every raw request and response body to filename, as-is, rolling the file over once it's max_bytes long
+  and keeping backup_count old files around. ::
+
+      from pyexchange.connection import enable_wire_trace
+      enable_wire_trace('/tmp/exchange-wire.log')
+
+  Returns the handler, so you can remove it from the ``pyexchange.wire`` logger again.
+  """
+  handler = RotatingFileHandler(filename, maxBytes=max_bytes, backupCount=backup_count)
+  handler.setFormatter(logging.Formatter(u'%(asctime)s %(message)s'))
+
+  wire_log.addHandler(handler)
+  wire_log.setLevel(logging.DEBUG)
+  wire_log.propagate = False
+
+  return handler
+
+
+def _trace(direction, body, encoding=u'utf-8'):
+  if wire_log.isEnabledFor(logging.DEBUG):
+    if isinstance(body, bytes):
+      body = body.decode(encoding, u'replace')
+    wire_log.debug(u'%s\n%s', direction, body)
+
+
+def tcp_keepalive_socket_options(idle):
+  """
+  Socket options that turn on TCP keep-alives, probing after idle seconds without traffic where the platform
+  lets us pick that.
+  """
+  options = list(HTTPConnection.default_socket_options) + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+
+  if hasattr(socket, 'TCP_KEEPIDLE'):
+    options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle))
+  elif hasattr(socket, 'TCP_KEEPALIVE'):
+    # OS X calls it something else
+    options.append((socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, idle))
+
+  if hasattr(socket, 'TCP_KEEPINTVL'):
+    options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, idle))
+
+  return options
+
+
+class ExchangeHTTPAdapter(HTTPAdapter):
+  """
+  HTTPAdapter that can send TCP keep-alives on its sockets. NTLM authenticates a connection rather than a request,
+  so an idle socket that gets dropped by a firewall or load balancer costs another three-leg handshake.
+  """
+
+  __attrs__ = HTTPAdapter.__attrs__ + ['tcp_keepalive']
+
+  def __init__(self, tcp_keepalive=None, **kwargs):
+    # set before calling up, HTTPAdapter builds its pool manager in __init__
+    self.tcp_keepalive = tcp_keepalive
+    super(ExchangeHTTPAdapter, self).__init__(**kwargs)
+
+  def init_poolmanager(self, *args, **kwargs):
+    if self.tcp_keepalive:
+      kwargs['socket_options'] = tcp_keepalive_socket_options(self.tcp_keepalive)
+    super(ExchangeHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+
 
 class ExchangeBaseConnection(object):
   """ Base class for Exchange connections."""
@@ -20,55 +94,178 @@ class ExchangeBaseConnection(object):
   def send(self, body, headers=None, retries=2, timeout=30, encoding="utf-8"):
     raise NotImplementedError
 
+  def send_streaming(self, body, headers=None, retries=2, timeout=30, encoding="utf-8"):
+    """
+    Like send, but returns an iterable of byte chunks so the response can be parsed as it arrives.
+
+    Connections that can't stream fall back to handing back the whole response as a single chunk.
+    """
+    return [self.send(body, headers=headers, retries=retries, timeout=timeout, encoding=encoding).encode(encoding)]
+
 
 class ExchangeNTLMAuthConnection(ExchangeBaseConnection):
-  """ Connection to Exchange that uses NTLM authentication """
+  """
+  Connection to Exchange that uses NTLM authentication.
+
+  One connection can be shared by many threads for sending requests. They share a pool of up to pool_maxsize
+  sockets per host, which stay authenticated between requests. When pool_block is on (the default), a thread that
+  finds every socket busy waits for one to come back, instead of opening a throwaway socket that has to authenticate
+  from scratch - so make pool_maxsize at least as big as the number of threads you run. pool_connections is how many
+  hosts get a pool.
+
+  Each NTLM handshake keeps its state to itself, but they all go through one HttpNtlmAuth (password_manager), whose
+  session_security is overwritten by whichever handshake finished last. Don't use it for message signing or sealing
+  on a connection that threads share - pyexchange itself never does.
+
+  keep_alive=False closes the socket after every request. tcp_keepalive, if set, has the OS probe idle sockets
+  every that many seconds so nothing in between drops them.
+  """
+
+  # How many bytes of a streamed response we read at a time
+  STREAM_CHUNK_SIZE = 64 * 1024
 
-  def __init__(self, url, username, password, verify_certificate=True, **kwargs):
+  # Statuses that mean something between us and Exchange is having a bad moment, so the request is worth retrying
+  RETRY_STATUS_CODES = (502, 503, 504)
+
+  def __init__(self, url, username, password, verify_certificate=True, retry_policy=None,
+               pool_connections=10, pool_maxsize=10, pool_block=True, keep_alive=True, tcp_keepalive=None, **kwargs):
     self.url = url
     self.username = username
     self.password = password
     self.verify_certificate = verify_certificate
+    self.retry_policy = retry_policy or RetryPolicy()
+    self.pool_connections = pool_connections
+    self.pool_maxsize = pool_maxsize
+    self.pool_block = pool_block
+    self.keep_alive = keep_alive
+    self.tcp_keepalive = tcp_keepalive
     self.handler = None
     self.session = None
     self.password_manager = None
+    self._lock = threading.RLock()
 
   def build_password_manager(self):
-    if self.password_manager:
-      return self.password_manager
+    with self._lock:
+      if self.password_manager:
+        return self.password_manager
 
-    log.debug(u'Constructing password manager')
+      log.debug(u'Constructing password manager')
 
-    self.password_manager = HttpNtlmAuth(self.username, self.password)
+      self.password_manager = HttpNtlmAuth(self.username, self.password)
 
-    return self.password_manager
+      return self.password_manager
 
   def build_session(self):
-    if self.session:
-      return self.session
+    with self._lock:
+      if self.session:
+        return self.session
 
-    log.debug(u'Constructing opener')
+      log.debug(u'Constructing opener')
 
-    self.password_manager = self.build_password_manager()
+      self.password_manager = self.build_password_manager()
 
-    self.session = requests.Session()
-    self.session.auth = self.password_manager
+      session = requests.Session()
+      session.auth = self.password_manager
 
-    return self.session
+      # Retries are ours to do (see RetryPolicy), so the adapter shouldn't retry underneath us
+      adapter = ExchangeHTTPAdapter(
+        tcp_keepalive=self.tcp_keepalive,
+        pool_connections=self.pool_connections,
+        pool_maxsize=self.pool_maxsize,
+        pool_block=self.pool_block,
+        max_retries=0,
+      )
+      session.mount('https://', adapter)
+      session.mount('http://', adapter)
+
+      if not self.keep_alive:
+        session.headers['Connection'] = 'close'
+
+      self.session = session
+      return self.session
+
+  def close(self):
+    """ Closes every pooled socket. The connection can still be used afterwards, it just starts over. """
+    with self._lock:
+      if self.session is not None:
+        self.session.close()
+        self.session = None
 
   def send(self, body, headers=None, retries=2, timeout=30, encoding=u"utf-8"):
-    if not self.session:
-      self.session = self.build_session()
+    """
+    Posts body to Exchange and returns the response text. Connection errors, timeouts and 502/503/504 responses
+    are retried up to retries times, backing off in between. timeout is the most seconds the whole call may take,
+    retries included.
+    """
+    response = self._post(body, headers=headers, retries=retries, timeout=timeout, encoding=encoding)
+
+    # requests decodes .text afresh every time it's read, so do it once
+    text = response.text
+    _trace(u'response', text)
+    if log.isEnabledFor(logging.DEBUG):
+      log.debug(u'Got body: %s', text)
+
+    return text
+
+  def send_streaming(self, body, headers=None, retries=2, timeout=30, encoding=u"utf-8"):
+    """
+    Like send, but returns an iterator over the response body in chunks as it arrives. timeout covers reading the
+    body too. It's checked between chunks, so a chunk that's slow to arrive can take it over by up to one read
+    timeout before ExchangeTransientConnectionException is raised.
+    """
+    deadline = self.retry_policy.deadline(timeout)
+    response = self._post(body, headers=headers, stream=True, retries=retries, timeout=timeout, encoding=encoding)
+    return self._iter_content(response, encoding, deadline)
+
+  def _post(self, body, headers=None, stream=False, retries=2, timeout=30, encoding=u"utf-8"):
+    session = self.build_session()
+
+    _trace(u'request to %s' % self.url, body, encoding)
+
+    def attempt(remaining):
+      return self._post_once(session, body, headers=headers, stream=stream, timeout=remaining)
+
+    return self.retry_policy.call(attempt, retries, timeout, retry_on=(ExchangeTransientConnectionException,))
+
+  def _post_once(self, session, body, headers=None, stream=False, timeout=30):
+    try:
+      response = session.post(self.url, data=body, headers=headers, verify = self.verify_certificate, stream=stream, timeout=timeout)
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as err:
+      raise ExchangeTransientConnectionException(u'Unable to connect to Exchange: %s' % err)
+    except requests.exceptions.RequestException as err:
+      raise FailedExchangeException(u'Unable to connect to Exchange: %s' % err)
+
+    log.info(u'Got response: %s', response.status_code)
+    log.debug(u'Got response headers: %s', response.headers)
+
+    # Exchange reports SOAP faults - including "server busy" - as a 500 with an XML body. Hand those back so the
+    # service can tell what went wrong.
+    if response.status_code == 500 and u'xml' in response.headers.get(u'Content-Type', u''):
+      return response
 
     try:
-      response = self.session.post(self.url, data=body, headers=headers, verify = self.verify_certificate)
       response.raise_for_status()
     except requests.exceptions.RequestException as err:
-      log.debug(err.response.content)
+      log.debug(response.content)
+      response.close()
+      if response.status_code in self.RETRY_STATUS_CODES:
+        raise ExchangeTransientConnectionException(u'Unable to connect to Exchange: %s' % err)
       raise FailedExchangeException(u'Unable to connect to Exchange: %s' % err)
 
-    log.info(u'Got response: {code}'.format(code=response.status_code))
-    log.debug(u'Got response headers: {headers}'.format(headers=response.headers))
-    log.debug(u'Got body: {body}'.format(body=response.text))
+    return response
+
+  def _iter_content(self, response, encoding=u"utf-8", deadline=None):
+    try:
+      for chunk in response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE):
+        _trace(u'response chunk', chunk, response.encoding or encoding)
+
+        # requests' timeout is per socket read, so a response that keeps trickling in never times out on its own
+        remaining = self.retry_policy.remaining(deadline)
+        if remaining is not None and remaining <= 0:
+          raise ExchangeTransientConnectionException(u'Exchange took too long to send the response')
 
-    return response.text
+        yield chunk
+    except requests.exceptions.RequestException as err:
+      raise ExchangeTransientConnectionException(u'Lost connection to Exchange while reading the response: %s' % err)
+    finally:
+      response.close()
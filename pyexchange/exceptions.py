@@ -39,6 +39,24 @@ class ExchangeInternalServerTransientErrorException(FailedExchangeException):
   pass
 
 
+class ExchangeServerBusyException(FailedExchangeException):
+  """Raised when Exchange is throttling us. back_off is how many seconds the server asked us to wait, if it said."""
+
+  def __init__(self, message, back_off=None):
+    super(ExchangeServerBusyException, self).__init__(message)
+    self.back_off = back_off
+
+
+class ExchangeTransientConnectionException(FailedExchangeException):
+  """Raised when Exchange couldn't be reached, timed out, or a proxy in front of it answered 502, 503 or 504."""
+  pass
+
+
+class ExchangeSubscriptionExpiredException(FailedExchangeException):
+  """Raised when a notification subscription has expired or Exchange no longer knows about it."""
+  pass
+
+
 class InvalidEventType(Exception):
   """Raised when a method for an event gets called on the wrong type of event."""
   pass
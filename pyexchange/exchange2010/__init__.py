@@ -6,26 +6,201 @@ Unless required by applicable law or agreed to in writing, software?distributed
 """
 
 import logging
-from ..base.calendar import BaseExchangeCalendarEvent, BaseExchangeCalendarService, ExchangeEventOrganizer, ExchangeEventResponse
+from ..base.calendar import BaseExchangeCalendarEvent, BaseExchangeCalendarService, ExchangeEventOrganizer, ExchangeEventResponse, ExchangeModifiedOccurrence
 from ..base.folder import BaseExchangeFolder, BaseExchangeFolderService
 from ..base.soap import ExchangeServiceSOAP
-from ..exceptions import FailedExchangeException, ExchangeStaleChangeKeyException, ExchangeItemNotFoundException, ExchangeInternalServerTransientErrorException, ExchangeIrresolvableConflictException, InvalidEventType
+from ..exceptions import FailedExchangeException, ExchangeStaleChangeKeyException, ExchangeItemNotFoundException, ExchangeInternalServerTransientErrorException, ExchangeIrresolvableConflictException, ExchangeServerBusyException, ExchangeSubscriptionExpiredException, ExchangeTransientConnectionException, InvalidEventType
 from ..compat import BASESTRING_TYPES
+from ..utils import convert_datetime_to_utc
+from .. import export, intervals, recurrence, serialization
 
 from . import soap_request
 
 from lxml import etree
-from copy import deepcopy
-from datetime import date
+from pytz import utc
+from collections import namedtuple
+from datetime import date, timedelta
+from multiprocessing.pool import ThreadPool
+import time
 import warnings
 
 log = logging.getLogger("pyexchange")
 
 
+def _type_tag(name):
+  return u'{%s}%s' % (soap_request.TYPE_NS, name)
+
+
+M_ITEMS = u'{%s}Items' % soap_request.MSG_NS
+M_RESPONSE_CODE = u'{%s}ResponseCode' % soap_request.MSG_NS
+M_ROOT_FOLDER = u'{%s}RootFolder' % soap_request.MSG_NS
+M_RESPONSE_MESSAGES = u'{%s}ResponseMessages' % soap_request.MSG_NS
+M_SYNC_STATE = u'{%s}SyncState' % soap_request.MSG_NS
+M_INCLUDES_LAST_ITEM_IN_RANGE = u'{%s}IncludesLastItemInRange' % soap_request.MSG_NS
+M_CHANGES = u'{%s}Changes' % soap_request.MSG_NS
+M_INCLUDES_LAST_FOLDER_IN_RANGE = u'{%s}IncludesLastFolderInRange' % soap_request.MSG_NS
+T_CALENDAR_ITEM = _type_tag(u'CalendarItem')
+T_ITEM_ID = _type_tag(u'ItemId')
+
+T_BODY = _type_tag(u'Body')
+T_RECURRENCE = _type_tag(u'Recurrence')
+T_ORGANIZER = _type_tag(u'Organizer')
+T_MAILBOX = _type_tag(u'Mailbox')
+T_NAME = _type_tag(u'Name')
+T_EMAIL_ADDRESS = _type_tag(u'EmailAddress')
+T_REQUIRED_ATTENDEES = _type_tag(u'RequiredAttendees')
+T_OPTIONAL_ATTENDEES = _type_tag(u'OptionalAttendees')
+T_RESOURCES = _type_tag(u'Resources')
+T_ATTENDEE = _type_tag(u'Attendee')
+T_RESPONSE_TYPE = _type_tag(u'ResponseType')
+T_LAST_RESPONSE_TIME = _type_tag(u'LastResponseTime')
+T_CONFLICTING_MEETINGS = _type_tag(u'ConflictingMeetings')
+T_END_DATE_RECURRENCE = _type_tag(u'EndDateRecurrence')
+T_END_DATE = _type_tag(u'EndDate')
+T_INTERVAL = _type_tag(u'Interval')
+T_WEEKLY_RECURRENCE = _type_tag(u'WeeklyRecurrence')
+T_DAYS_OF_WEEK = _type_tag(u'DaysOfWeek')
+T_MODIFIED_OCCURRENCES = _type_tag(u'ModifiedOccurrences')
+T_DELETED_OCCURRENCES = _type_tag(u'DeletedOccurrences')
+T_START = _type_tag(u'Start')
+T_END = _type_tag(u'End')
+T_ORIGINAL_START = _type_tag(u'OriginalStart')
+
+# Kinds of change in a SyncFolderItems response, and the Exchange2010CalendarChanges list each one goes in
+SYNC_CHANGE_TYPES = {
+  _type_tag(u'Create'): u'created',
+  _type_tag(u'Update'): u'updated',
+  _type_tag(u'Delete'): u'deleted',
+}
+
+# <t:CalendarItem> children that map straight onto an event property: tag -> (property, cast)
+CALENDAR_ITEM_FIELDS = {
+  _type_tag(u'Subject'): (u'subject', None),
+  _type_tag(u'Location'): (u'location', None),
+  _type_tag(u'LegacyFreeBusyStatus'): (u'availability', None),
+  _type_tag(u'Start'): (u'start', u'datetime'),
+  _type_tag(u'End'): (u'end', u'datetime'),
+  _type_tag(u'CalendarItemType'): (u'_type', None),
+  _type_tag(u'ReminderMinutesBeforeStart'): (u'reminder_minutes_before_start', u'int'),
+  _type_tag(u'IsAllDayEvent'): (u'is_all_day', u'bool'),
+}
+
+CALENDAR_ITEM_BODY_TYPES = {u'HTML': u'html_body', u'Text': u'text_body'}
+
+RECURRENCE_TYPES = {
+  _type_tag(u'DailyRecurrence'): u'daily',
+  T_WEEKLY_RECURRENCE: u'weekly',
+  _type_tag(u'AbsoluteMonthlyRecurrence'): u'monthly',
+  _type_tag(u'AbsoluteYearlyRecurrence'): u'yearly',
+}
+
+CALENDAR_ITEM_XPATH = etree.XPath(u'//m:Items/t:CalendarItem', namespaces=soap_request.NAMESPACES)
+CONFLICTING_ITEM_ID_XPATH = etree.XPath(u't:CalendarItem/t:ItemId', namespaces=soap_request.NAMESPACES)
+
+FOLDER_TAGS = frozenset(_type_tag(folder_type) for folder_type in BaseExchangeFolder.FOLDER_TYPES)
+FOLDER_XPATH = etree.XPath(u'//t:Folder | //t:CalendarFolder | //t:ContactsFolder | //t:SearchFolder | //t:TasksFolder', namespaces=soap_request.NAMESPACES)
+# Throttled responses say how long to back off for in <m:MessageXml>, or <t:MessageXml> inside a SOAP fault's detail
+BACK_OFF_XPATH = etree.XPath(u'.//t:Value[@Name="BackOffMilliseconds"]', namespaces=soap_request.NAMESPACES)
+FAULT_RESPONSE_CODE = u'detail/{http://schemas.microsoft.com/exchange/services/2006/errors}ResponseCode'
+
+# Notifications we can subscribe to, by the name we give them and the name Exchange gives them
+NOTIFICATION_TYPES = {
+  u'created': u'CreatedEvent',
+  u'modified': u'ModifiedEvent',
+  u'deleted': u'DeletedEvent',
+  u'moved': u'MovedEvent',
+  u'copied': u'CopiedEvent',
+  u'new_mail': u'NewMailEvent',
+  u'free_busy_changed': u'FreeBusyChangedEvent',
+}
+NOTIFICATION_TAGS = dict((_type_tag(exchange_name), name) for name, exchange_name in NOTIFICATION_TYPES.items())
+CALENDAR_NOTIFICATIONS = (u'created', u'modified', u'deleted', u'moved')
+
+M_NOTIFICATION = u'{%s}Notification' % soap_request.MSG_NS
+M_SUBSCRIPTION_ID = u'{%s}SubscriptionId' % soap_request.MSG_NS
+M_WATERMARK = u'{%s}Watermark' % soap_request.MSG_NS
+T_MORE_EVENTS = _type_tag(u'MoreEvents')
+T_STATUS_EVENT = _type_tag(u'StatusEvent')
+T_WATERMARK = _type_tag(u'Watermark')
+T_TIME_STAMP = _type_tag(u'TimeStamp')
+
+# One character per interval in <t:MergedFreeBusy>: 0 free, 1 tentative, 2 busy, 3 out of office, 4 no data
+MERGED_BUSY_STATUSES = frozenset(u'123')
+M_FREE_BUSY_RESPONSE = u'{%s}FreeBusyResponse' % soap_request.MSG_NS
+M_RESPONSE_MESSAGE = u'{%s}ResponseMessage' % soap_request.MSG_NS
+T_MERGED_FREE_BUSY = _type_tag(u'MergedFreeBusy')
+
+# What availability() finds out about a mailbox - busy is a list of (start, end) pairs, or None if error is set
+ExchangeAvailability = namedtuple('ExchangeAvailability', ['email', 'busy', 'error'])
+
+# What fan_out got from one mailbox - result is what the function returned, or None if error is set. seconds is how
+# long it ran for.
+ExchangeMailboxResult = namedtuple('ExchangeMailboxResult', ['mailbox', 'result', 'error', 'seconds'])
+
+# Totals for a whole fan_out. elapsed is the wall clock time it took, total_seconds the time spent on all the
+# mailboxes added up.
+ExchangeFanOutStats = namedtuple('ExchangeFanOutStats', [
+  'mailboxes', 'succeeded', 'failed', 'elapsed', 'total_seconds', 'mean_seconds', 'max_seconds',
+])
+
+T_FOLDERS = _type_tag(u'Folders')
+T_FOLDER_ID = _type_tag(u'FolderId')
+T_PARENT_FOLDER_ID = _type_tag(u'ParentFolderId')
+
+
+def _check_find_item_fields(fields):
+  get_item_only = [field for field in fields if field in soap_request.GET_ITEM_ONLY_FIELDS]
+  if get_item_only:
+    raise ValueError(u"These fields can only be loaded with details=True or get_event: %s" % u', '.join(get_item_only))
+
+
 class Exchange2010Service(ExchangeServiceSOAP):
 
-  def calendar(self, id="calendar"):
-    return Exchange2010CalendarService(service=self, calendar_id=id)
+  # Most mailboxes Exchange will look up in one GetUserAvailability request
+  MAX_AVAILABILITY_MAILBOXES = 100
+
+  # How many mailboxes fan_out works on at once by default
+  FAN_OUT_WORKERS = 10
+
+  def __init__(self, connection, retry_policy=None, event_cache=None, mailbox=None, impersonate=True):
+    """
+    event_cache is an optional :class:`pyexchange.cache.BaseEventCache` that calendar().get_event keeps events
+    in, so fetching the same event again only costs an IdOnly GetItem.
+
+    mailbox is the email address of another mailbox to work in instead of our own - see :meth:`for_mailbox`.
+    """
+    super(Exchange2010Service, self).__init__(connection, retry_policy=retry_policy)
+    self.event_cache = event_cache
+    self.mailbox = mailbox
+    self.impersonate = impersonate
+
+  def for_mailbox(self, mailbox, impersonate=True):
+    """
+      for_mailbox(mailbox, impersonate=True)
+      :param str mailbox:  Email address of the mailbox to work in.
+      :param bool impersonate:  Act as the mailbox's owner, or use delegate access.
+
+      Returns a service that works in another mailbox over this service's connection, so any number of them share
+      one pool of authenticated sockets.
+
+      With impersonate on, every request carries an ExchangeImpersonation header and runs as the mailbox's owner -
+      our account needs the ApplicationImpersonation role. With it off, requests point distinguished folders like
+      'calendar' at the mailbox instead, which only needs delegate access to those folders.
+
+      **Examples**::
+
+        bob = service.for_mailbox(u'bob@example.com')
+        events = bob.calendar().list_events(start=start, end=end)
+
+    """
+    return self.__class__(
+      self.connection, retry_policy=self.retry_policy, event_cache=self.event_cache, mailbox=mailbox, impersonate=impersonate,
+    )
+
+  def calendar(self, id="calendar", mailbox=None, impersonate=True):
+    """ The calendar folder with this id - in another mailbox, if given one, as :meth:`for_mailbox` describes. """
+    service = self.for_mailbox(mailbox, impersonate=impersonate) if mailbox is not None else self
+    return Exchange2010CalendarService(service=service, calendar_id=id)
 
   def mail(self):
     raise NotImplementedError("Sorry - nothin' here. Feel like adding it? :)")
@@ -36,17 +211,277 @@ class Exchange2010Service(ExchangeServiceSOAP):
   def folder(self):
     return Exchange2010FolderService(service=self)
 
+  def subscribe(self, folder_ids=(u'calendar',), event_types=CALENDAR_NOTIFICATIONS, watermark=None, timeout=30):
+    """
+      subscribe(folder_ids=('calendar',), event_types=('created', 'modified', 'deleted', 'moved'), watermark=None, timeout=30)
+      :param folder_ids:  Ids of the folders to watch. Distinguished ids like 'calendar' work too.
+      :param event_types:  Which changes to hear about - any of 'created', 'modified', 'deleted', 'moved', 'copied', 'new_mail' and 'free_busy_changed'.
+      :param str watermark:  The watermark of the last notification you saw, to resume an old subscription.
+      :param int timeout:  Minutes Exchange keeps the subscription alive after we last asked for events, from 1 to 1440.
+
+      Subscribes to changes in the given folders and returns an :class:`Exchange2010PullSubscription`. Ask it for
+      changes with get_events(), or loop over iter_events() to poll forever.
+
+      **Examples**::
+
+        subscription = service.subscribe()
+        for notification in subscription.iter_events(poll_interval=30):
+          print(notification.type, notification.item_id)
+
+    """
+    if not 1 <= timeout <= 1440:
+      raise ValueError(u"timeout must be between 1 and 1440 minutes")
+
+    subscription = Exchange2010PullSubscription(service=self, folder_ids=folder_ids, event_types=event_types, watermark=watermark, timeout=timeout)
+    return subscription.subscribe()
+
+  def subscribe_streaming(self, folder_ids=(u'calendar',), event_types=CALENDAR_NOTIFICATIONS):
+    """
+      subscribe_streaming(folder_ids=('calendar',), event_types=('created', 'modified', 'deleted', 'moved'))
+
+      Like subscribe, but Exchange pushes changes to us over a long-lived connection as they happen instead of us
+      polling for them. Returns an :class:`Exchange2010StreamingSubscription`. Needs Exchange 2010 SP1 or later.
+
+      **Examples**::
+
+        subscription = service.subscribe_streaming()
+        for notification in subscription.iter_events():
+          print(notification.type, notification.item_id)
+
+    """
+    subscription = Exchange2010StreamingSubscription(service=self, folder_ids=folder_ids, event_types=event_types)
+    return subscription.subscribe()
+
+  def fan_out(self, mailboxes, fn, max_workers=None, impersonate=True):
+    """
+      fan_out(mailboxes, fn, max_workers=FAN_OUT_WORKERS, impersonate=True)
+      :param list mailboxes:  Email addresses of the mailboxes to work in.
+      :param fn:  Called once per mailbox with a service for that mailbox, from :meth:`for_mailbox`.
+      :param int max_workers:  How many mailboxes to work on at once.
+      :param bool impersonate:  Passed on to :meth:`for_mailbox`.
+
+      Runs fn across many mailboxes at once, on threads that share this service's connection. Give the connection
+      a pool_maxsize of at least max_workers, or threads wait their turn for a socket.
+
+      Returns an :class:`Exchange2010FanOutResults` - a dict of email address to :class:`ExchangeMailboxResult`,
+      with totals in its stats attribute. An exception in one mailbox doesn't stop the others: it's kept as that
+      mailbox's error instead.
+
+      **Examples**::
+
+        def busiest_day(service):
+          return len(service.calendar().list_events(start=start, end=end).events)
+
+        results = service.fan_out([u'ann@example.com', u'bob@example.com'], busiest_day, max_workers=20)
+        for email, result in results.items():
+          print(email, result.error or result.result)
+
+    """
+    mailboxes = list(_unique(mailboxes))
+    if max_workers is None:
+      max_workers = self.FAN_OUT_WORKERS
+    if max_workers < 1:
+      raise ValueError(u"max_workers must be a positive integer")
+
+    def run(mailbox):
+      started = time.time()
+      try:
+        result, error = fn(self.for_mailbox(mailbox, impersonate=impersonate)), None
+      except Exception as err:
+        log.info(u'fan_out failed for %s: %s', mailbox, err)
+        result, error = None, err
+      return ExchangeMailboxResult(mailbox=mailbox, result=result, error=error, seconds=time.time() - started)
+
+    started = time.time()
+    if max_workers > 1 and len(mailboxes) > 1:
+      pool = ThreadPool(min(max_workers, len(mailboxes)))
+      try:
+        results = pool.map(run, mailboxes)
+      finally:
+        pool.close()
+        pool.join()
+    else:
+      results = [run(mailbox) for mailbox in mailboxes]
+
+    return Exchange2010FanOutResults(results, elapsed=time.time() - started)
+
+  def _soap_header(self):
+    if self.mailbox is not None and self.impersonate:
+      return soap_request.impersonation_header(self.mailbox)
+    return None
+
+  def _wrap_soap_xml_request(self, exchange_xml):
+    if self.mailbox is not None and not self.impersonate:
+      soap_request.target_mailbox(exchange_xml, self.mailbox)
+    return super(Exchange2010Service, self)._wrap_soap_xml_request(exchange_xml)
+
+  def availability(self, mailboxes, start, end, interval=30):
+    """
+      availability(mailboxes, start, end, interval=30)
+      :param list mailboxes:  Email addresses (or anything with an email attribute, like attendees) to look up.
+      :param datetime start:  The start of the window.
+      :param datetime end:  The end of the window.
+      :param int interval:  How finely to slice the window, in minutes - from 5 to 1440.
+
+      Looks up when each mailbox is busy between start and end with GetUserAvailability, asking for up to
+      MAX_AVAILABILITY_MAILBOXES mailboxes per request. Much cheaper than listing each calendar's events.
+
+      Returns a dict of email address to :class:`ExchangeAvailability`. Its busy attribute is a list of
+      (start, end) UTC datetimes, one per run of busy time, to the nearest interval. Tentative and out of office time
+      count as busy. If Exchange couldn't look a mailbox up, busy is None and error says why.
+
+      **Examples**::
+
+        rooms = service.availability([u'room1@example.com', u'room2@example.com'], start, end, interval=15)
+        free_rooms = [email for email, availability in rooms.items() if availability.busy == []]
+
+    """
+    start, requests = self._availability_requests(mailboxes, start, end, interval)
+    result = {}
+
+    for chunk, body in requests:
+      self._add_availability(result, chunk, self._send_unchecked(body), start, interval)
+
+    return result
+
+  def _availability_requests(self, mailboxes, start, end, interval):
+    """ Checks availability's arguments, and returns start in UTC plus the (emails, request) pairs to send. """
+    if not 5 <= interval <= 1440:
+      raise ValueError(u"interval must be between 5 and 1440 minutes")
+
+    start = convert_datetime_to_utc(start)
+    end = convert_datetime_to_utc(end)
+    if start is None or end is None or end <= start:
+      raise ValueError(u"end must come after start")
+
+    emails = [getattr(mailbox, u'email', mailbox) for mailbox in mailboxes]
+    requests = []
+
+    for i in range(0, len(emails), self.MAX_AVAILABILITY_MAILBOXES):
+      chunk = emails[i:i + self.MAX_AVAILABILITY_MAILBOXES]
+      requests.append((chunk, soap_request.get_user_availability(chunk, start=start, end=end, interval=interval)))
+
+    return start, requests
+
+  def _add_availability(self, result, chunk, response_xml, start, interval):
+    responses = list(response_xml.iter(M_FREE_BUSY_RESPONSE))
+
+    if len(responses) != len(chunk):
+      raise FailedExchangeException(u"Exchange server returned %s responses for %s mailboxes" % (len(responses), len(chunk)), None)
+
+    for email, response in zip(chunk, responses):
+      result[email] = self._parse_availability(email, response, start, interval)
+
+  def _parse_availability(self, email, response, start, interval):
+    message = response.find(M_RESPONSE_MESSAGE)
+    code = message.findtext(M_RESPONSE_CODE) if message is not None else None
+
+    error = self._response_code_exception(code, message) if code is not None else None
+    if error is not None:
+      return ExchangeAvailability(email=email, busy=None, error=error)
+
+    merged = response.findtext(u'.//' + T_MERGED_FREE_BUSY) or u''
+    slot = timedelta(minutes=interval)
+    busy = []
+
+    for index, status in enumerate(merged):
+      if status not in MERGED_BUSY_STATUSES:
+        continue
+
+      slot_start = start + index * slot
+      if busy and busy[-1][1] == slot_start:
+        busy[-1] = (busy[-1][0], slot_start + slot)
+      else:
+        busy.append((slot_start, slot_start + slot))
+
+    return ExchangeAvailability(email=email, busy=busy, error=None)
+
+  def send_batch(self, xml, headers=None, retries=4, timeout=30, encoding="utf-8"):
+    """
+    Like send, but for requests that act on several items at once. Returns the <m:*ResponseMessage> nodes, one per
+    item in request order. A SOAP fault still raises, but a failed item doesn't - pass each message's ResponseCode to
+    _response_code_exception to find out what happened to it.
+    """
+    tree = self._send_unchecked(xml, headers=headers, retries=retries, timeout=timeout, encoding=encoding)
+    return self._response_messages(tree)
+
+  def _response_messages(self, tree):
+    messages = []
+    for response_messages in tree.iter(M_RESPONSE_MESSAGES):
+      messages.extend(response_messages.iterchildren(tag=etree.Element))
+
+    if not messages:
+      raise FailedExchangeException(u"Exchange server did not return a status response", None)
+
+    return messages
+
+  def _send_unchecked(self, xml, headers=None, retries=4, timeout=30, encoding="utf-8"):
+    """ Like send, but only raises for SOAP faults - response codes are left to the caller. """
+    request_xml = self._wrap_soap_xml_request(xml)
+    if log.isEnabledFor(logging.INFO):
+      log.info(etree.tostring(request_xml, encoding=encoding, pretty_print=True))
+
+    def attempt(remaining):
+      response = self._send_soap_request(request_xml, headers=headers, retries=0, timeout=remaining, encoding=encoding)
+      tree = self._parse_xml(response, encoding=encoding)
+      self._check_for_SOAP_fault(tree)
+      return tree
+
+    tree = self.retry_policy.call(attempt, retries, timeout, retry_on=self.RETRY_ON)
+
+    if log.isEnabledFor(logging.INFO):
+      log.info(etree.tostring(tree, encoding=encoding, pretty_print=True))
+
+    return tree
+
   def _send_soap_request(self, body, headers=None, retries=2, timeout=30, encoding="utf-8"):
-    headers = {
+    headers = self._request_headers(encoding)
+    return super(Exchange2010Service, self)._send_soap_request(body, headers=headers, retries=retries, timeout=timeout, encoding=encoding)
+
+  def _send_soap_request_streaming(self, body, headers=None, retries=2, timeout=30, encoding="utf-8"):
+    headers = self._request_headers(encoding)
+    return super(Exchange2010Service, self)._send_soap_request_streaming(body, headers=headers, retries=retries, timeout=timeout, encoding=encoding)
+
+  def _request_headers(self, encoding):
+    return {
       "Accept": "text/xml",
       "Content-type": "text/xml; charset=%s " % encoding
     }
-    return super(Exchange2010Service, self)._send_soap_request(body, headers=headers, retries=retries, timeout=timeout, encoding=encoding)
 
   def _check_for_errors(self, xml_tree):
     super(Exchange2010Service, self)._check_for_errors(xml_tree)
     self._check_for_exchange_fault(xml_tree)
 
+  def _streaming_status_tags(self):
+    return super(Exchange2010Service, self)._streaming_status_tags() + [u'{%s}*' % soap_request.MSG_NS]
+
+  def _raise_for_fault(self, fault):
+    # Faults about the request as a whole, like being throttled, carry the same codes as response messages do
+    code = fault.findtext(FAULT_RESPONSE_CODE)
+    if code is not None:
+      self._check_response_code(code, fault)
+
+    super(Exchange2010Service, self)._raise_for_fault(fault)
+
+  def _check_streamed_status(self, element):
+    # An error waits for its whole ResponseMessage rather than being raised at the ResponseCode, because the
+    # BackOffMilliseconds hint Exchange sends when it's busy comes after the code. A successful code is counted
+    # straight away, since yielding an element like RootFolder drops the ResponseCode before it.
+    if element.tag == M_RESPONSE_CODE:
+      return self._response_code_exception(element.text) is None
+
+    if element.tag.endswith(u'ResponseMessage'):
+      code = element.findtext(M_RESPONSE_CODE)
+      if code is not None:
+        self._check_response_code(code, element)
+      return False
+
+    return super(Exchange2010Service, self)._check_streamed_status(element)
+
+  def _check_end_of_stream(self, statuses_seen):
+    if not statuses_seen:
+      raise FailedExchangeException(u"Exchange server did not return a status response", None)
+
   def _check_for_exchange_fault(self, xml_tree):
 
     # If the request succeeded, we should see a <m:ResponseCode>NoError</m:ResponseCode>
@@ -58,48 +493,648 @@ class Exchange2010Service(ExchangeServiceSOAP):
     if not response_codes:
       raise FailedExchangeException(u"Exchange server did not return a status response", None)
 
+    for code in response_codes:
+      self._check_response_code(code.text, code.getparent())
+
+  def _check_response_code(self, code, message=None):
+    error = self._response_code_exception(code, message)
+    if error is not None:
+      raise error
+
+  def _response_code_exception(self, code, message=None):
+    """
+    Returns the exception a ResponseCode stands for, or None if it means the request went through. message is the
+    node the code came from, which is where Exchange says how long to back off for when it's busy.
+    """
+
     # The full (massive) list of possible return responses is here.
     # http://msdn.microsoft.com/en-us/library/aa580757(v=exchg.140).aspx
-    for code in response_codes:
-      if code.text == u"ErrorChangeKeyRequiredForWriteOperations":
-        # change key is missing or stale. we can fix that, so throw a special error
-        raise ExchangeStaleChangeKeyException(u"Exchange Fault (%s) from Exchange server" % code.text)
-      elif code.text == u"ErrorItemNotFound":
-        # exchange_invite_key wasn't found on the server
-        raise ExchangeItemNotFoundException(u"Exchange Fault (%s) from Exchange server" % code.text)
-      elif code.text == u"ErrorIrresolvableConflict":
-        # tried to update an item with an old change key
-        raise ExchangeIrresolvableConflictException(u"Exchange Fault (%s) from Exchange server" % code.text)
-      elif code.text == u"ErrorInternalServerTransientError":
-        # temporary internal server error. throw a special error so we can retry
-        raise ExchangeInternalServerTransientErrorException(u"Exchange Fault (%s) from Exchange server" % code.text)
-      elif code.text == u"ErrorCalendarOccurrenceIndexIsOutOfRecurrenceRange":
-        # just means some or all of the requested instances are out of range
+    if code == u"ErrorChangeKeyRequiredForWriteOperations":
+      # change key is missing or stale. we can fix that, so throw a special error
+      return ExchangeStaleChangeKeyException(u"Exchange Fault (%s) from Exchange server" % code)
+    elif code == u"ErrorItemNotFound":
+      # exchange_invite_key wasn't found on the server
+      return ExchangeItemNotFoundException(u"Exchange Fault (%s) from Exchange server" % code)
+    elif code == u"ErrorIrresolvableConflict":
+      # tried to update an item with an old change key
+      return ExchangeIrresolvableConflictException(u"Exchange Fault (%s) from Exchange server" % code)
+    elif code == u"ErrorInternalServerTransientError":
+      # temporary internal server error. throw a special error so we can retry
+      return ExchangeInternalServerTransientErrorException(u"Exchange Fault (%s) from Exchange server" % code)
+    elif code == u"ErrorServerBusy":
+      # we're being throttled, and exchange may have said for how long
+      return ExchangeServerBusyException(u"Exchange Fault (%s) from Exchange server" % code, back_off=self._back_off(message))
+    elif code in (u"ErrorSubscriptionNotFound", u"ErrorExpiredSubscription", u"ErrorInvalidSubscription"):
+      # the subscription timed out or the server forgot it. subscribe again
+      return ExchangeSubscriptionExpiredException(u"Exchange Fault (%s) from Exchange server" % code)
+    elif code == u"ErrorCalendarOccurrenceIndexIsOutOfRecurrenceRange":
+      # just means some or all of the requested instances are out of range
+      return None
+    elif code != u"NoError":
+      return FailedExchangeException(u"Exchange Fault (%s) from Exchange server" % code)
+
+    return None
+
+  def _back_off(self, message):
+    """ Seconds the BackOffMilliseconds hint under message asks us to wait, or None if there isn't one. """
+    if message is None:
+      return None
+
+    for value in BACK_OFF_XPATH(message):
+      try:
+        return int(value.text) / 1000.0
+      except (TypeError, ValueError):
         pass
-      elif code.text != u"NoError":
-        raise FailedExchangeException(u"Exchange Fault (%s) from Exchange server" % code.text)
+
+    return None
+
+
+def _unique(values):
+  seen = set()
+  for value in values:
+    if value not in seen:
+      seen.add(value)
+      yield value
+
+
+def _revalidate_cached_event(cache, id, cached, change_key):
+  """ Whether the cached entry for id is still current, given the change key Exchange has for it now. """
+  if change_key != cached.change_key:
+    return False
+
+  # Exchange says it hasn't changed, so it's good for another revalidate_after seconds
+  cache.set(id, cached.change_key, cached.data)
+  return True
+
+
+def _cache_event(cache, id, event, response_xml):
+  calendar_items = CALENDAR_ITEM_XPATH(response_xml)
+  if calendar_items and event.change_key:
+    cache.set(id, event.change_key, etree.tostring(calendar_items[0]))
+
+
+def _change_key_from_response(response_xml):
+  id_element = response_xml.find(u'.//' + T_ITEM_ID)
+  return id_element.get(u'ChangeKey') if id_element is not None else None
+
+
+class Exchange2010FanOutResults(dict):
+  """
+  What :meth:`Exchange2010Service.fan_out` got from each mailbox: a dict of email address to
+  :class:`ExchangeMailboxResult`, in the order the mailboxes were given, plus an :class:`ExchangeFanOutStats` as stats.
+  """
+
+  def __init__(self, results, elapsed):
+    super(Exchange2010FanOutResults, self).__init__((result.mailbox, result) for result in results)
+    self.mailboxes = [result.mailbox for result in results]
+
+    seconds = [result.seconds for result in results]
+    failed = len([result for result in results if result.error is not None])
+    self.stats = ExchangeFanOutStats(
+      mailboxes=len(results),
+      succeeded=len(results) - failed,
+      failed=failed,
+      elapsed=elapsed,
+      total_seconds=sum(seconds),
+      mean_seconds=sum(seconds) / len(seconds) if seconds else 0.0,
+      max_seconds=max(seconds) if seconds else 0.0,
+    )
+
+  def succeeded(self):
+    """ The results of the mailboxes that worked, in order. """
+    return [self[mailbox] for mailbox in self.mailboxes if self[mailbox].error is None]
+
+  def failed(self):
+    """ The results of the mailboxes that raised an exception, in order. """
+    return [self[mailbox] for mailbox in self.mailboxes if self[mailbox].error is not None]
 
 
 class Exchange2010CalendarService(BaseExchangeCalendarService):
 
+  # Most events we'll put in a single CreateItem, UpdateItem or DeleteItem request.
+  BULK_CHUNK_SIZE = 100
+
+  # Most changes Exchange will hand back from a single SyncFolderItems request.
+  MAX_SYNC_CHANGES = 512
+
   def event(self, id=None, **kwargs):
     return Exchange2010CalendarEvent(service=self.service, id=id, **kwargs)
 
-  def get_event(self, id):
-    return Exchange2010CalendarEvent(service=self.service, id=id)
+  def get_event(self, id, fields=None):
+    """
+      get_event(id, fields=None)
+      :param str id:  The Exchange id of the event.
+      :param list fields:  Property names to load, like ['subject', 'start', 'end']. Defaults to everything.
+
+      Loads an event. Asking for just the fields you need keeps Exchange from sending, and us from parsing, the
+      ones you don't - bodies in particular. Events loaded with fields aren't cached.
+    """
+    if fields is not None:
+      body = soap_request.get_item(exchange_id=id, format=u'AllProperties', fields=fields)
+      return Exchange2010CalendarEvent(service=self.service, xml=self.service.send(body))
+
+    cache = getattr(self.service, 'event_cache', None)
+    if cache is None:
+      return Exchange2010CalendarEvent(service=self.service, id=id)
+
+    return self._get_cached_event(cache, id)
+
+  def _get_cached_event(self, cache, id):
+    """
+    Serves id from the cache if it's there and still current, otherwise fetches it and caches it. An entry is
+    current if it's younger than the cache's revalidate_after, or if an IdOnly GetItem says its change key hasn't
+    moved on.
+    """
+    cached = cache.get(id)
+
+    if cached is not None:
+      if cache.is_fresh(cached) or _revalidate_cached_event(cache, id, cached, self._current_change_key(cache, id)):
+        log.debug(u'Serving event %s from the cache', id)
+        return Exchange2010CalendarEvent(service=self.service, xml=etree.fromstring(cached.data))
+
+    body = soap_request.get_item(exchange_id=id, format=u'AllProperties')
+    response_xml = self.service.send(body)
+
+    event = Exchange2010CalendarEvent(service=self.service, xml=response_xml)
+    _cache_event(cache, id, event, response_xml)
+
+    return event
+
+  def _current_change_key(self, cache, id):
+    body = soap_request.get_item(exchange_id=id, format=u'IdOnly')
+
+    try:
+      response_xml = self.service.send(body)
+    except ExchangeItemNotFoundException:
+      cache.discard(id)
+      raise
+
+    return _change_key_from_response(response_xml)
 
   def new_event(self, **properties):
     return Exchange2010CalendarEvent(service=self.service, calendar_id=self.calendar_id, **properties)
 
-  def list_events(self, start=None, end=None, details=False):
-    return Exchange2010CalendarEventList(service=self.service, start=start, end=end, details=details)
+  def list_events(self, start=None, end=None, details=False, fields=None, read_only=False):
+    """
+      list_events(start, end, details=False, fields=None, read_only=False)
+      :param list fields:  Property names to load, like ['subject', 'start', 'end', 'organizer']. Defaults to everything.
+      :param bool read_only:  List :class:`Exchange2010CalendarEventRecord` objects instead of events.
+
+      Lists the events between start and end. With details, each event is then loaded in full with GetItem. Bodies,
+      attendees, resources and recurrence only come with details - see soap_request.GET_ITEM_ONLY_FIELDS.
+    """
+    return Exchange2010CalendarEventList(
+      service=self.service, start=start, end=end, details=details, fields=fields, read_only=read_only,
+    )
+
+  def iter_events(self, start=None, end=None, page_size=100, fields=None, read_only=False):
+    """
+      iter_events(start, end, page_size=100, fields=None, read_only=False)
+      :param datetime start:  The start of the window to list.
+      :param datetime end:  The end of the window to list.
+      :param int page_size:  The maximum number of events to request from Exchange at a time.
+      :param list fields:  Property names to load, like ['subject', 'start', 'end']. Defaults to everything.
+      :param bool read_only:  Yield :class:`Exchange2010CalendarEventRecord` objects instead of events.
+
+      Lazily yields every event between start and end, asking Exchange for at most page_size events per request.
+      Unlike :meth:`list_events`, only one page of results is held in memory at a time.
+
+      **Examples**::
+
+        for event in service.calendar().iter_events(start=start, end=end, page_size=500):
+          print event.subject
+
+    """
+
+    if page_size < 1:
+      raise ValueError(u"page_size must be a positive integer")
+
+    if fields is not None:
+      _check_find_item_fields(fields)
+      # Paging goes by start time, so we need it whether it was asked for or not
+      fields = list(fields) if u'start' in fields else list(fields) + [u'start']
+
+    start = convert_datetime_to_utc(start)
+    end = convert_datetime_to_utc(end)
+    parser = Exchange2010CalendarItemParser(self.service) if read_only else None
+
+    # CalendarView has no offset - results are sorted by start time, so each following page restarts the view at the
+    # start of the last event we saw. Anything starting before that was already yielded, and the events starting
+    # exactly at that moment are remembered by id so they aren't yielded twice.
+    page_start = start
+    seen_at_page_start = set()
+    is_first_page = True
+
+    while page_start < end:
+      body = soap_request.get_calendar_items(format=u'AllProperties', start=page_start, end=end, max_entries=page_size, fields=fields)
+
+      includes_last_item = True
+      item_count = 0
+      next_start = page_start
+      seen_at_next_start = set(seen_at_page_start)
+
+      # <m:RootFolder> closes after all of its items, so we know whether this was the last page once they're done.
+      for element in self.service.send_streaming(body, tags=[T_CALENDAR_ITEM, M_ROOT_FOLDER]):
+        if element.tag == M_ROOT_FOLDER:
+          includes_last_item = element.get(u'IncludesLastItemInRange', u'true').lower() == u'true'
+          continue
+
+        item_count += 1
+        if read_only:
+          event = Exchange2010CalendarEventRecord.from_xml(parser, element)
+        else:
+          event = Exchange2010CalendarEvent(service=self.service, xml=element)
+
+        if event.start is not None and event.start > next_start:
+          next_start = event.start
+          seen_at_next_start = set()
+
+        if event.start == next_start:
+          seen_at_next_start.add(event.id)
+
+        if not is_first_page:
+          if event.start is not None and event.start < page_start:
+            continue
+          if event.start == page_start and event.id in seen_at_page_start:
+            continue
+
+        yield event
+
+      if includes_last_item or not item_count:
+        return
+
+      if next_start == page_start:
+        # Everything in this page started at the same moment, so asking again would give us the same page.
+        page_size *= 2
+        log.debug(u'Page made no progress, growing page size to %s', page_size)
+
+      page_start = next_start
+      seen_at_page_start = seen_at_next_start
+      is_first_page = False
+
+  def export_events(self, start, end, events_file, attendees_file=None, format=u'csv', details=False, page_size=100,
+                    batch_size=export.EXPORT_BATCH_SIZE):
+    """
+      export_events(start, end, events_file, attendees_file=None, format='csv', details=False, page_size=100)
+      :param str format:  One of pyexchange.export.FORMATS - 'csv', 'jsonl' or 'parquet'.
+      :param bool details:  Load each page of events in full, with GetItem, before writing it out.
+
+      Writes the events between start and end to events_file, and their attendees and resources to attendees_file -
+      see :mod:`pyexchange.export`. Events are listed page_size at a time and never built into full events, so memory
+      use doesn't grow with the size of the calendar. FindItem doesn't return attendees, bodies or recurrence, so
+      attendees_file stays empty without details. Returns the number of events written.
+    """
+    events = self.iter_events(start=start, end=end, page_size=page_size, read_only=True)
+    if details:
+      events = self._iter_event_details(events, page_size)
+
+    return export.write(events, events_file, attendees_file=attendees_file, format=format, batch_size=batch_size)
+
+  def _iter_event_details(self, events, batch_size):
+    """ Loads events in full, batch_size at a time, and yields them as read-only records. """
+    parser = Exchange2010CalendarItemParser(self.service)
+    event_ids = []
+
+    for event in events:
+      event_ids.append(event.id)
+      if len(event_ids) < batch_size:
+        continue
+
+      for record in self._load_records(parser, event_ids):
+        yield record
+      event_ids = []
+
+    if event_ids:
+      for record in self._load_records(parser, event_ids):
+        yield record
+
+  def _load_records(self, parser, event_ids):
+    body = soap_request.get_item(exchange_id=event_ids, format=u'AllProperties')
+    return [
+      Exchange2010CalendarEventRecord.from_xml(parser, calendar_item)
+      for calendar_item in self.service.send_streaming(body, tags=[T_CALENDAR_ITEM])
+    ]
+
+  def sync(self, state=None, max_changes=MAX_SYNC_CHANGES):
+    """
+      sync(state=None, max_changes=512)
+      :param str state:  The state from the last call, or None to start from scratch.
+      :param int max_changes:  The most changes to return, up to 512.
+
+      Asks Exchange which events in this calendar were created, updated or deleted since state was handed out, and
+      returns an :class:`Exchange2010CalendarChanges` with their ids and a new state. Without a state, every event
+      in the calendar comes back as created.
+
+      At most max_changes come back at a time. Keep calling with the new state until includes_last_item is True.
+      The state is an opaque string - store it between runs and you only ever download what changed.
+
+      **Examples**::
+
+        state = load_state()
+        while True:
+          changes = service.calendar().sync(state=state)
+          for id in changes.deleted:
+            forget(id)
+          refresh(changes.created + changes.updated)
+
+          state = changes.state
+          save_state(state)
+          if changes.includes_last_item:
+            break
+
+    """
+
+    if not 1 <= max_changes <= self.MAX_SYNC_CHANGES:
+      raise ValueError(u"max_changes must be between 1 and %s" % self.MAX_SYNC_CHANGES)
+
+    body = soap_request.sync_folder_items(folder_id=self.calendar_id, sync_state=state, max_changes=max_changes)
+    response_xml = self.service.send(body)
+
+    return self._parse_response_for_sync(response_xml)
+
+  def _parse_response_for_sync(self, response):
+
+    changes = Exchange2010CalendarChanges()
+
+    state = next(response.iter(M_SYNC_STATE), None)
+    if state is not None:
+      changes.state = state.text
+
+    includes_last_item = next(response.iter(M_INCLUDES_LAST_ITEM_IN_RANGE), None)
+    if includes_last_item is not None:
+      changes.includes_last_item = (includes_last_item.text or u'').strip().lower() == u'true'
+
+    for changes_node in response.iter(M_CHANGES):
+      for change in changes_node.iterchildren(tag=etree.Element):
+        if change.tag not in SYNC_CHANGE_TYPES:
+          continue
+
+        # Creates and updates wrap the item, deletes only have its id
+        id_element = next(change.iter(T_ITEM_ID), None)
+        if id_element is not None:
+          getattr(changes, SYNC_CHANGE_TYPES[change.tag]).append(id_element.get(u'Id'))
+
+    log.debug(u'Sync found %s created, %s updated and %s deleted items', len(changes.created), len(changes.updated), len(changes.deleted))
+    return changes
+
+  def bulk_create(self, events, chunk_size=None):
+    """
+      bulk_create(events, chunk_size=100)
+      :param list events:  New events, as returned by :meth:`new_event`.
+      :param int chunk_size:  The most events to put in one request.
+
+      Creates many events with one CreateItem request per chunk_size events (per calendar), instead of one request
+      per event. Every event is validated before anything is sent.
+
+      Returns a list with one entry per event: None if it was created - its id and change key are filled in - or the
+      exception Exchange gave back for it.
+
+      **Examples**::
+
+        events = [service.calendar().new_event(subject=subject, start=start, end=end) for subject in subjects]
+        errors = service.calendar().bulk_create(events)
+
+        for event, error in zip(events, errors):
+          if error is not None:
+            print event.subject, error
+
+    """
+    events = list(events)
+    for event in events:
+      event.validate()
+
+    errors = [None] * len(events)
+
+    # CreateItem saves everything in one folder, so events for different calendars go in different requests.
+    calendar_ids = []
+    indexes_by_calendar = {}
+    for index, event in enumerate(events):
+      if event.calendar_id not in indexes_by_calendar:
+        calendar_ids.append(event.calendar_id)
+        indexes_by_calendar[event.calendar_id] = []
+      indexes_by_calendar[event.calendar_id].append(index)
+
+    for calendar_id in calendar_ids:
+      for chunk in self._chunk(indexes_by_calendar[calendar_id], chunk_size):
+        body = soap_request.new_events([events[index] for index in chunk])
+        self._apply_response_messages(events, chunk, self.service.send_batch(body), errors)
+
+    return errors
+
+  def bulk_update(self, events, calendar_item_update_operation_type=u'SendToAllAndSaveCopy', chunk_size=None):
+    """
+      bulk_update(events, calendar_item_update_operation_type=u'SendToAllAndSaveCopy', chunk_size=100)
+      :param list events:  Events that have been created, with unsaved changes.
+      :param str calendar_item_update_operation_type:  Who to notify of the changes - see :meth:`Exchange2010CalendarEvent.update`.
+      :param int chunk_size:  The most events to put in one request.
+
+      Saves changes to many events with two requests per chunk_size events - one to refresh their change keys and
+      one UpdateItem - instead of two per event. Events without changes are skipped.
+
+      Returns a list with one entry per event: None if it was saved (or had nothing to save), or the exception
+      Exchange gave back for it.
+    """
+    events = list(events)
+    for event in events:
+      event._check_update_operation_type(calendar_item_update_operation_type)
+      event.validate()
+
+    errors = [None] * len(events)
+    changed = [index for index, event in enumerate(events) if event._dirty_attributes]
+
+    for chunk in self._chunk(changed, chunk_size):
+      chunk = self._refresh_change_keys(events, chunk, errors)
+      if not chunk:
+        continue
+
+      changes = [(events[index], events[index]._dirty_attributes) for index in chunk]
+      body = soap_request.update_items(changes, calendar_item_update_operation_type=calendar_item_update_operation_type)
+      self._apply_response_messages(events, chunk, self.service.send_batch(body), errors)
+
+      for index in chunk:
+        events[index]._forget_cached()
+        if errors[index] is None:
+          events[index]._reset_dirty_attributes()
+
+    return errors
+
+  def bulk_cancel(self, events, chunk_size=None):
+    """
+      bulk_cancel(events, chunk_size=100)
+      :param list events:  Events that have been created.
+      :param int chunk_size:  The most events to put in one request.
+
+      Cancels many events with two requests per chunk_size events - one to refresh their change keys and one
+      DeleteItem - instead of two per event.
+
+      Returns a list with one entry per event: None if it was cancelled, or the exception Exchange gave back for it.
+    """
+    events = list(events)
+    for event in events:
+      if not event.id:
+        raise TypeError(u"You can't delete an event that hasn't been created yet.")
+
+    errors = [None] * len(events)
+
+    for chunk in self._chunk(list(range(len(events))), chunk_size):
+      chunk = self._refresh_change_keys(events, chunk, errors)
+      if not chunk:
+        continue
+
+      body = soap_request.delete_events([events[index] for index in chunk])
+      self._apply_response_messages(events, chunk, self.service.send_batch(body), errors)
+
+      for index in chunk:
+        events[index]._forget_cached()
+
+    return errors
+
+  def get_masters(self, events, chunk_size=None):
+    """
+      get_masters(events, chunk_size=100)
+      :param list events:  Occurrences or exceptions of recurring events, or their ids.
+      :param int chunk_size:  The most events to put in one request.
+      :raises InvalidEventType: When one of the events isn't an occurrence or an exception.
+
+      Like :meth:`Exchange2010CalendarEvent.get_master` for many events, with one GetItem per chunk_size events.
+
+      Returns a list with one entry per event: its master, or the exception Exchange gave back for it.
+    """
+    references = []
+    for event in events:
+      if not isinstance(event, BASESTRING_TYPES):
+        if event.type not in (u'Occurrence', u'Exception'):
+          raise InvalidEventType(u"get_masters can only be given 'Occurrence' or 'Exception' events")
+        event = event.id
+      references.append(event)
+
+    return self._get_recurring_items(references, chunk_size)
+
+  def get_occurrences(self, instance_indexes, chunk_size=None):
+    """
+      get_occurrences(instance_indexes, chunk_size=100)
+      :param dict instance_indexes:  Lists of instance indexes, keyed by the id of their recurring master.
+      :param int chunk_size:  The most occurrences to put in one request.
+
+      Like :meth:`Exchange2010CalendarEvent.get_occurrence` for many masters at once. Occurrences of all of them are
+      asked for together, chunk_size per GetItem.
+
+      Returns a dict with the same keys. Each value is the list of that master's occurrences, in the order they were
+      asked for, leaving out indexes past the end of the series. If Exchange gave back an error for any of a master's
+      occurrences, its value is that exception instead.
+
+      **Examples**::
+
+        occurrences = service.calendar().get_occurrences({master.id: range(1, 11) for master in masters})
+
+    """
+    references = []
+    for master_id, indexes in instance_indexes.items():
+      indexes = list(indexes)
+      if not all(isinstance(index, int) for index in indexes):
+        raise TypeError(u"instance indexes must be ints")
+      references.extend((master_id, index) for index in indexes)
+
+    results = dict((master_id, []) for master_id in instance_indexes)
+    for (master_id, _), result in zip(references, self._get_recurring_items(references, chunk_size)):
+      if isinstance(results[master_id], Exception):
+        continue
+
+      if isinstance(result, Exception):
+        results[master_id] = result
+      elif result.id:
+        results[master_id].append(result)
+
+    return results
+
+  def _get_recurring_items(self, references, chunk_size=None):
+    """
+    Loads the items soap_request.get_recurring_items references, chunk_size per request. Returns one entry per
+    reference: the event, or the exception Exchange gave back for it.
+    """
+    results = [None] * len(references)
+
+    for chunk in self._chunk(list(range(len(references))), chunk_size):
+      body = soap_request.get_recurring_items([references[index] for index in chunk], format=u'AllProperties')
+      messages = self.service.send_batch(body)
+
+      if len(messages) != len(chunk):
+        raise FailedExchangeException(u"Exchange server returned %s responses for %s items" % (len(messages), len(chunk)), None)
+
+      for index, message in zip(chunk, messages):
+        error = self.service._response_code_exception(message.findtext(M_RESPONSE_CODE), message)
+        if error is not None:
+          results[index] = error
+          continue
+
+        # Parsed relative to its <m:Items>, which is empty for an index past the end of the series
+        items = message.find(M_ITEMS)
+        results[index] = Exchange2010CalendarEvent(service=self.service, xml=items if items is not None else etree.Element(M_ITEMS))
+
+    return results
+
+  def _chunk(self, indexes, chunk_size=None):
+    chunk_size = chunk_size or self.BULK_CHUNK_SIZE
+    if chunk_size < 1:
+      raise ValueError(u"chunk_size must be a positive integer")
+
+    return [indexes[i:i + chunk_size] for i in range(0, len(indexes), chunk_size)]
+
+  def _refresh_change_keys(self, events, indexes, errors):
+    """ Refreshes the change keys of events[index] for each index with one GetItem, and returns the indexes that worked. """
+    body = soap_request.get_item(exchange_id=[events[index].id for index in indexes], format=u"IdOnly")
+    self._apply_response_messages(events, indexes, self.service.send_batch(body), errors)
+
+    return [index for index in indexes if errors[index] is None]
+
+  def _apply_response_messages(self, events, indexes, messages, errors):
+    """
+    Matches up the ResponseMessages of a bulk request with the events it was sent for. Successful messages update
+    the event's id and change key, failed ones put their exception in errors.
+    """
+    if len(messages) != len(indexes):
+      raise FailedExchangeException(u"Exchange server returned %s responses for %s items" % (len(messages), len(indexes)), None)
+
+    for index, message in zip(indexes, messages):
+      error = self.service._response_code_exception(message.findtext(M_RESPONSE_CODE), message)
+      if error is not None:
+        errors[index] = error
+        continue
+
+      items = message.find(M_ITEMS)
+      if items is not None:
+        id, change_key = events[index]._parse_id_and_change_key_from_response(items)
+        if id:
+          events[index]._id, events[index]._change_key = id, change_key
+
+
+class Exchange2010CalendarChanges(object):
+  """
+  What changed in a calendar since the last sync - see :meth:`Exchange2010CalendarService.sync`. created, updated
+  and deleted are lists of event ids, state is what to pass to the next sync.
+  """
+
+  def __init__(self, state=None, includes_last_item=True, created=None, updated=None, deleted=None):
+    self.state = state
+    self.includes_last_item = includes_last_item
+    self.created = created or []
+    self.updated = updated or []
+    self.deleted = deleted or []
 
 
 class Exchange2010CalendarEventList(object):
   """
-  Creates & Stores a list of Exchange2010CalendarEvent items in the "self.events" variable.
+  Creates & Stores a list of Exchange2010CalendarEvent items in the "self.events" variable - or, with read_only, a
+  list of Exchange2010CalendarEventRecord items.
   """
-  def __init__(self, service=None, start=None, end=None, details=False):
+
+  # Most event ids we'll put in a single GetItem request when loading details.
+  DETAILS_BATCH_SIZE = 100
+
+  # Built by the first time query - see _interval_index
+  _index = None
+
+  def __init__(self, service=None, start=None, end=None, details=False, fields=None, read_only=False):
     self.service = service
     self.count = 0
     self.start = start
@@ -107,15 +1142,13 @@ class Exchange2010CalendarEventList(object):
     self.events = list()
     self.event_ids = list()
     self.details = details
+    self.fields = fields
+    self.read_only = read_only
+    self._parser = Exchange2010CalendarItemParser(service)
 
     # This request uses a Calendar-specific query between two dates.
-    body = soap_request.get_calendar_items(format=u'AllProperties', start=self.start, end=self.end)
-    response_xml = self.service.send(body)
-    self._parse_response_for_all_events(response_xml)
-
-    # Populate the event ID list, for convenience reasons.
-    for event in self.events:
-      self.event_ids.append(event._id)
+    body = self._find_items_request()
+    self._parse_response_for_all_events(self.service.send_streaming(body, tags=[T_CALENDAR_ITEM]))
 
     # If we have requested all the details, basically repeat the previous 3 steps,
     # but instead of start/stop, we have a list of ID fields.
@@ -124,55 +1157,382 @@ class Exchange2010CalendarEventList(object):
       self.load_all_details()
     return
 
-  def _parse_response_for_all_events(self, response):
+  def _find_items_request(self):
+    fields = self.fields
+    if fields is not None:
+      if self.details:
+        # FindItem only has to find the ids - GetItem loads whatever it can't return
+        fields = [field for field in fields if field not in soap_request.GET_ITEM_ONLY_FIELDS]
+      else:
+        _check_find_item_fields(fields)
+
+    return soap_request.get_calendar_items(format=u'AllProperties', start=self.start, end=self.end, fields=fields)
+
+  def _parse_response_for_all_events(self, calendar_items):
     """
     This function will retrieve *most* of the event data, excluding Organizer & Attendee details
     """
-    items = response.xpath(u'//m:FindItemResponseMessage/m:RootFolder/t:Items/t:CalendarItem', namespaces=soap_request.NAMESPACES)
-    if not items:
-      items = response.xpath(u'//m:GetItemResponseMessage/m:Items/t:CalendarItem', namespaces=soap_request.NAMESPACES)
-    if items:
-      self.count = len(items)
-      log.debug(u'Found %s items' % self.count)
-
-      for item in items:
-        self._add_event(xml=soap_request.M.Items(deepcopy(item)))
+    events = self._build_events(calendar_items)
+    if events:
+      self.count = len(events)
+      log.debug(u'Found %s items', self.count)
+      self.events.extend(events)
     else:
       log.debug(u'No calendar items found with search parameters.')
 
-    return self
+    # Populate the event ID list, for convenience reasons.
+    for event in events:
+      self.event_ids.append(event.id)
 
-  def _add_event(self, xml=None):
-    log.debug(u'Adding new event to all events list.')
-    event = Exchange2010CalendarEvent(service=self.service, xml=xml)
-    log.debug(u'Subject of new event is %s' % event.subject)
-    self.events.append(event)
+    self.reindex()
     return self
 
-  def load_all_details(self):
+  def _build_events(self, calendar_items):
+    """ Builds events out of <t:CalendarItem> nodes, as streamed by ExchangeServiceSOAP.send_streaming """
+    events = []
+    for item in calendar_items:
+      log.debug(u'Adding new event to all events list.')
+      event = self._event_from_xml(item)
+      log.debug(u'Subject of new event is %s', event.subject)
+      events.append(event)
+
+    return events
+
+  def _event_from_xml(self, xml):
+    if self.read_only:
+      return Exchange2010CalendarEventRecord.from_xml(self._parser, xml)
+    return Exchange2010CalendarEvent(service=self.service, xml=xml)
+
+  def load_all_details(self, batch_size=None, max_workers=1):
     """
     This function will execute all the event lookups for known events.
 
     This is intended for use when you want to have a completely populated event entry, including
     Organizer & Attendee details.
+
+    Event ids are requested *batch_size* at a time (defaults to :attr:`DETAILS_BATCH_SIZE`). If *max_workers* is
+    more than 1, that many batches are sent at once over the service's connection. Events come back in the same
+    order as :attr:`event_ids` either way.
     """
     log.debug(u"Loading all details")
     if self.count > 0:
+      batches = self._batch_event_ids(batch_size)
+
+      if max_workers > 1 and len(batches) > 1:
+        pool = ThreadPool(min(max_workers, len(batches)))
+        try:
+          results = pool.map(self._load_details_for_batch, batches)
+        finally:
+          pool.close()
+          pool.join()
+      else:
+        results = [self._load_details_for_batch(batch) for batch in batches]
+
       # Now, empty out the events to prevent duplicates!
       del(self.events[:])
+      for events in results:
+        self.events.extend(events)
+      self.count = len(self.events)
+      self.reindex()
+
+    return self
+
+  def _interval_index(self):
+    if self._index is None:
+      self._index = intervals.EventIntervalIndex(self.events)
+    return self._index
+
+  def reindex(self):
+    """
+    Throws away the index the time queries use, so the next one rebuilds it. The list does this itself when it loads
+    events - call it after changing :attr:`events` or their times yourself.
+    """
+    self._index = None
+
+  def overlapping(self, start, end):
+    """
+    The events that overlap start to end, in order of their start. Like :meth:`at`, :meth:`free_slots` and
+    :meth:`conflicts`, the first call sorts the events into an index, so later ones only cost O(log n) plus what they
+    return.
+    """
+    return self._interval_index().overlapping(start, end)
+
+  def at(self, moment):
+    """ The events going on at moment, in order of their start. """
+    return self._interval_index().at(moment)
+
+  def free_slots(self, min_duration=timedelta(0), working_hours=None, start=None, end=None, tz=utc):
+    """
+    The (start, end) pairs, in UTC, of the gaps of at least min_duration with no events on, other than ones marked
+    Free. Looks between the start and end the list was made with unless given others.
+
+    working_hours, a pair of times like ``(time(9), time(17))``, keeps the gaps to those hours of each day in tz::
+
+      slots = event_list.free_slots(timedelta(minutes=30), (time(9), time(17)), tz=timezone('US/Pacific'))
+    """
+    start = start if start is not None else self.start
+    end = end if end is not None else self.end
+    if start is None or end is None:
+      raise ValueError(u"free_slots needs a start and end when the list doesn't have them")
+
+    return self._interval_index().free_slots(start, end, min_duration=min_duration, working_hours=working_hours, tz=tz)
+
+  def conflicts(self):
+    """ Every pair of events in the list that overlap each other, as (earlier, later) by start. """
+    return self._interval_index().conflicts()
+
+  def to_json_lines(self):
+    """
+    Yields each event as a line of JSON, as written by :meth:`Exchange2010CalendarEvent.as_json`, so the list can be
+    streamed out with ``file.writelines(event_list.to_json_lines())``.
+    """
+    return serialization.iter_json_lines(self.events)
+
+  def export(self, events_file, attendees_file=None, format=u'csv', batch_size=export.EXPORT_BATCH_SIZE):
+    """
+    Writes :attr:`events` to events_file, and their attendees and resources to attendees_file, in format - one of
+    'csv', 'jsonl' or 'parquet'. See :mod:`pyexchange.export`. Returns the number of events written.
+    """
+    return export.write(self.events, events_file, attendees_file=attendees_file, format=format, batch_size=batch_size)
+
+  def _batch_event_ids(self, batch_size=None):
+    batch_size = batch_size or self.DETAILS_BATCH_SIZE
+    if batch_size < 1:
+      raise ValueError(u"batch_size must be a positive integer")
+
+    batches = [self.event_ids[i:i + batch_size] for i in range(0, len(self.event_ids), batch_size)]
+    log.debug(u"Requesting details for %s events in %s batches", len(self.event_ids), len(batches))
+
+    return batches
+
+  def _load_details_for_batch(self, event_ids):
+    # Send the SOAP request with the list of exchange ID values.
+    log.debug(u"Requesting all event details for events: %s", event_ids)
+    body = soap_request.get_item(exchange_id=event_ids, format=u'AllProperties', fields=self.fields)
+
+    # Re-parse the results for all the details!
+    return self._build_events(self.service.send_streaming(body, tags=[T_CALENDAR_ITEM]))
+
+  def conflict_graph(self, batch_size=None):
+    """
+    Works out which events conflict with which, loading each conflicting meeting once however many events it
+    conflicts with, batch_size per GetItem. Conflicts only come with details, so list with details=True first.
+
+    Returns an :class:`Exchange2010ConflictGraph`. Conflicting meetings Exchange couldn't load - because they've been
+    deleted since, say - stay in the graph by id but have no event.
+    """
+    events, adjacency, requests = self._conflict_graph_requests(batch_size)
+
+    for body in requests:
+      self._add_conflicting_events(events, self.service.send_batch(body))
+
+    return Exchange2010ConflictGraph(adjacency=adjacency, events=events)
+
+  def _conflict_graph_requests(self, batch_size=None):
+    """ The events in the list by id, the adjacency between them and their conflicts, and the GetItems to send. """
+    events = dict((event.id, event) for event in self.events)
+    adjacency = dict((id, set()) for id in events)
+
+    for event in self.events:
+      for conflict_id in event.conflicting_event_ids or ():
+        adjacency[event.id].add(conflict_id)
+        adjacency.setdefault(conflict_id, set()).add(event.id)
+
+    missing = [id for id in adjacency if id not in events]
+    batch_size = batch_size or self.DETAILS_BATCH_SIZE
+    if batch_size < 1:
+      raise ValueError(u"batch_size must be a positive integer")
+
+    requests = [
+      soap_request.get_item(exchange_id=missing[i:i + batch_size], format=u'AllProperties', fields=self.fields)
+      for i in range(0, len(missing), batch_size)
+    ]
+    return events, adjacency, requests
+
+  def _add_conflicting_events(self, events, messages):
+    for message in messages:
+      if self.service._response_code_exception(message.findtext(M_RESPONSE_CODE), message) is not None:
+        continue
+
+      calendar_item = message.find(M_ITEMS + u'/' + T_CALENDAR_ITEM)
+      if calendar_item is not None:
+        event = self._event_from_xml(calendar_item)
+        events[event.id] = event
+
+
+class Exchange2010ConflictGraph(object):
+  """
+  Which events conflict with which - see :meth:`Exchange2010CalendarEventList.conflict_graph`. adjacency maps each
+  event id to the set of ids it conflicts with, both ways round. events maps ids to events, for the ones that could
+  be loaded.
+  """
+
+  def __init__(self, adjacency=None, events=None):
+    self.adjacency = adjacency or {}
+    self.events = events or {}
+
+  def conflicts(self, id):
+    """ The events that conflict with the event with this id. """
+    return [self.events[conflict_id] for conflict_id in sorted(self.adjacency.get(id, ())) if conflict_id in self.events]
+
+  def conflicting_ids(self):
+    """ The ids of the events that conflict with at least one other. """
+    return [id for id in self.adjacency if self.adjacency[id]]
+
+
+class Exchange2010CalendarItemParser(object):
+  """
+  Turns <t:CalendarItem> nodes into event properties. Exchange2010CalendarEvent parses itself with it, and
+  read-only listings use it on its own to build Exchange2010CalendarEventRecords without making events first.
+  """
+
+  def __init__(self, service):
+    self.service = service
+
+  def _parse_calendar_item(self, calendar_item):
+    """
+    Pulls every property we know about out of a <t:CalendarItem> node in one pass over its children, rather than
+    running an XPath query per property.
+    """
+
+    values = {}
+    attendees = []
+    resources = []
+    conflicting_ids = []
+    modified_occurrences = []
+    deleted_occurrences = []
+    organizer = None
+
+    for node in calendar_item.iterchildren(tag=etree.Element):
+      tag = node.tag
+
+      if tag in CALENDAR_ITEM_FIELDS:
+        key, cast_as = CALENDAR_ITEM_FIELDS[tag]
+        values.setdefault(key, []).append(self.service._cast_text(node.text, cast_as))
+
+      elif tag == T_BODY:
+        key = CALENDAR_ITEM_BODY_TYPES.get(node.get(u'BodyType'))
+        if key:
+          values.setdefault(key, []).append(node.text)
+
+      elif tag == T_RECURRENCE:
+        self._parse_recurrence(node, values)
+
+      elif tag == T_ORGANIZER:
+        mailbox = node.find(T_MAILBOX)
+        if mailbox is not None:
+          organizer = self._parse_mailbox(mailbox)
+
+      elif tag == T_REQUIRED_ATTENDEES or tag == T_OPTIONAL_ATTENDEES:
+        attendees.extend(self._parse_attendees(node, required=(tag == T_REQUIRED_ATTENDEES)))
+
+      elif tag == T_RESOURCES:
+        resources.extend(self._parse_attendees(node, required=True))
+
+      elif tag == T_CONFLICTING_MEETINGS:
+        conflicting_ids.extend(id_element.get(u"Id") for id_element in CONFLICTING_ITEM_ID_XPATH(node))
+
+      elif tag == T_MODIFIED_OCCURRENCES:
+        modified_occurrences.extend(self._parse_modified_occurrence(occurrence) for occurrence in node.iterchildren(tag=etree.Element))
+
+      elif tag == T_DELETED_OCCURRENCES:
+        for occurrence in node.iterchildren(tag=etree.Element):
+          deleted_occurrences.append(self.service._cast_text(occurrence.findtext(T_START), u'datetime'))
+
+    # Mirror ExchangeServiceSOAP._xpath_to_dict - a property that shows up more than once comes back as a list.
+    result = {}
+    for key in values:
+      result[key] = values[key][0] if len(values[key]) == 1 else values[key]
+
+    if organizer is not None:
+      result[u'organizer'] = ExchangeEventOrganizer(name=organizer.get(u'name'), email=organizer.get(u'email'))
+
+    result[u'_attendees'] = self._build_resource_dictionary([ExchangeEventResponse(**attendee) for attendee in attendees])
+    result[u'_resources'] = self._build_resource_dictionary([ExchangeEventResponse(**resource) for resource in resources])
+    result[u'_conflicting_event_ids'] = conflicting_ids
+    result[u'_modified_occurrences'] = modified_occurrences
+    result[u'_deleted_occurrences'] = deleted_occurrences
+
+    return result
+
+  def _parse_modified_occurrence(self, occurrence):
+    id_element = occurrence.find(T_ITEM_ID)
+    cast = self.service._cast_text
+
+    return ExchangeModifiedOccurrence(
+      id=id_element.get(u'Id') if id_element is not None else None,
+      change_key=id_element.get(u'ChangeKey') if id_element is not None else None,
+      start=cast(occurrence.findtext(T_START), u'datetime'),
+      end=cast(occurrence.findtext(T_END), u'datetime'),
+      original_start=cast(occurrence.findtext(T_ORIGINAL_START), u'datetime'),
+    )
+
+  def _parse_recurrence(self, recurrence_node, values):
+
+    for node in recurrence_node.iterchildren(tag=etree.Element):
+      if node.tag == T_END_DATE_RECURRENCE:
+        end_date = node.find(T_END_DATE)
+        if end_date is not None:
+          values.setdefault(u'recurrence_end_date', []).append(self.service._cast_text(end_date.text, u'date_only_naive'))
+        continue
+
+      interval = node.find(T_INTERVAL)
+      if interval is not None:
+        values.setdefault(u'recurrence_interval', []).append(self.service._cast_text(interval.text, u'int'))
+
+      if node.tag in RECURRENCE_TYPES:
+        values[u'recurrence'] = [RECURRENCE_TYPES[node.tag]]
+
+      if node.tag == T_WEEKLY_RECURRENCE:
+        days = node.find(T_DAYS_OF_WEEK)
+        if days is not None:
+          values.setdefault(u'recurrence_days', []).append(days.text)
+
+  def _parse_mailbox(self, mailbox):
+    result = {}
+    for node in mailbox.iterchildren(T_NAME, T_EMAIL_ADDRESS):
+      result[u'name' if node.tag == T_NAME else u'email'] = node.text
+    return result
+
+  def _parse_attendees(self, attendees_node, required):
+
+    result = []
+
+    for attendee in attendees_node.iterchildren(T_ATTENDEE):
+      attendee_properties = {u'name': None, u'response': None, u'last_response': None, u'required': required}
+
+      for node in attendee.iterchildren(tag=etree.Element):
+        if node.tag == T_MAILBOX:
+          attendee_properties.update(self._parse_mailbox(node))
+        elif node.tag == T_RESPONSE_TYPE:
+          attendee_properties[u'response'] = node.text
+        elif node.tag == T_LAST_RESPONSE_TIME:
+          attendee_properties[u'last_response'] = self.service._cast_text(node.text, u'datetime')
+
+      if u'email' in attendee_properties:
+        result.append(attendee_properties)
 
-      # Send the SOAP request with the list of exchange ID values.
-      log.debug(u"Requesting all event details for events: {event_list}".format(event_list=str(self.event_ids)))
-      body = soap_request.get_item(exchange_id=self.event_ids, format=u'AllProperties')
-      response_xml = self.service.send(body)
+    return result
 
-      # Re-parse the results for all the details!
-      self._parse_response_for_all_events(response_xml)
+  def _build_resource_dictionary(self, resources, required=True):
+    # Events use BaseExchangeCalendarEvent's, which also takes email addresses - we only ever see responses here
+    return dict((resource.email, resource) for resource in resources)
 
-    return self
 
+class Exchange2010CalendarEvent(BaseExchangeCalendarEvent, Exchange2010CalendarItemParser):
+
+  _modified_occurrences = ()
+  _deleted_occurrences = ()
 
-class Exchange2010CalendarEvent(BaseExchangeCalendarEvent):
+  @property
+  def modified_occurrences(self):
+    """ **Read-only.** For recurring masters, the occurrences that were changed, as ExchangeModifiedOccurrence tuples. """
+    return list(self._modified_occurrences)
+
+  @property
+  def deleted_occurrences(self):
+    """ **Read-only.** For recurring masters, when the occurrences that were deleted would have started. """
+    return list(self._deleted_occurrences)
 
   def _init_from_service(self, id):
     log.debug(u'Creating new Exchange2010CalendarEvent object from ID')
@@ -182,7 +1542,8 @@ class Exchange2010CalendarEvent(BaseExchangeCalendarEvent):
 
     self._update_properties(properties)
     self._id = id
-    log.debug(u'Created new event object with ID: %s' % self._id)
+    self._change_key = self._parse_id_and_change_key_from_response(response_xml)[1]
+    log.debug(u'Created new event object with ID: %s', self._id)
 
     self._reset_dirty_attributes()
 
@@ -195,13 +1556,45 @@ class Exchange2010CalendarEvent(BaseExchangeCalendarEvent):
     self._update_properties(properties)
     self._id, self._change_key = self._parse_id_and_change_key_from_response(xml)
 
-    log.debug(u'Created new event object with ID: %s' % self._id)
+    log.debug(u'Created new event object with ID: %s', self._id)
     self._reset_dirty_attributes()
 
     return self
 
   def as_json(self):
-    raise NotImplementedError
+    """
+    Every property of the event, its id and change key included, as a JSON string. The same event always gives the
+    same string. :meth:`from_json` turns it back into an event.
+    """
+    return serialization.dumps(serialization.event_to_dict(self))
+
+  @classmethod
+  def from_json(cls, service, data):
+    """
+    Makes an event out of the output of :meth:`as_json` - or the dict it decodes to - without asking Exchange for
+    anything. It can be updated or cancelled like any other event.
+    """
+    if not isinstance(data, dict):
+      data = serialization.loads(data)
+
+    event = cls(service=service, calendar_id=data.get(u'calendar_id') or u'calendar', **serialization.event_properties(data))
+    event._id, event._change_key = data.get(u'id'), data.get(u'change_key')
+    event._reset_dirty_attributes()
+
+    return event
+
+  def __getstate__(self):
+    """
+    Pickles everything but the service, so unpickling doesn't have to go back to Exchange or re-parse any XML. Set
+    ``event.service`` on the unpickled event before calling anything that talks to Exchange.
+    """
+    state = self.__dict__.copy()
+    state.pop(u'service', None)
+    state[u'_dirty_attributes'] = set(self._dirty_attributes)
+    return state
+
+  def __setstate__(self, state):
+    self.__dict__.update(state)
 
   def validate(self):
 
@@ -274,6 +1667,16 @@ class Exchange2010CalendarEvent(BaseExchangeCalendarEvent):
     Anybody who has not declined this meeting will get a new invite.
     """
 
+    self._check_resend_invitations()
+
+    self.refresh_change_key()
+    body = soap_request.update_item(self, [], calendar_item_update_operation_type=u'SendOnlyToAll')
+    self.service.send(body)
+    self._forget_cached()
+
+    return self
+
+  def _check_resend_invitations(self):
     if not self.id:
       raise TypeError(u"You can't send invites for an event that hasn't been created yet.")
 
@@ -282,13 +1685,7 @@ class Exchange2010CalendarEvent(BaseExchangeCalendarEvent):
     if self._dirty_attributes:
       raise ValueError(u"There are unsaved changes to this invite - please update it first: %r" % self._dirty_attributes)
 
-    self.refresh_change_key()
-    body = soap_request.update_item(self, [], calendar_item_update_operation_type=u'SendOnlyToAll')
-    self.service.send(body)
-
-    return self
-
-  def update(self, calendar_item_update_operation_type=u'SendToAllAndSaveCopy', **kwargs):
+  def update(self, calendar_item_update_operation_type=u'SendToAllAndSaveCopy', optimistic=False, conflict_resolution=None, **kwargs):
     """
     Updates an event in Exchange.  ::
 
@@ -300,7 +1697,69 @@ class Exchange2010CalendarEvent(BaseExchangeCalendarEvent):
 
     Notification of the change event is sent to all users. If you wish to just notify people who were
     added, specify ``send_only_to_changed_attendees=True``.
+
+    By default the change key is refreshed first and the update overwrites whatever is in Exchange. With
+    ``optimistic=True`` the update is sent straight away with the change key we already have, and
+    ``conflict_resolution`` (``AutoResolve`` unless you say otherwise, or ``NeverOverwrite``) decides what happens if
+    someone else changed the event in the meantime. The change key is only refreshed, and the update sent again,
+    if Exchange says ours is stale - so most updates take one request instead of two. With ``NeverOverwrite`` it
+    isn't: sending again with a fresh change key would overwrite the other change, so the stale change key or
+    conflict is raised for you to deal with.
     """
+    calendar_item_update_operation_type = self._check_update_operation_type(calendar_item_update_operation_type, **kwargs)
+    conflict_resolution = self._check_conflict_resolution(optimistic, conflict_resolution)
+    self.validate()
+
+    if self._dirty_attributes:
+      log.debug(u"Updating these attributes: %r", self._dirty_attributes)
+
+      if not (optimistic and self._change_key):
+        self.refresh_change_key()
+
+      try:
+        response_xml = self._send_update(calendar_item_update_operation_type, conflict_resolution)
+      except (ExchangeStaleChangeKeyException, ExchangeIrresolvableConflictException):
+        if not self._resend_when_stale(optimistic, conflict_resolution):
+          raise
+        log.debug(u"Change key %s was stale, refreshing it and trying again", self._change_key)
+        self.refresh_change_key()
+        response_xml = self._send_update(calendar_item_update_operation_type, conflict_resolution)
+
+      self._update_change_key_from_response(response_xml)
+      self._forget_cached()
+      self._reset_dirty_attributes()
+    else:
+      log.info(u"Update was called, but there's nothing to update. Doing nothing.")
+
+    return self
+
+  def _send_update(self, calendar_item_update_operation_type, conflict_resolution):
+    body = soap_request.update_item(
+      self, self._dirty_attributes,
+      calendar_item_update_operation_type=calendar_item_update_operation_type,
+      conflict_resolution=conflict_resolution,
+    )
+    return self.service.send(body)
+
+  def _check_conflict_resolution(self, optimistic, conflict_resolution):
+    if conflict_resolution is None:
+      return u'AutoResolve' if optimistic else u'AlwaysOverwrite'
+
+    if conflict_resolution not in (u'NeverOverwrite', u'AutoResolve', u'AlwaysOverwrite'):
+      raise ValueError('conflict_resolution has unknown value')
+
+    return conflict_resolution
+
+  def _resend_when_stale(self, optimistic, conflict_resolution):
+    return optimistic and conflict_resolution != u'NeverOverwrite'
+
+  def _update_change_key_from_response(self, response_xml):
+    """ UpdateItem answers with the item's new change key - keep it, so the next update needn't ask for it. """
+    id_element = response_xml.find(u'.//%s/*/%s' % (M_ITEMS, T_ITEM_ID))
+    if id_element is not None and id_element.get(u'Id'):
+      self._id, self._change_key = id_element.get(u'Id'), id_element.get(u'ChangeKey')
+
+  def _check_update_operation_type(self, calendar_item_update_operation_type, **kwargs):
     if not self.id:
       raise TypeError(u"You can't update an event that hasn't been created yet.")
 
@@ -319,19 +1778,7 @@ class Exchange2010CalendarEvent(BaseExchangeCalendarEvent):
     if calendar_item_update_operation_type not in VALID_UPDATE_OPERATION_TYPES:
       raise ValueError('calendar_item_update_operation_type has unknown value')
 
-    self.validate()
-
-    if self._dirty_attributes:
-      log.debug(u"Updating these attributes: %r" % self._dirty_attributes)
-      self.refresh_change_key()
-
-      body = soap_request.update_item(self, self._dirty_attributes, calendar_item_update_operation_type=calendar_item_update_operation_type)
-      self.service.send(body)
-      self._reset_dirty_attributes()
-    else:
-      log.info(u"Update was called, but there's nothing to update. Doing nothing.")
-
-    return self
+    return calendar_item_update_operation_type
 
   def cancel(self):
     """
@@ -347,6 +1794,7 @@ class Exchange2010CalendarEvent(BaseExchangeCalendarEvent):
 
     self.refresh_change_key()
     self.service.send(soap_request.delete_event(self))
+    self._forget_cached()
     # TODO rsanders high - check return status to make sure it was actually sent
     return None
 
@@ -358,6 +1806,12 @@ class Exchange2010CalendarEvent(BaseExchangeCalendarEvent):
       event = service.calendar().get_event(id='KEY HERE')
       event.move_to(folder_id='NEW CALENDAR KEY HERE')
     """
+    self._check_move_to(folder_id)
+
+    self.refresh_change_key()
+    return self._moved(self.service.send(soap_request.move_event(self, folder_id)), folder_id)
+
+  def _check_move_to(self, folder_id):
     if not folder_id:
       raise TypeError(u"You can't move an event to a non-existant folder")
 
@@ -367,12 +1821,13 @@ class Exchange2010CalendarEvent(BaseExchangeCalendarEvent):
     if not self.id:
       raise TypeError(u"You can't move an event that hasn't been created yet.")
 
-    self.refresh_change_key()
-    response_xml = self.service.send(soap_request.move_event(self, folder_id))
+  def _moved(self, response_xml, folder_id):
     new_id, new_change_key = self._parse_id_and_change_key_from_response(response_xml)
     if not new_id:
       raise ValueError(u"MoveItem returned success but requested item not moved")
 
+    # Moving an item gives it a new id, so whatever was cached under the old one is gone for good
+    self._forget_cached()
     self._id = new_id
     self._change_key = new_change_key
     self.calendar_id = folder_id
@@ -396,13 +1851,14 @@ class Exchange2010CalendarEvent(BaseExchangeCalendarEvent):
 
     """
 
+    response_xml = self.service.send(self._get_master_request())
+    return self.__class__(service=self.service, xml=response_xml)
+
+  def _get_master_request(self):
     if self.type != 'Occurrence':
       raise InvalidEventType("get_master method can only be called on a 'Occurrence' event type")
 
-    body = soap_request.get_master(exchange_id=self._id, format=u"AllProperties")
-    response_xml = self.service.send(body)
-
-    return Exchange2010CalendarEvent(service=self.service, xml=response_xml)
+    return soap_request.get_master(exchange_id=self._id, format=u"AllProperties")
 
   def get_occurrence(self, instance_index):
     """
@@ -425,19 +1881,23 @@ class Exchange2010CalendarEvent(BaseExchangeCalendarEvent):
 
     """
 
+    return self._events_from_items(self.service.send(self._get_occurrence_request(instance_index)))
+
+  def _get_occurrence_request(self, instance_index):
     if not all([isinstance(i, int) for i in instance_index]):
       raise TypeError("instance_index must be an interable of type int")
 
     if self.type != 'RecurringMaster':
       raise InvalidEventType("get_occurrance method can only be called on a 'RecurringMaster' event type")
 
-    body = soap_request.get_occurrence(exchange_id=self._id, instance_index=instance_index, format=u"AllProperties")
-    response_xml = self.service.send(body)
+    return soap_request.get_occurrence(exchange_id=self._id, instance_index=instance_index, format=u"AllProperties")
 
+  def _events_from_items(self, response_xml):
+    """ An event for each <m:Items> in a GetItem response that has one in it. """
     items = response_xml.xpath(u'//m:GetItemResponseMessage/m:Items', namespaces=soap_request.NAMESPACES)
     events = []
     for item in items:
-      event = Exchange2010CalendarEvent(service=self.service, xml=deepcopy(item))
+      event = self.__class__(service=self.service, xml=item)
       if event.id:
         events.append(event)
 
@@ -461,16 +1921,32 @@ class Exchange2010CalendarEvent(BaseExchangeCalendarEvent):
       return []
 
     body = soap_request.get_item(exchange_id=self.conflicting_event_ids, format="AllProperties")
-    response_xml = self.service.send(body)
+    return self._events_from_items(self.service.send(body))
 
-    items = response_xml.xpath(u'//m:GetItemResponseMessage/m:Items', namespaces=soap_request.NAMESPACES)
-    events = []
-    for item in items:
-      event = Exchange2010CalendarEvent(service=self.service, xml=deepcopy(item))
-      if event.id:
-        events.append(event)
+  def expand(self, start=None, end=None, tz=utc):
+    """
+      expand(start=None, end=None, tz=utc)
+      :param datetime start:  Only occurrences that end after this.
+      :param datetime end:  Only occurrences that start before this.
+      :param tzinfo tz:  The time zone the series was created in - occurrences keep the same wall clock time in it.
+      :raises InvalidEventType: When this event doesn't recur.
 
-    return events
+      Yields an ExchangeOccurrence (index, start, end, original_start, id) for each occurrence of this recurring
+      master between start and end, worked out locally rather than by asking Exchange - see
+      :func:`pyexchange.recurrence.expand`. Deleted occurrences are left out and modified ones are at their new time
+      with their id set, so get_event(occurrence.id) loads one of those in full.
+
+      **Examples**::
+
+        master = service.calendar().get_event(id='<master_id>')
+        for occurrence in master.expand(start=datetime(2050, 1, 1), end=datetime(2051, 1, 1)):
+          print occurrence.start, occurrence.end
+
+    """
+    if not self.recurrence:
+      raise InvalidEventType(u"expand can only be called on a recurring event")
+
+    return recurrence.expand(self, start=start, end=end, tz=tz)
 
   def refresh_change_key(self):
 
@@ -480,230 +1956,176 @@ class Exchange2010CalendarEvent(BaseExchangeCalendarEvent):
 
     return self
 
+  def _forget_cached(self):
+    """ Drops this event from the service's event cache, if there is one. Called after anything that changes it. """
+    cache = getattr(self.service, 'event_cache', None)
+    if cache is not None and self._id:
+      cache.discard(self._id)
+
+  def _find_calendar_item(self, xml):
+    """
+    Finds the <t:CalendarItem> to parse. xml can be a whole response, an <m:Items> node or the <t:CalendarItem> node
+    itself - the latter two are searched relative to the node, so they can be parsed in place in a larger response.
+    """
+    if xml.tag == T_CALENDAR_ITEM:
+      return xml
+    elif xml.tag == M_ITEMS:
+      return xml.find(T_CALENDAR_ITEM)
+
+    calendar_items = CALENDAR_ITEM_XPATH(xml)
+    return calendar_items[0] if calendar_items else None
+
   def _parse_id_and_change_key_from_response(self, response):
 
-    id_elements = response.xpath(u'//m:Items/t:CalendarItem/t:ItemId', namespaces=soap_request.NAMESPACES)
+    calendar_item = self._find_calendar_item(response)
+    id_element = calendar_item.find(T_ITEM_ID) if calendar_item is not None else None
 
-    if id_elements:
-      id_element = id_elements[0]
+    if id_element is not None:
       return id_element.get(u"Id", None), id_element.get(u"ChangeKey", None)
     else:
       return None, None
 
   def _parse_response_for_get_event(self, response):
 
-    result = self._parse_event_properties(response)
-
-    organizer_properties = self._parse_event_organizer(response)
-    if organizer_properties is not None:
-      if 'email' not in organizer_properties:
-        organizer_properties['email'] = None
-      result[u'organizer'] = ExchangeEventOrganizer(**organizer_properties)
-
-    attendee_properties = self._parse_event_attendees(response)
-    result[u'_attendees'] = self._build_resource_dictionary([ExchangeEventResponse(**attendee) for attendee in attendee_properties])
-
-    resource_properties = self._parse_event_resources(response)
-    result[u'_resources'] = self._build_resource_dictionary([ExchangeEventResponse(**resource) for resource in resource_properties])
-
-    result['_conflicting_event_ids'] = self._parse_event_conflicts(response)
-
-    return result
-
-  def _parse_event_properties(self, response):
-
-    property_map = {
-      u'subject': {
-        u'xpath': u'//m:Items/t:CalendarItem/t:Subject',
-      },
-      u'location':
-      {
-        u'xpath': u'//m:Items/t:CalendarItem/t:Location',
-      },
-      u'availability':
-      {
-        u'xpath': u'//m:Items/t:CalendarItem/t:LegacyFreeBusyStatus',
-      },
-      u'start':
-      {
-        u'xpath': u'//m:Items/t:CalendarItem/t:Start',
-        u'cast': u'datetime',
-      },
-      u'end':
-      {
-        u'xpath': u'//m:Items/t:CalendarItem/t:End',
-        u'cast': u'datetime',
-      },
-      u'html_body':
-      {
-        u'xpath': u'//m:Items/t:CalendarItem/t:Body[@BodyType="HTML"]',
-      },
-      u'text_body':
-      {
-        u'xpath': u'//m:Items/t:CalendarItem/t:Body[@BodyType="Text"]',
-      },
-      u'_type':
-      {
-        u'xpath': u'//m:Items/t:CalendarItem/t:CalendarItemType',
-      },
-      u'reminder_minutes_before_start':
-      {
-        u'xpath': u'//m:Items/t:CalendarItem/t:ReminderMinutesBeforeStart',
-        u'cast': u'int',
-      },
-      u'is_all_day':
-      {
-        u'xpath': u'//m:Items/t:CalendarItem/t:IsAllDayEvent',
-        u'cast': u'bool',
-      },
-      u'recurrence_end_date':
-      {
-        u'xpath': u'//m:Items/t:CalendarItem/t:Recurrence/t:EndDateRecurrence/t:EndDate',
-        u'cast': u'date_only_naive',
-      },
-      u'recurrence_interval':
-      {
-        u'xpath': u'//m:Items/t:CalendarItem/t:Recurrence/*/t:Interval',
-        u'cast': u'int',
-      },
-      u'recurrence_days':
-      {
-        u'xpath': u'//m:Items/t:CalendarItem/t:Recurrence/t:WeeklyRecurrence/t:DaysOfWeek',
-      },
-    }
-
-    result = self.service._xpath_to_dict(element=response, property_map=property_map, namespace_map=soap_request.NAMESPACES)
-
-    try:
-      recurrence_node = response.xpath(u'//m:Items/t:CalendarItem/t:Recurrence', namespaces=soap_request.NAMESPACES)[0]
-    except IndexError:
-      recurrence_node = None
-
-    if recurrence_node is not None:
-
-      if recurrence_node.find('t:DailyRecurrence', namespaces=soap_request.NAMESPACES) is not None:
-        result['recurrence'] = 'daily'
-
-      elif recurrence_node.find('t:WeeklyRecurrence', namespaces=soap_request.NAMESPACES) is not None:
-        result['recurrence'] = 'weekly'
-
-      elif recurrence_node.find('t:AbsoluteMonthlyRecurrence', namespaces=soap_request.NAMESPACES) is not None:
-        result['recurrence'] = 'monthly'
-
-      elif recurrence_node.find('t:AbsoluteYearlyRecurrence', namespaces=soap_request.NAMESPACES) is not None:
-        result['recurrence'] = 'yearly'
+    calendar_item = self._find_calendar_item(response)
 
-    return result
-
-  def _parse_event_organizer(self, response):
-
-    organizer = response.xpath(u'//m:Items/t:CalendarItem/t:Organizer/t:Mailbox', namespaces=soap_request.NAMESPACES)
-
-    property_map = {
-      u'name':
-      {
-        u'xpath': u't:Name'
-      },
-      u'email':
-      {
-        u'xpath': u't:EmailAddress'
-      },
-    }
-
-    if organizer:
-      return self.service._xpath_to_dict(element=organizer[0], property_map=property_map, namespace_map=soap_request.NAMESPACES)
+    if calendar_item is not None:
+      return self._parse_calendar_item(calendar_item)
     else:
-      return None
+      return {u'_attendees': {}, u'_resources': {}, u'_conflicting_event_ids': []}
 
-  def _parse_event_resources(self, response):
-    property_map = {
-      u'name':
-      {
-        u'xpath': u't:Mailbox/t:Name'
-      },
-      u'email':
-      {
-        u'xpath': u't:Mailbox/t:EmailAddress'
-      },
-      u'response':
-      {
-        u'xpath': u't:ResponseType'
-      },
-      u'last_response':
-      {
-        u'xpath': u't:LastResponseTime',
-        u'cast': u'datetime'
-      },
-    }
-
-    result = []
-
-    resources = response.xpath(u'//m:Items/t:CalendarItem/t:Resources/t:Attendee', namespaces=soap_request.NAMESPACES)
-
-    for attendee in resources:
-      attendee_properties = self.service._xpath_to_dict(element=attendee, property_map=property_map, namespace_map=soap_request.NAMESPACES)
-      attendee_properties[u'required'] = True
-
-      if u'last_response' not in attendee_properties:
-        attendee_properties[u'last_response'] = None
-
-      if u'email' in attendee_properties:
-        result.append(attendee_properties)
-
-    return result
 
-  def _parse_event_attendees(self, response):
-
-    property_map = {
-      u'name':
-      {
-        u'xpath': u't:Mailbox/t:Name'
-      },
-      u'email':
-      {
-        u'xpath': u't:Mailbox/t:EmailAddress'
-      },
-      u'response':
-      {
-        u'xpath': u't:ResponseType'
-      },
-      u'last_response':
-      {
-        u'xpath': u't:LastResponseTime',
-        u'cast': u'datetime'
-      },
-    }
+class Exchange2010CalendarEventRecord(object):
+  """
+  A read-only copy of an event, as returned by ``list_events`` and ``iter_events`` with read_only=True.
 
-    result = []
+  It has the same properties as :class:`Exchange2010CalendarEvent`, but keeps them in __slots__, doesn't track
+  changes and doesn't hold on to the service, so it is much smaller and quicker to build - worth it when listing
+  thousands of events just to read them. attendees, resources, conflicting_event_ids and the modified and deleted
+  occurrences are tuples.
 
-    required_attendees = response.xpath(u'//m:Items/t:CalendarItem/t:RequiredAttendees/t:Attendee', namespaces=soap_request.NAMESPACES)
-    for attendee in required_attendees:
-      attendee_properties = self.service._xpath_to_dict(element=attendee, property_map=property_map, namespace_map=soap_request.NAMESPACES)
-      attendee_properties[u'required'] = True
+  Call :meth:`to_event` for an event you can change::
 
-      if u'last_response' not in attendee_properties:
-        attendee_properties[u'last_response'] = None
+    for record in service.calendar().list_events(start=start, end=end, read_only=True).events:
+      if record.location == u'Room 1':
+        event = record.to_event(service)
+        event.location = u'Room 2'
+        event.update()
 
-      if u'email' in attendee_properties:
-        result.append(attendee_properties)
+  """
 
-    optional_attendees = response.xpath(u'//m:Items/t:CalendarItem/t:OptionalAttendees/t:Attendee', namespaces=soap_request.NAMESPACES)
+  __slots__ = (
+    'id', 'change_key', 'subject', 'start', 'end', 'location', 'availability', 'html_body', 'text_body',
+    'organizer', 'reminder_minutes_before_start', 'is_all_day', 'type', 'recurrence', 'recurrence_interval',
+    'recurrence_end_date', 'recurrence_days', 'attendees', 'resources', 'conflicting_event_ids',
+    'modified_occurrences', 'deleted_occurrences',
+  )
+
+  # Everything but the id and change key
+  PROPERTIES = __slots__[2:]
+
+  # Where each slot comes from in the properties parsed out of a <t:CalendarItem>, when it isn't the same name
+  PROPERTY_NAMES = {
+    'type': u'_type',
+    'attendees': u'_attendees',
+    'resources': u'_resources',
+    'conflicting_event_ids': u'_conflicting_event_ids',
+    'modified_occurrences': u'_modified_occurrences',
+    'deleted_occurrences': u'_deleted_occurrences',
+  }
+
+  def __init__(self, id=None, change_key=None, subject=u'', attendees=(), resources=(), conflicting_event_ids=(),
+               modified_occurrences=(), deleted_occurrences=(), **properties):
+    unknown = set(properties).difference(self.PROPERTIES)
+    if unknown:
+      raise TypeError(u"Unknown event properties: %s" % u', '.join(sorted(unknown)))
+
+    set_slot = object.__setattr__
+    for name in self.PROPERTIES:
+      set_slot(self, name, properties.get(name))
+
+    set_slot(self, 'id', id)
+    set_slot(self, 'change_key', change_key)
+    set_slot(self, 'subject', subject)
+    set_slot(self, 'attendees', tuple(attendees))
+    set_slot(self, 'resources', tuple(resources))
+    set_slot(self, 'conflicting_event_ids', tuple(conflicting_event_ids))
+    set_slot(self, 'modified_occurrences', tuple(modified_occurrences))
+    set_slot(self, 'deleted_occurrences', tuple(deleted_occurrences))
+
+  @classmethod
+  def from_xml(cls, parser, calendar_item):
+    """ Builds a record out of a <t:CalendarItem> node, using an :class:`Exchange2010CalendarItemParser`. """
+    properties = parser._parse_calendar_item(calendar_item)
+
+    values = {}
+    for name in cls.PROPERTIES:
+      key = cls.PROPERTY_NAMES.get(name, name)
+      if key in properties:
+        values[name] = properties[key]
+
+    values[u'attendees'] = values[u'attendees'].values()
+    values[u'resources'] = values[u'resources'].values()
+
+    id_element = calendar_item.find(T_ITEM_ID)
+    if id_element is not None:
+      values[u'id'] = id_element.get(u'Id')
+      values[u'change_key'] = id_element.get(u'ChangeKey')
+
+    return cls(**values)
+
+  def __setattr__(self, name, value):
+    raise AttributeError(u"Event records are read-only - use to_event() to get an event you can change.")
+
+  def __delattr__(self, name):
+    raise AttributeError(u"Event records are read-only - use to_event() to get an event you can change.")
+
+  def __getstate__(self):
+    return dict((name, getattr(self, name)) for name in self.__slots__)
+
+  def __setstate__(self, state):
+    for name in self.__slots__:
+      object.__setattr__(self, name, state.get(name))
+
+  @property
+  def body(self):
+    return self.html_body or self.text_body or None
+
+  @property
+  def required_attendees(self):
+    return [attendee for attendee in self.attendees if attendee.required]
+
+  @property
+  def optional_attendees(self):
+    return [attendee for attendee in self.attendees if not attendee.required]
+
+  @property
+  def conference_room(self):
+    if len(self.resources) == 1:
+      return self.resources[0]
 
-    for attendee in optional_attendees:
-      attendee_properties = self.service._xpath_to_dict(element=attendee, property_map=property_map, namespace_map=soap_request.NAMESPACES)
-      attendee_properties[u'required'] = False
+  def as_json(self):
+    """ The same JSON as :meth:`Exchange2010CalendarEvent.as_json`. """
+    return serialization.dumps(serialization.event_to_dict(self))
 
-      if u'last_response' not in attendee_properties:
-        attendee_properties[u'last_response'] = None
+  def to_event(self, service):
+    """
+    Makes a full event with the same properties, without going back to Exchange. It has this record's change key,
+    which :meth:`Exchange2010CalendarEvent.update` refreshes unless you ask for an optimistic update.
+    """
+    properties = {}
+    for name in self.PROPERTIES:
+      properties[self.PROPERTY_NAMES.get(name, name)] = getattr(self, name)
 
-      if u'email' in attendee_properties:
-        result.append(attendee_properties)
+    properties[u'_attendees'] = dict((attendee.email, attendee) for attendee in self.attendees)
+    properties[u'_resources'] = dict((resource.email, resource) for resource in self.resources)
+    properties[u'_conflicting_event_ids'] = list(self.conflicting_event_ids)
 
-    return result
+    event = service.calendar().event(**properties)
+    event._id, event._change_key = self.id, self.change_key
+    event._reset_dirty_attributes()
 
-  def _parse_event_conflicts(self, response):
-    conflicting_ids = response.xpath(u'//m:Items/t:CalendarItem/t:ConflictingMeetings/t:CalendarItem/t:ItemId', namespaces=soap_request.NAMESPACES)
-    return [id_element.get(u"Id") for id_element in conflicting_ids]
+    return event
 
 
 class Exchange2010FolderService(BaseExchangeFolderService):
@@ -711,9 +2133,10 @@ class Exchange2010FolderService(BaseExchangeFolderService):
   def folder(self, id=None, **kwargs):
     return Exchange2010Folder(service=self.service, id=id, **kwargs)
 
-  def get_folder(self, id):
+  def get_folder(self, id, fields=None):
     """
       :param str id:  The Exchange ID of the folder to retrieve from the Exchange store.
+      :param list fields:  Property names to load - 'display_name' and/or 'parent_id'. Defaults to everything.
 
       Retrieves the folder specified by the id, from the Exchange store.
 
@@ -723,6 +2146,10 @@ class Exchange2010FolderService(BaseExchangeFolderService):
 
     """
 
+    if fields is not None:
+      body = soap_request.get_folder(folder_id=id, format=u'AllProperties', fields=fields)
+      return Exchange2010Folder(service=self.service, xml=self.service.send(body))
+
     return Exchange2010Folder(service=self.service, id=id)
 
   def new_folder(self, **properties):
@@ -748,12 +2175,18 @@ class Exchange2010FolderService(BaseExchangeFolderService):
 
     return Exchange2010Folder(service=self.service, **properties)
 
-  def find_folder(self, parent_id):
+  # How far below the parent find_folder looks: just its children, or everything under it
+  FIND_FOLDER_TRAVERSALS = (u'Shallow', u'Deep')
+
+  def find_folder(self, parent_id, traversal=u'Shallow', fields=None):
     """
-      find_folder(parent_id)
+      find_folder(parent_id, traversal='Shallow', fields=None)
       :param str parent_id:  The parent folder to list.
+      :param str traversal:  'Shallow' for the folders right under the parent, 'Deep' for the whole tree below it.
+      :param list fields:  Property names to load - 'display_name' and/or 'parent_id'. Defaults to everything.
 
-      This method will return a list of sub-folders to a given parent folder.
+      This method will return a list of sub-folders to a given parent folder. With a deep traversal, every folder
+      in the tree comes back in one request - use each folder's parent_id to put the tree back together.
 
       **Examples**::
 
@@ -766,27 +2199,95 @@ class Exchange2010FolderService(BaseExchangeFolderService):
         folders = service.folder().find_folder(parent_id='calendar')
         for folder in folders:
           folder.delete()
+
+        # Every folder in the mailbox
+        folders = service.folder().find_folder(parent_id='msgfolderroot', traversal='Deep')
+    """
+
+    if traversal not in self.FIND_FOLDER_TRAVERSALS:
+      raise ValueError(u"traversal must be one of %s" % u', '.join(self.FIND_FOLDER_TRAVERSALS))
+
+    body = soap_request.find_folder(parent_id=parent_id, format=u'AllProperties', traversal=traversal, fields=fields)
+    return self._parse_response_for_find_folder(self.service.send_streaming(body, tags=FOLDER_TAGS))
+
+  def sync_hierarchy(self, state=None, folder_id=None):
+    """
+      sync_hierarchy(state=None, folder_id=None)
+      :param str state:  The state from the last call, or None to start from scratch.
+      :param str folder_id:  Only sync folders under this one. Defaults to the whole mailbox.
+
+      Asks Exchange which folders were created, changed or deleted since state was handed out, and returns an
+      :class:`Exchange2010FolderChanges`. Created and updated folders come back as folder objects, deleted ones as
+      ids. Without a state, every folder comes back as created.
+
+      Keep calling with the new state until includes_last_folder is True, and store the state for next time.
+
+      **Examples**::
+
+        changes = service.folder().sync_hierarchy(state=saved_state)
+        for folder in changes.created + changes.updated:
+          print(folder.display_name)
+        saved_state = changes.state
+
     """
 
-    body = soap_request.find_folder(parent_id=parent_id, format=u'AllProperties')
+    body = soap_request.sync_folder_hierarchy(folder_id=folder_id, sync_state=state, format=u'AllProperties')
     response_xml = self.service.send(body)
-    return self._parse_response_for_find_folder(response_xml)
 
-  def _parse_response_for_find_folder(self, response):
+    return self._parse_response_for_sync_hierarchy(response_xml)
+
+  def _parse_response_for_sync_hierarchy(self, response):
+
+    changes = Exchange2010FolderChanges()
+
+    state = next(response.iter(M_SYNC_STATE), None)
+    if state is not None:
+      changes.state = state.text
+
+    includes_last_folder = next(response.iter(M_INCLUDES_LAST_FOLDER_IN_RANGE), None)
+    if includes_last_folder is not None:
+      changes.includes_last_folder = (includes_last_folder.text or u'').strip().lower() == u'true'
+
+    for changes_node in response.iter(M_CHANGES):
+      for change in changes_node.iterchildren(tag=etree.Element):
+        kind = SYNC_CHANGE_TYPES.get(change.tag)
+
+        if kind == u'deleted':
+          id_element = change.find(T_FOLDER_ID)
+          if id_element is not None:
+            changes.deleted.append(id_element.get(u'Id'))
+
+        elif kind is not None:
+          for folder in change.iterchildren(*FOLDER_TAGS):
+            getattr(changes, kind).append(Exchange2010Folder(service=self.service, xml=folder))
+
+    return changes
+
+  def _parse_response_for_find_folder(self, folders):
 
     result = []
-    folders = response.xpath(u'//t:Folders/t:*', namespaces=soap_request.NAMESPACES)
     for folder in folders:
-      result.append(
-        Exchange2010Folder(
-          service=self.service,
-          xml=etree.fromstring(etree.tostring(folder))  # Might be a better way to do this
-        )
-      )
+      if folder.getparent().tag == T_FOLDERS:
+        result.append(Exchange2010Folder(service=self.service, xml=folder))
 
     return result
 
 
+class Exchange2010FolderChanges(object):
+  """
+  What changed in the folder hierarchy since the last sync - see :meth:`Exchange2010FolderService.sync_hierarchy`.
+  created and updated are lists of Exchange2010Folder, deleted is a list of folder ids, state is what to pass to the
+  next sync.
+  """
+
+  def __init__(self, state=None, includes_last_folder=True, created=None, updated=None, deleted=None):
+    self.state = state
+    self.includes_last_folder = includes_last_folder
+    self.created = created or []
+    self.updated = updated or []
+    self.deleted = deleted or []
+
+
 class Exchange2010Folder(BaseExchangeFolder):
 
   def _init_from_service(self, id):
@@ -835,18 +2336,19 @@ class Exchange2010Folder(BaseExchangeFolder):
       folder.delete()
     """
 
-    if not self.id:
-      raise TypeError(u"You can't delete a folder that hasn't been created yet.")
-
-    body = soap_request.delete_folder(self)
-
-    response_xml = self.service.send(body)  # noqa
+    response_xml = self.service.send(self._delete_request())  # noqa
     # TODO: verify deletion
     self._id = None
     self._change_key = None
 
     return None
 
+  def _delete_request(self):
+    if not self.id:
+      raise TypeError(u"You can't delete a folder that hasn't been created yet.")
+
+    return soap_request.delete_folder(self)
+
   def move_to(self, folder_id):
     """
     :param str folder_id: The Folder ID of what will be the new parent folder, of this folder.
@@ -856,6 +2358,10 @@ class Exchange2010Folder(BaseExchangeFolder):
       folder.move_to(folder_id="ID of new location's folder")
     """
 
+    response_xml = self.service.send(self._move_request(folder_id))
+    return self._moved(response_xml, folder_id)
+
+  def _move_request(self, folder_id):
     if not folder_id:
       raise TypeError(u"You can't move to a non-existant folder")
 
@@ -865,8 +2371,9 @@ class Exchange2010Folder(BaseExchangeFolder):
     if not self.id:
       raise TypeError(u"You can't move a folder that hasn't been created yet.")
 
-    response_xml = self.service.send(soap_request.move_folder(self, folder_id))  # noqa
+    return soap_request.move_folder(self, folder_id)
 
+  def _moved(self, response_xml, folder_id):
     result_id, result_key = self._parse_id_and_change_key_from_response(response_xml)
     if self.id != result_id:
       raise ValueError(u"MoveFolder returned success but requested folder not moved")
@@ -875,9 +2382,13 @@ class Exchange2010Folder(BaseExchangeFolder):
     return self
 
   def _parse_response_for_get_folder(self, response):
-    FOLDER_PATH = u'//t:Folder | //t:CalendarFolder | //t:ContactsFolder | //t:SearchFolder | //t:TasksFolder'
 
-    path = response.xpath(FOLDER_PATH, namespaces=soap_request.NAMESPACES)[0]
+    # A folder node from a larger response (like FindFolder) is parsed in place, relative to itself.
+    if response.tag in FOLDER_TAGS:
+      path = response
+    else:
+      path = FOLDER_XPATH(response)[0]
+
     result = self._parse_folder_properties(path)
     return result
 
@@ -887,8 +2398,8 @@ class Exchange2010Folder(BaseExchangeFolder):
       u'display_name': {u'xpath': u't:DisplayName'},
     }
 
-    self._id, self._change_key = self._parse_id_and_change_key_from_response(response)
-    self._parent_id = self._parse_parent_id_and_change_key_from_response(response)[0]
+    self._id, self._change_key = self._parse_ids(response.find(T_FOLDER_ID))
+    self._parent_id = self._parse_ids(response.find(T_PARENT_FOLDER_ID))[0]
     self.folder_type = etree.QName(response).localname
 
     return self.service._xpath_to_dict(element=response, property_map=property_map, namespace_map=soap_request.NAMESPACES)
@@ -903,6 +2414,12 @@ class Exchange2010Folder(BaseExchangeFolder):
     else:
       return None, None
 
+  def _parse_ids(self, id_element):
+    if id_element is not None:
+      return id_element.get(u"Id", None), id_element.get(u"ChangeKey", None)
+    else:
+      return None, None
+
   def _parse_parent_id_and_change_key_from_response(self, response):
 
     id_elements = response.xpath(u'//t:ParentFolderId', namespaces=soap_request.NAMESPACES)
@@ -912,3 +2429,233 @@ class Exchange2010Folder(BaseExchangeFolder):
       return id_element.get(u"Id", None), id_element.get(u"ChangeKey", None)
     else:
       return None, None
+
+
+class Exchange2010Notification(object):
+  """
+  One change a subscription heard about. type is one of 'created', 'modified', 'deleted', 'moved', 'copied',
+  'new_mail' or 'free_busy_changed'. Changes to items have an item_id, changes to folders a folder_id, and moves and
+  copies also say where the item or folder used to be.
+  """
+
+  def __init__(self, type, watermark=None, timestamp=None, item_id=None, change_key=None, folder_id=None,
+               parent_folder_id=None, old_item_id=None, old_folder_id=None, old_parent_folder_id=None):
+    self.type = type
+    self.watermark = watermark
+    self.timestamp = timestamp
+    self.item_id = item_id
+    self.change_key = change_key
+    self.folder_id = folder_id
+    self.parent_folder_id = parent_folder_id
+    self.old_item_id = old_item_id
+    self.old_folder_id = old_folder_id
+    self.old_parent_folder_id = old_parent_folder_id
+
+
+class BaseExchange2010Subscription(object):
+  """ What pull and streaming subscriptions have in common. """
+
+  # Errors after which iter_events connects again instead of giving up
+  RECONNECT_ON = (ExchangeTransientConnectionException, ExchangeServerBusyException, ExchangeInternalServerTransientErrorException)
+
+  def __init__(self, service, folder_ids=(u'calendar',), event_types=CALENDAR_NOTIFICATIONS, id=None, watermark=None):
+    unknown = [event_type for event_type in event_types if event_type not in NOTIFICATION_TYPES]
+    if unknown:
+      raise ValueError(u"Unknown notification types: %s" % u', '.join(unknown))
+
+    self.service = service
+    self.folder_ids = list(folder_ids)
+    self.event_types = list(event_types)
+    self.id = id
+    self.watermark = watermark
+
+  def subscribe(self):
+    """ Asks Exchange for a new subscription, and returns self. """
+    response_xml = self.service.send(self._subscribe_request())
+
+    self.id = response_xml.findtext(u'.//' + M_SUBSCRIPTION_ID)
+    self.watermark = response_xml.findtext(u'.//' + M_WATERMARK) or self.watermark
+    log.debug(u'Subscribed to %s as %s', self.folder_ids, self.id)
+
+    return self
+
+  def unsubscribe(self):
+    """ Tells Exchange we're done with the subscription. """
+    if not self.id:
+      raise TypeError(u"You can't unsubscribe before you've subscribed.")
+
+    self.service.send(soap_request.unsubscribe(self.id))
+    self.id = None
+
+  def _subscribe_request(self):
+    raise NotImplementedError
+
+  def _listen(self, **kwargs):
+    raise NotImplementedError
+
+  def _iter_forever(self, reconnects, **kwargs):
+    """
+    Yields what _listen yields, over and over. An expired subscription is renewed, and after a dropped connection
+    or a busy server we back off and try again, up to reconnects times in a row.
+    """
+    failures = 0
+
+    while True:
+      try:
+        for notification in self._listen(**kwargs):
+          failures = 0
+          yield notification
+        failures = 0
+      except ExchangeSubscriptionExpiredException:
+        log.info(u'Subscription %s expired, subscribing again from watermark %s', self.id, self.watermark)
+        self.subscribe()
+      except self.RECONNECT_ON as err:
+        log.info(u'Lost subscription %s: %s', self.id, err)
+        if not self.service.retry_policy.wait(failures, reconnects, None, getattr(err, 'back_off', None)):
+          raise
+        failures += 1
+
+  def _parse_notification(self, notification):
+    """
+    Turns a <m:Notification> node into Exchange2010Notifications. Returns them with the last watermark in the node,
+    or None if it had none - it's up to the caller to move self.watermark once they've been handed on.
+    """
+    notifications = []
+    last_watermark = None
+
+    for event in notification.iterchildren(tag=etree.Element):
+      if event.tag not in NOTIFICATION_TAGS and event.tag != T_STATUS_EVENT:
+        continue
+
+      watermark = event.findtext(T_WATERMARK)
+      if watermark:
+        last_watermark = watermark
+
+      if event.tag == T_STATUS_EVENT:
+        continue
+
+      timestamp = event.findtext(T_TIME_STAMP)
+      item_id = event.find(T_ITEM_ID)
+
+      notifications.append(Exchange2010Notification(
+        type=NOTIFICATION_TAGS[event.tag],
+        watermark=watermark,
+        timestamp=self.service._parse_date(timestamp) if timestamp else None,
+        item_id=item_id.get(u'Id') if item_id is not None else None,
+        change_key=item_id.get(u'ChangeKey') if item_id is not None else None,
+        folder_id=self._id_of(event, u'FolderId'),
+        parent_folder_id=self._id_of(event, u'ParentFolderId'),
+        old_item_id=self._id_of(event, u'OldItemId'),
+        old_folder_id=self._id_of(event, u'OldFolderId'),
+        old_parent_folder_id=self._id_of(event, u'OldParentFolderId'),
+      ))
+
+    return notifications, last_watermark
+
+  def _id_of(self, event, name):
+    element = event.find(_type_tag(name))
+    return element.get(u'Id') if element is not None else None
+
+
+class Exchange2010PullSubscription(BaseExchange2010Subscription):
+  """
+  A subscription we poll for changes. Exchange keeps it alive for timeout minutes after each poll. Make one with
+  :meth:`Exchange2010Service.subscribe`.
+  """
+
+  def __init__(self, service, folder_ids=(u'calendar',), event_types=CALENDAR_NOTIFICATIONS, id=None, watermark=None, timeout=30):
+    super(Exchange2010PullSubscription, self).__init__(service, folder_ids=folder_ids, event_types=event_types, id=id, watermark=watermark)
+    self.timeout = timeout
+
+  def get_events(self):
+    """
+    Yields the Exchange2010Notifications for every change since the last call. Exchange sends them a page at a time,
+    and the watermark only moves past a page once everything on it has been yielded, so if asking for the next page
+    fails, the next call starts from there rather than skipping what was already handed out.
+    Raises ExchangeSubscriptionExpiredException if the subscription has expired - subscribe() again to resume from
+    the watermark.
+    """
+    if not self.id:
+      raise TypeError(u"You can't get events before you've subscribed.")
+
+    more_events = True
+
+    while more_events:
+      response_xml = self.service.send(soap_request.get_events(self.id, self.watermark))
+      more_events = False
+      page = []
+      watermark = self.watermark
+
+      for notification in response_xml.iter(M_NOTIFICATION):
+        notifications, last_watermark = self._parse_notification(notification)
+        page.extend(notifications)
+        watermark = last_watermark or watermark
+        more_events = more_events or (notification.findtext(T_MORE_EVENTS) or u'').strip().lower() == u'true'
+
+      for notification in page:
+        yield notification
+
+      self.watermark = watermark
+
+  def iter_events(self, poll_interval=60, reconnects=4):
+    """
+    Polls for changes every poll_interval seconds, forever, and yields each one. If the subscription expires it's
+    renewed from the last watermark, so nothing is missed. Connection errors are retried up to reconnects times in a
+    row before they're raised.
+    """
+    return self._iter_forever(reconnects, poll_interval=poll_interval)
+
+  def _subscribe_request(self):
+    event_types = [NOTIFICATION_TYPES[event_type] for event_type in self.event_types]
+    return soap_request.subscribe(self.folder_ids, event_types, watermark=self.watermark, timeout=self.timeout)
+
+  def _listen(self, poll_interval=60):
+    for notification in self.get_events():
+      yield notification
+
+    self.service.retry_policy.sleep(poll_interval)
+
+
+class Exchange2010StreamingSubscription(BaseExchange2010Subscription):
+  """
+  A subscription Exchange pushes changes down as they happen. Make one with
+  :meth:`Exchange2010Service.subscribe_streaming`.
+
+  Exchange can't resume a streaming subscription from a watermark. If one expires while nobody is connected -
+  after 30 minutes or so - the changes in between are lost, so catch up with calendar().sync() after a long outage.
+  """
+
+  def get_events(self, connection_timeout=30):
+    """
+    Opens one GetStreamingEvents connection and yields each Exchange2010Notification as it arrives, until Exchange
+    closes the connection after connection_timeout minutes (1 to 30).
+    """
+    if not self.id:
+      raise TypeError(u"You can't get events before you've subscribed.")
+
+    if not 1 <= connection_timeout <= 30:
+      raise ValueError(u"connection_timeout must be between 1 and 30 minutes")
+
+    body = soap_request.get_streaming_events([self.id], connection_timeout=connection_timeout)
+
+    # Give Exchange a minute more than it has to say goodbye in
+    for response_xml in self.service.iter_envelopes(body, timeout=(connection_timeout + 1) * 60):
+      for notification in response_xml.iter(M_NOTIFICATION):
+        events, watermark = self._parse_notification(notification)
+        for event in events:
+          yield event
+        self.watermark = watermark or self.watermark
+
+  def iter_events(self, connection_timeout=30, reconnects=4):
+    """
+    Yields each change as it happens, forever. Connects again whenever Exchange closes the connection, subscribes
+    again if the subscription expired, and retries connection errors up to reconnects times in a row.
+    """
+    return self._iter_forever(reconnects, connection_timeout=connection_timeout)
+
+  def _subscribe_request(self):
+    event_types = [NOTIFICATION_TYPES[event_type] for event_type in self.event_types]
+    return soap_request.subscribe_streaming(self.folder_ids, event_types)
+
+  def _listen(self, connection_timeout=30):
+    return self.get_events(connection_timeout=connection_timeout)
@@ -0,0 +1,449 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+
+asyncio flavour of the Exchange 2010 service. Requests are built with the same soap_request functions and responses
+are parsed by the same code as the blocking service - only sending them is awaited. Needs Python 3.5+, so this
+module isn't imported by pyexchange.exchange2010.
+"""
+import asyncio
+import logging
+import time
+
+from lxml import etree
+
+from . import soap_request
+from ..async_retry import call_with_retries
+from ..base.calendar import BaseExchangeCalendarService
+from ..base.folder import BaseExchangeFolderService
+from ..exceptions import ExchangeStaleChangeKeyException, ExchangeIrresolvableConflictException, ExchangeItemNotFoundException
+from . import (
+  Exchange2010Service, Exchange2010CalendarEventList, Exchange2010CalendarEvent, Exchange2010CalendarEventRecord,
+  Exchange2010CalendarItemParser, Exchange2010ConflictGraph, Exchange2010FanOutResults, Exchange2010Folder,
+  Exchange2010FolderService, ExchangeMailboxResult, CALENDAR_ITEM_XPATH, FOLDER_TAGS, T_FOLDERS, _cache_event, _change_key_from_response,
+  _revalidate_cached_event, _unique,
+)
+
+log = logging.getLogger("pyexchange")
+
+FOUND_CALENDAR_ITEM_XPATH = etree.XPath(u'//m:RootFolder/t:Items/t:CalendarItem', namespaces=soap_request.NAMESPACES)
+
+
+class AsyncExchange2010Service(object):
+  """
+  Exchange 2010 service whose requests are coroutines. Use it with an async connection::
+
+      from pyexchange.async_connection import AsyncExchangeNTLMAuthConnection
+      from pyexchange.exchange2010.async_service import AsyncExchange2010Service
+
+      async with AsyncExchangeNTLMAuthConnection(url=URL, username=USERNAME, password=PASSWORD) as connection:
+        service = AsyncExchange2010Service(connection)
+        events = await service.calendar().list_events(start=start, end=end)
+
+  It only has the operations that can be awaited: ``send``, ``send_batch``, ``availability`` and ``fan_out``;
+  ``calendar().get_event`` and ``list_events``, and an event list's ``load_all_details`` and ``conflict_graph``;
+  an event's ``create``, ``update``, ``cancel``, ``refresh_change_key``, ``resend_invitations``, ``move_to``,
+  ``get_master``, ``get_occurrence`` and ``conflicting_events``; and ``folder().get_folder`` and ``find_folder``,
+  and a folder's ``create``, ``delete`` and ``move_to``. Streaming responses, sync and subscriptions are only on
+  the blocking service.
+  """
+
+  FAN_OUT_WORKERS = Exchange2010Service.FAN_OUT_WORKERS
+
+  def __init__(self, connection, retry_policy=None, event_cache=None, mailbox=None, impersonate=True):
+    self.connection = connection
+    self.event_cache = event_cache
+    self.mailbox = mailbox
+    self.impersonate = impersonate
+
+    # Builds our envelopes and parses what comes back. It has no connection, so it never sends anything itself.
+    self._soap = Exchange2010Service(None, retry_policy=retry_policy, mailbox=mailbox, impersonate=impersonate)
+
+  @property
+  def retry_policy(self):
+    return self._soap.retry_policy
+
+  def for_mailbox(self, mailbox, impersonate=True):
+    """ Like Exchange2010Service.for_mailbox - a service for another mailbox, over this one's connection. """
+    return self.__class__(
+      self.connection, retry_policy=self.retry_policy, event_cache=self.event_cache, mailbox=mailbox, impersonate=impersonate,
+    )
+
+  def calendar(self, id="calendar", mailbox=None, impersonate=True):
+    service = self.for_mailbox(mailbox, impersonate=impersonate) if mailbox is not None else self
+    return AsyncExchange2010CalendarService(service=service, calendar_id=id)
+
+  def folder(self):
+    return AsyncExchange2010FolderService(service=self)
+
+  async def fan_out(self, mailboxes, fn, max_workers=None, impersonate=True):
+    """
+    Like Exchange2010Service.fan_out, but fn is a coroutine function, and up to max_workers of its calls are awaited
+    at once on this service's connection.
+    """
+    mailboxes = list(_unique(mailboxes))
+    if max_workers is None:
+      max_workers = self.FAN_OUT_WORKERS
+    if max_workers < 1:
+      raise ValueError(u"max_workers must be a positive integer")
+
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def run(mailbox):
+      async with semaphore:
+        started = time.time()
+        try:
+          result, error = await fn(self.for_mailbox(mailbox, impersonate=impersonate)), None
+        except Exception as err:
+          log.info(u'fan_out failed for %s: %s', mailbox, err)
+          result, error = None, err
+        return ExchangeMailboxResult(mailbox=mailbox, result=result, error=error, seconds=time.time() - started)
+
+    started = time.time()
+    results = await asyncio.gather(*[run(mailbox) for mailbox in mailboxes])
+
+    return Exchange2010FanOutResults(results, elapsed=time.time() - started)
+
+  async def availability(self, mailboxes, start, end, interval=30):
+    """ Like Exchange2010Service.availability. """
+    start, requests = self._soap._availability_requests(mailboxes, start, end, interval)
+    result = {}
+
+    for chunk, body in requests:
+      self._soap._add_availability(result, chunk, await self._send_unchecked(body), start, interval)
+
+    return result
+
+  async def send(self, xml, headers=None, retries=4, timeout=30, encoding="utf-8"):
+    """ Like Exchange2010Service.send - busy, transient and connection errors are retried here, not in the connection. """
+    async def attempt(remaining):
+      response = await self._send_soap_request(xml, headers, remaining, encoding)
+      return self._soap._parse(response, encoding=encoding)
+
+    return await call_with_retries(self.retry_policy, attempt, retries, timeout, retry_on=self._soap.RETRY_ON)
+
+  async def send_batch(self, xml, headers=None, retries=4, timeout=30, encoding="utf-8"):
+    """ Like Exchange2010Service.send_batch - one <m:*ResponseMessage> per item, failed ones included. """
+    tree = await self._send_unchecked(xml, headers=headers, retries=retries, timeout=timeout, encoding=encoding)
+    return self._soap._response_messages(tree)
+
+  async def _send_unchecked(self, xml, headers=None, retries=4, timeout=30, encoding="utf-8"):
+    async def attempt(remaining):
+      response = await self._send_soap_request(xml, headers, remaining, encoding)
+      tree = self._soap._parse_xml(response, encoding=encoding)
+      self._soap._check_for_SOAP_fault(tree)
+      return tree
+
+    return await call_with_retries(self.retry_policy, attempt, retries, timeout, retry_on=self._soap.RETRY_ON)
+
+  async def _send_soap_request(self, xml, headers, timeout, encoding):
+    request_xml = self._soap._wrap_soap_xml_request(xml)
+    if log.isEnabledFor(logging.INFO):
+      log.info(etree.tostring(request_xml, encoding=encoding, pretty_print=True))
+
+    # The caller's headers go on top of the ones every EWS request needs
+    request_headers = self._soap._request_headers(encoding)
+    request_headers.update(headers or {})
+
+    body = etree.tostring(request_xml, encoding=encoding)
+    return await self.connection.send(body, request_headers, 0, timeout, encoding)
+
+  async def close(self):
+    await self.connection.close()
+
+  # What events and folders use to parse themselves
+
+  def _response_code_exception(self, code, message=None):
+    return self._soap._response_code_exception(code, message)
+
+  def _parse_date(self, date_string):
+    return self._soap._parse_date(date_string)
+
+  def _cast_text(self, text, cast_as=None):
+    return self._soap._cast_text(text, cast_as)
+
+  def _xpath_to_dict(self, element, property_map, namespace_map):
+    return self._soap._xpath_to_dict(element, property_map, namespace_map)
+
+
+class AsyncExchange2010CalendarService(BaseExchangeCalendarService):
+
+  def event(self, id=None, **kwargs):
+    return AsyncExchange2010CalendarEvent(service=self.service, id=id, **kwargs)
+
+  def new_event(self, **properties):
+    return AsyncExchange2010CalendarEvent(service=self.service, calendar_id=self.calendar_id, **properties)
+
+  async def get_event(self, id, fields=None):
+    """
+    Like Exchange2010CalendarService.get_event, including serving and revalidating the service's event_cache.
+    Events loaded with fields aren't cached.
+    """
+    cache = self.service.event_cache
+    if cache is not None and fields is None:
+      return await self._get_cached_event(cache, id)
+
+    body = soap_request.get_item(exchange_id=id, format=u'AllProperties', fields=fields)
+    response_xml = await self.service.send(body)
+
+    return AsyncExchange2010CalendarEvent(service=self.service, xml=response_xml)
+
+  async def _get_cached_event(self, cache, id):
+    cached = cache.get(id)
+
+    if cached is not None:
+      if cache.is_fresh(cached) or _revalidate_cached_event(cache, id, cached, await self._current_change_key(cache, id)):
+        log.debug(u'Serving event %s from the cache', id)
+        return AsyncExchange2010CalendarEvent(service=self.service, xml=etree.fromstring(cached.data))
+
+    body = soap_request.get_item(exchange_id=id, format=u'AllProperties')
+    response_xml = await self.service.send(body)
+
+    event = AsyncExchange2010CalendarEvent(service=self.service, xml=response_xml)
+    _cache_event(cache, id, event, response_xml)
+
+    return event
+
+  async def _current_change_key(self, cache, id):
+    body = soap_request.get_item(exchange_id=id, format=u'IdOnly')
+
+    try:
+      response_xml = await self.service.send(body)
+    except ExchangeItemNotFoundException:
+      cache.discard(id)
+      raise
+
+    return _change_key_from_response(response_xml)
+
+  async def list_events(self, start=None, end=None, details=False, fields=None, read_only=False):
+    event_list = AsyncExchange2010CalendarEventList(
+      service=self.service, start=start, end=end, details=details, fields=fields, read_only=read_only,
+    )
+    return await event_list.load()
+
+
+class AsyncExchange2010CalendarEventList(Exchange2010CalendarEventList):
+  """
+  Like Exchange2010CalendarEventList, but nothing is requested until you await load() -
+  AsyncExchange2010CalendarService.list_events does that for you.
+  """
+
+  def __init__(self, service=None, start=None, end=None, details=False, fields=None, read_only=False):
+    self.service = service
+    self.count = 0
+    self.start = start
+    self.end = end
+    self.events = list()
+    self.event_ids = list()
+    self.details = details
+    self.fields = fields
+    self.read_only = read_only
+    self._parser = Exchange2010CalendarItemParser(service)
+
+  async def load(self):
+    body = self._find_items_request()
+    response_xml = await self.service.send(body)
+    self._parse_response_for_all_events(FOUND_CALENDAR_ITEM_XPATH(response_xml))
+
+    if self.details:
+      log.debug(u'Received request for all details, retrieving now!')
+      await self.load_all_details()
+
+    return self
+
+  async def load_all_details(self, batch_size=None, max_workers=1):
+    """
+    Loads the full details of every event, batch_size ids per request. Up to max_workers requests are in flight
+    at once. Events stay in the same order as :attr:`event_ids`.
+    """
+    log.debug(u"Loading all details")
+    if self.count > 0:
+      batches = self._batch_event_ids(batch_size)
+      semaphore = asyncio.Semaphore(max(max_workers, 1))
+
+      async def load_batch(batch):
+        async with semaphore:
+          return await self._load_details_for_batch(batch)
+
+      results = await asyncio.gather(*[load_batch(batch) for batch in batches])
+
+      del self.events[:]
+      for events in results:
+        self.events.extend(events)
+      self.count = len(self.events)
+      self.reindex()
+
+    return self
+
+  async def _load_details_for_batch(self, event_ids):
+    log.debug(u"Requesting all event details for events: %s", event_ids)
+    body = soap_request.get_item(exchange_id=event_ids, format=u'AllProperties', fields=self.fields)
+    response_xml = await self.service.send(body)
+
+    return self._build_events(CALENDAR_ITEM_XPATH(response_xml))
+
+  def _event_from_xml(self, xml):
+    if self.read_only:
+      return Exchange2010CalendarEventRecord.from_xml(self._parser, xml)
+    return AsyncExchange2010CalendarEvent(service=self.service, xml=xml)
+
+  async def conflict_graph(self, batch_size=None):
+    """ Like Exchange2010CalendarEventList.conflict_graph. """
+    events, adjacency, requests = self._conflict_graph_requests(batch_size)
+
+    for body in requests:
+      self._add_conflicting_events(events, await self.service.send_batch(body))
+
+    return Exchange2010ConflictGraph(adjacency=adjacency, events=events)
+
+
+class AsyncExchange2010CalendarEvent(Exchange2010CalendarEvent):
+  """ An event whose create, update and cancel methods are coroutines. """
+
+  def _init_from_service(self, id):
+    raise TypeError(u"Events can't be loaded by id in the constructor - use `await calendar.get_event(id)` instead.")
+
+  async def create(self):
+    self.validate()
+    body = soap_request.new_event(self)
+
+    response_xml = await self.service.send(body)
+    self._id, self._change_key = self._parse_id_and_change_key_from_response(response_xml)
+
+    return self
+
+  async def update(self, calendar_item_update_operation_type=u'SendToAllAndSaveCopy', optimistic=False, conflict_resolution=None, **kwargs):
+    calendar_item_update_operation_type = self._check_update_operation_type(calendar_item_update_operation_type, **kwargs)
+    conflict_resolution = self._check_conflict_resolution(optimistic, conflict_resolution)
+    self.validate()
+
+    if self._dirty_attributes:
+      log.debug(u"Updating these attributes: %r", self._dirty_attributes)
+
+      if not (optimistic and self._change_key):
+        await self.refresh_change_key()
+
+      try:
+        response_xml = await self._send_update(calendar_item_update_operation_type, conflict_resolution)
+      except (ExchangeStaleChangeKeyException, ExchangeIrresolvableConflictException):
+        if not self._resend_when_stale(optimistic, conflict_resolution):
+          raise
+        await self.refresh_change_key()
+        response_xml = await self._send_update(calendar_item_update_operation_type, conflict_resolution)
+
+      self._update_change_key_from_response(response_xml)
+      self._forget_cached()
+      self._reset_dirty_attributes()
+    else:
+      log.info(u"Update was called, but there's nothing to update. Doing nothing.")
+
+    return self
+
+  async def _send_update(self, calendar_item_update_operation_type, conflict_resolution):
+    body = soap_request.update_item(
+      self, self._dirty_attributes,
+      calendar_item_update_operation_type=calendar_item_update_operation_type,
+      conflict_resolution=conflict_resolution,
+    )
+    return await self.service.send(body)
+
+  async def cancel(self):
+    if not self.id:
+      raise TypeError(u"You can't delete an event that hasn't been created yet.")
+
+    await self.refresh_change_key()
+    await self.service.send(soap_request.delete_event(self))
+    self._forget_cached()
+    return None
+
+  async def refresh_change_key(self):
+    body = soap_request.get_item(exchange_id=self._id, format=u"IdOnly")
+    response_xml = await self.service.send(body)
+    self._id, self._change_key = self._parse_id_and_change_key_from_response(response_xml)
+
+    return self
+
+  async def resend_invitations(self):
+    self._check_resend_invitations()
+
+    await self.refresh_change_key()
+    await self.service.send(soap_request.update_item(self, [], calendar_item_update_operation_type=u'SendOnlyToAll'))
+    self._forget_cached()
+
+    return self
+
+  async def move_to(self, folder_id):
+    self._check_move_to(folder_id)
+
+    await self.refresh_change_key()
+    return self._moved(await self.service.send(soap_request.move_event(self, folder_id)), folder_id)
+
+  async def get_master(self):
+    response_xml = await self.service.send(self._get_master_request())
+    return self.__class__(service=self.service, xml=response_xml)
+
+  async def get_occurrence(self, instance_index):
+    return self._events_from_items(await self.service.send(self._get_occurrence_request(instance_index)))
+
+  get_occurrance = get_occurrence
+
+  async def conflicting_events(self):
+    if not self.conflicting_event_ids:
+      return []
+
+    body = soap_request.get_item(exchange_id=self.conflicting_event_ids, format="AllProperties")
+    return self._events_from_items(await self.service.send(body))
+
+
+class AsyncExchange2010FolderService(BaseExchangeFolderService):
+
+  FIND_FOLDER_TRAVERSALS = Exchange2010FolderService.FIND_FOLDER_TRAVERSALS
+
+  def folder(self, id=None, **kwargs):
+    return AsyncExchange2010Folder(service=self.service, id=id, **kwargs)
+
+  def new_folder(self, **properties):
+    return AsyncExchange2010Folder(service=self.service, **properties)
+
+  async def get_folder(self, id, fields=None):
+    body = soap_request.get_folder(folder_id=id, format=u'AllProperties', fields=fields)
+    return AsyncExchange2010Folder(service=self.service, xml=await self.service.send(body))
+
+  async def find_folder(self, parent_id, traversal=u'Shallow', fields=None):
+    if traversal not in self.FIND_FOLDER_TRAVERSALS:
+      raise ValueError(u"traversal must be one of %s" % u', '.join(self.FIND_FOLDER_TRAVERSALS))
+
+    body = soap_request.find_folder(parent_id=parent_id, format=u'AllProperties', traversal=traversal, fields=fields)
+    response_xml = await self.service.send(body)
+
+    return [
+      AsyncExchange2010Folder(service=self.service, xml=folder)
+      for folder in response_xml.iter(*FOLDER_TAGS) if folder.getparent().tag == T_FOLDERS
+    ]
+
+
+class AsyncExchange2010Folder(Exchange2010Folder):
+  """ A folder whose create, delete and move_to methods are coroutines. """
+
+  def _init_from_service(self, id):
+    raise TypeError(u"Folders can't be loaded by id in the constructor - use `await service.folder().get_folder(id)` instead.")
+
+  async def create(self):
+    self.validate()
+
+    response_xml = await self.service.send(soap_request.new_folder(self))
+    self._id, self._change_key = self._parse_id_and_change_key_from_response(response_xml)
+
+    return self
+
+  async def delete(self):
+    await self.service.send(self._delete_request())
+    self._id = None
+    self._change_key = None
+
+    return None
+
+  async def move_to(self, folder_id):
+    return self._moved(await self.service.send(self._move_request(folder_id)), folder_id)
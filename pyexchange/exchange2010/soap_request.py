@@ -16,6 +16,7 @@ NAMESPACES = {u'm': MSG_NS, u't': TYPE_NS, u's': SOAP_NS}
 
 M = ElementMaker(namespace=MSG_NS, nsmap=NAMESPACES)
 T = ElementMaker(namespace=TYPE_NS, nsmap=NAMESPACES)
+S = ElementMaker(namespace=SOAP_NS, nsmap=NAMESPACES)
 
 EXCHANGE_DATETIME_FORMAT = u"%Y-%m-%dT%H:%M:%SZ"
 EXCHANGE_DATE_FORMAT = u"%Y-%m-%d"
@@ -29,11 +30,91 @@ DISTINGUISHED_IDS = (
 )
 
 
+# Event properties you can ask for by name, and the Exchange fields each one needs
+CALENDAR_FIELD_URIS = {
+  u'subject': (u'item:Subject',),
+  u'html_body': (u'item:Body',),
+  u'text_body': (u'item:Body',),
+  u'reminder_minutes_before_start': (u'item:ReminderMinutesBeforeStart',),
+  u'location': (u'calendar:Location',),
+  u'start': (u'calendar:Start',),
+  u'end': (u'calendar:End',),
+  u'is_all_day': (u'calendar:IsAllDayEvent',),
+  u'availability': (u'calendar:LegacyFreeBusyStatus',),
+  u'type': (u'calendar:CalendarItemType',),
+  u'organizer': (u'calendar:Organizer',),
+  u'attendees': (u'calendar:RequiredAttendees', u'calendar:OptionalAttendees'),
+  u'required_attendees': (u'calendar:RequiredAttendees',),
+  u'optional_attendees': (u'calendar:OptionalAttendees',),
+  u'resources': (u'calendar:Resources',),
+  u'recurrence': (u'calendar:Recurrence',),
+  u'modified_occurrences': (u'calendar:ModifiedOccurrences',),
+  u'deleted_occurrences': (u'calendar:DeletedOccurrences',),
+  u'conflicting_event_ids': (u'calendar:ConflictingMeetings',),
+}
+
+# Both bodies are item:Body - which one Exchange sends depends on the shape's BodyType
+BODY_TYPES = {
+  u'html_body': u'HTML',
+  u'text_body': u'Text',
+}
+
+# Properties FindItem (list_events) can't return - only GetItem can
+GET_ITEM_ONLY_FIELDS = frozenset([
+  u'html_body', u'text_body', u'attendees', u'required_attendees', u'optional_attendees', u'resources',
+  u'recurrence', u'modified_occurrences', u'deleted_occurrences', u'conflicting_event_ids',
+])
+
+# Same for folders. Their ids and type always come back.
+FOLDER_FIELD_URIS = {
+  u'display_name': (u'folder:DisplayName',),
+  u'parent_id': (u'folder:ParentFolderId',),
+}
+
+
 def exchange_header():
 
   return T.RequestServerVersion({u'Version': u'Exchange2010'})
 
 
+def impersonation_header(email):
+  """
+  A SOAP header that makes the request act as the mailbox with this address. The account we log in with needs the
+  ApplicationImpersonation role.
+
+    <s:Header>
+      <t:RequestServerVersion Version="Exchange2010"/>
+      <t:ExchangeImpersonation>
+        <t:ConnectingSID>
+          <t:PrimarySmtpAddress>bob@example.com</t:PrimarySmtpAddress>
+        </t:ConnectingSID>
+      </t:ExchangeImpersonation>
+    </s:Header>
+  """
+  return S.Header(
+    exchange_header(),
+    T.ExchangeImpersonation(T.ConnectingSID(T.PrimarySmtpAddress(email))),
+  )
+
+
+def target_mailbox(request, email):
+  """
+  Points every distinguished folder id in request - 'calendar', say - at the mailbox with this address, for delegate
+  access. Other folder and item ids already name one folder or item in one mailbox, so they're left alone.
+
+    <t:DistinguishedFolderId Id="calendar">
+      <t:Mailbox>
+        <t:EmailAddress>bob@example.com</t:EmailAddress>
+      </t:Mailbox>
+    </t:DistinguishedFolderId>
+  """
+  for folder_id in request.iter(u'{%s}DistinguishedFolderId' % TYPE_NS):
+    if folder_id.find(u'{%s}Mailbox' % TYPE_NS) is None:
+      folder_id.append(T.Mailbox(T.EmailAddress(email)))
+
+  return request
+
+
 def resource_node(element, resources):
   """
   Helper function to generate a person/conference room node from an email address
@@ -59,6 +140,48 @@ def resource_node(element, resources):
   return element
 
 
+def shape(element, format, fields=None, field_uris=CALENDAR_FIELD_URIS):
+  """
+    Builds an <m:ItemShape> or <m:FolderShape> (element is M.ItemShape or M.FolderShape). With a list of fields, only
+    the Exchange fields behind those property names are requested, on top of the ids - an empty list gets just ids.
+    Asking for html_body or text_body sets the BodyType to match. Exchange 2010 only sends one body per item, so
+    asking for both gets whichever the item has.
+
+    <m:ItemShape>
+      <t:BaseShape>IdOnly</t:BaseShape>
+      <t:BodyType>Text</t:BodyType>
+      <t:AdditionalProperties>
+        <t:FieldURI FieldURI="item:Subject"/>
+      </t:AdditionalProperties>
+    </m:ItemShape>
+  """
+
+  if fields is None:
+    return element(T.BaseShape(format))
+
+  if not fields:
+    return element(T.BaseShape(u'IdOnly'))
+
+  unknown = [field for field in fields if field not in field_uris]
+  if unknown:
+    raise ValueError(u"Unknown fields: %s" % u', '.join(unknown))
+
+  uris = []
+  for field in fields:
+    for uri in field_uris[field]:
+      if uri not in uris:
+        uris.append(uri)
+
+  children = [T.BaseShape(u'IdOnly')]
+
+  body_types = set(BODY_TYPES[field] for field in fields if field in BODY_TYPES)
+  if len(body_types) == 1:
+    children.append(T.BodyType(body_types.pop()))
+
+  children.append(T.AdditionalProperties(*[T.FieldURI(FieldURI=uri) for uri in uris]))
+  return element(*children)
+
+
 def delete_field(field_uri):
   """
       Helper function to request deletion of a field. This is necessary when you want to overwrite values instead of
@@ -76,14 +199,15 @@ def delete_field(field_uri):
   return root
 
 
-def get_item(exchange_id, format=u"Default"):
+def get_item(exchange_id, format=u"Default", fields=None):
   """
     Requests a calendar item from the store.
 
     exchange_id is the id for this event in the Exchange store.
 
     format controls how much data you get back from Exchange. Full docs are here, but acceptible values
-    are IdOnly, Default, and AllProperties.
+    are IdOnly, Default, and AllProperties. Pass a list of property names as fields to get just those instead -
+    see CALENDAR_FIELD_URIS.
 
     http://msdn.microsoft.com/en-us/library/aa564509(v=exchg.140).aspx
 
@@ -107,24 +231,20 @@ def get_item(exchange_id, format=u"Default"):
     elements = [T.ItemId(Id=exchange_id)]
 
   root = M.GetItem(
-    M.ItemShape(
-      T.BaseShape(format)
-    ),
+    shape(M.ItemShape, format, fields),
     M.ItemIds(
       *elements
     )
   )
   return root
 
-def get_calendar_items(format=u"Default", start=None, end=None, max_entries=999999):
+def get_calendar_items(format=u"Default", start=None, end=None, max_entries=999999, fields=None):
   start = start.strftime(EXCHANGE_DATETIME_FORMAT)
   end = end.strftime(EXCHANGE_DATETIME_FORMAT)
 
   root = M.FindItem(
     {u'Traversal': u'Shallow'},
-    M.ItemShape(
-      T.BaseShape(format)
-    ),
+    shape(M.ItemShape, format, fields),
     M.CalendarView({
       u'MaxEntriesReturned': _unicode(max_entries),
       u'StartDate': start,
@@ -210,14 +330,108 @@ def get_occurrence(exchange_id, instance_index, format=u"Default"):
   return root
 
 
-def get_folder(folder_id, format=u"Default"):
+def get_recurring_items(references, format=u"Default", fields=None):
+  """
+    Requests the masters of occurrences and occurrences of masters, mixed together in one GetItem. Each reference is
+    either the id of an occurrence, for its master, or a (master id, instance index) pair, for that occurrence.
+
+    <m:GetItem  xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages"
+            xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">
+      <m:ItemShape>
+          <t:BaseShape>{format}</t:BaseShape>
+      </m:ItemShape>
+      <m:ItemIds>
+        <t:RecurringMasterItemId OccurrenceId="{occurrence_id}"/>
+        <t:OccurrenceItemId RecurringMasterId="{master_id}" InstanceIndex="{index}"/>
+      </m:ItemIds>
+    </m:GetItem>
+  """
+
+  elements = []
+  for reference in references:
+    if isinstance(reference, tuple):
+      master_id, index = reference
+      elements.append(T.OccurrenceItemId(RecurringMasterId=master_id, InstanceIndex=str(index)))
+    else:
+      elements.append(T.RecurringMasterItemId(OccurrenceId=reference))
+
+  return M.GetItem(
+    shape(M.ItemShape, format, fields),
+    M.ItemIds(*elements)
+  )
+
+
+def get_user_availability(emails, start, end, interval=30, view=u"MergedOnly"):
+  """
+    Asks for the free/busy time of each of emails between start and end, in slots of interval minutes. Times are
+    sent in UTC.
+
+    http://msdn.microsoft.com/en-us/library/aa564001(v=exchg.140).aspx
+
+    <m:GetUserAvailabilityRequest>
+      <t:TimeZone>
+        <t:Bias>0</t:Bias>
+        <t:StandardTime>...</t:StandardTime>
+        <t:DaylightTime>...</t:DaylightTime>
+      </t:TimeZone>
+      <m:MailboxDataArray>
+        <t:MailboxData>
+          <t:Email>
+            <t:Address>{email}</t:Address>
+          </t:Email>
+          <t:AttendeeType>Required</t:AttendeeType>
+        </t:MailboxData>
+      </m:MailboxDataArray>
+      <t:FreeBusyViewOptions>
+        <t:TimeWindow>
+          <t:StartTime>{start}</t:StartTime>
+          <t:EndTime>{end}</t:EndTime>
+        </t:TimeWindow>
+        <t:MergedFreeBusyIntervalInMinutes>{interval}</t:MergedFreeBusyIntervalInMinutes>
+        <t:RequestedView>{view}</t:RequestedView>
+      </t:FreeBusyViewOptions>
+    </m:GetUserAvailabilityRequest>
+  """
+
+  def utc_transition():
+    return [T.Bias(u'0'), T.Time(u'00:00:00'), T.DayOrder(u'1'), T.Month(u'1'), T.DayOfWeek(u'Sunday')]
+
+  mailboxes = M.MailboxDataArray()
+  for email in emails:
+    mailboxes.append(
+      T.MailboxData(
+        T.Email(T.Address(email)),
+        T.AttendeeType(u'Required'),
+      )
+    )
+
+  start = convert_datetime_to_utc(start).strftime(u"%Y-%m-%dT%H:%M:%S")
+  end = convert_datetime_to_utc(end).strftime(u"%Y-%m-%dT%H:%M:%S")
+
+  return M.GetUserAvailabilityRequest(
+    T.TimeZone(
+      T.Bias(u'0'),
+      T.StandardTime(*utc_transition()),
+      T.DaylightTime(*utc_transition()),
+    ),
+    mailboxes,
+    T.FreeBusyViewOptions(
+      T.TimeWindow(
+        T.StartTime(start),
+        T.EndTime(end),
+      ),
+      T.MergedFreeBusyIntervalInMinutes(_unicode(interval)),
+      T.RequestedView(view),
+    ),
+  )
+
+
+def get_folder(folder_id, format=u"Default", fields=None):
 
   id = T.DistinguishedFolderId(Id=folder_id) if folder_id in DISTINGUISHED_IDS else T.FolderId(Id=folder_id)
 
   root = M.GetFolder(
-    M.FolderShape(
-      T.BaseShape(format)
-    ),
+    shape(M.FolderShape, format, fields, field_uris=FOLDER_FIELD_URIS),
     M.FolderIds(id)
   )
   return root
@@ -239,20 +453,217 @@ def new_folder(folder):
   return root
 
 
-def find_folder(parent_id, format=u"Default"):
+def find_folder(parent_id, format=u"Default", traversal=u"Shallow", fields=None):
 
   id = T.DistinguishedFolderId(Id=parent_id) if parent_id in DISTINGUISHED_IDS else T.FolderId(Id=parent_id)
 
   root = M.FindFolder(
-    {u'Traversal': u'Shallow'},
+    {u'Traversal': traversal},
+    shape(M.FolderShape, format, fields, field_uris=FOLDER_FIELD_URIS),
+    M.ParentFolderIds(id)
+  )
+  return root
+
+
+def sync_folder_items(folder_id, sync_state=None, max_changes=512, format=u"IdOnly"):
+  """
+    Requests the items in a folder that changed since sync_state was handed out. Leave sync_state out to get
+    everything in the folder, as if it had all just been created.
+
+    http://msdn.microsoft.com/en-us/library/aa563967(v=exchg.140).aspx
+
+    <m:SyncFolderItems>
+      <m:ItemShape>
+        <t:BaseShape>{format}</t:BaseShape>
+      </m:ItemShape>
+      <m:SyncFolderId>
+        <t:DistinguishedFolderId Id="{folder_id}"/>
+      </m:SyncFolderId>
+      <m:SyncState>{sync_state}</m:SyncState>
+      <m:MaxChangesReturned>{max_changes}</m:MaxChangesReturned>
+    </m:SyncFolderItems>
+  """
+
+  id = T.DistinguishedFolderId(Id=folder_id) if folder_id in DISTINGUISHED_IDS else T.FolderId(Id=folder_id)
+
+  root = M.SyncFolderItems(
+    M.ItemShape(
+      T.BaseShape(format)
+    ),
+    M.SyncFolderId(id),
+  )
+
+  if sync_state:
+    root.append(M.SyncState(sync_state))
+
+  root.append(M.MaxChangesReturned(_unicode(max_changes)))
+
+  return root
+
+
+def sync_folder_hierarchy(folder_id=None, sync_state=None, format=u"AllProperties"):
+  """
+    Requests the folders under folder_id (or the whole mailbox, if it's None) that were created, changed or
+    deleted since sync_state was handed out. Leave sync_state out to get every folder.
+
+    http://msdn.microsoft.com/en-us/library/aa580990(v=exchg.140).aspx
+
+    <m:SyncFolderHierarchy>
+      <m:FolderShape>
+        <t:BaseShape>{format}</t:BaseShape>
+      </m:FolderShape>
+      <m:SyncFolderId>
+        <t:DistinguishedFolderId Id="{folder_id}"/>
+      </m:SyncFolderId>
+      <m:SyncState>{sync_state}</m:SyncState>
+    </m:SyncFolderHierarchy>
+  """
+
+  root = M.SyncFolderHierarchy(
     M.FolderShape(
       T.BaseShape(format)
     ),
-    M.ParentFolderIds(id)
   )
+
+  if folder_id:
+    id = T.DistinguishedFolderId(Id=folder_id) if folder_id in DISTINGUISHED_IDS else T.FolderId(Id=folder_id)
+    root.append(M.SyncFolderId(id))
+
+  if sync_state:
+    root.append(M.SyncState(sync_state))
+
+  return root
+
+
+def _folder_ids(folder_ids):
+  root = T.FolderIds()
+  for folder_id in folder_ids:
+    root.append(T.DistinguishedFolderId(Id=folder_id) if folder_id in DISTINGUISHED_IDS else T.FolderId(Id=folder_id))
+  return root
+
+
+def _event_types(event_types):
+  root = T.EventTypes()
+  for event_type in event_types:
+    root.append(T.EventType(event_type))
   return root
 
 
+def subscribe(folder_ids, event_types, watermark=None, timeout=30):
+  """
+    Subscribes to changes in folder_ids. Exchange keeps the changes until we ask for them with GetEvents, for up
+    to timeout minutes after we last asked. Pass the watermark of the last change you saw to pick up where an
+    expired subscription left off.
+
+    http://msdn.microsoft.com/en-us/library/aa566188(v=exchg.140).aspx
+
+    <m:Subscribe>
+      <m:PullSubscriptionRequest>
+        <t:FolderIds>
+          <t:DistinguishedFolderId Id="calendar"/>
+        </t:FolderIds>
+        <t:EventTypes>
+          <t:EventType>CreatedEvent</t:EventType>
+        </t:EventTypes>
+        <t:Watermark>{watermark}</t:Watermark>
+        <t:Timeout>{timeout}</t:Timeout>
+      </m:PullSubscriptionRequest>
+    </m:Subscribe>
+  """
+
+  request = M.PullSubscriptionRequest(
+    _folder_ids(folder_ids),
+    _event_types(event_types),
+  )
+
+  if watermark:
+    request.append(T.Watermark(watermark))
+
+  request.append(T.Timeout(_unicode(timeout)))
+
+  return M.Subscribe(request)
+
+
+def subscribe_streaming(folder_ids, event_types):
+  """
+    Subscribes to changes in folder_ids, to be pushed to us over GetStreamingEvents.
+
+    http://msdn.microsoft.com/en-us/library/ff406182(v=exchg.140).aspx
+
+    <m:Subscribe>
+      <m:StreamingSubscriptionRequest>
+        <t:FolderIds>
+          <t:DistinguishedFolderId Id="calendar"/>
+        </t:FolderIds>
+        <t:EventTypes>
+          <t:EventType>CreatedEvent</t:EventType>
+        </t:EventTypes>
+      </m:StreamingSubscriptionRequest>
+    </m:Subscribe>
+  """
+
+  return M.Subscribe(
+    M.StreamingSubscriptionRequest(
+      _folder_ids(folder_ids),
+      _event_types(event_types),
+    )
+  )
+
+
+def get_events(subscription_id, watermark):
+  """
+    Asks for the changes a pull subscription has seen since watermark.
+
+    http://msdn.microsoft.com/en-us/library/aa566199(v=exchg.140).aspx
+
+    <m:GetEvents>
+      <m:SubscriptionId>{subscription_id}</m:SubscriptionId>
+      <m:Watermark>{watermark}</m:Watermark>
+    </m:GetEvents>
+  """
+
+  return M.GetEvents(
+    M.SubscriptionId(subscription_id),
+    M.Watermark(watermark),
+  )
+
+
+def get_streaming_events(subscription_ids, connection_timeout=30):
+  """
+    Opens a connection that Exchange pushes changes down as they happen, for up to connection_timeout minutes.
+
+    http://msdn.microsoft.com/en-us/library/ff406172(v=exchg.140).aspx
+
+    <m:GetStreamingEvents>
+      <m:SubscriptionIds>
+        <t:SubscriptionId>{subscription_id}</t:SubscriptionId>
+      </m:SubscriptionIds>
+      <m:ConnectionTimeout>{connection_timeout}</m:ConnectionTimeout>
+    </m:GetStreamingEvents>
+  """
+
+  ids = M.SubscriptionIds()
+  for subscription_id in subscription_ids:
+    ids.append(T.SubscriptionId(subscription_id))
+
+  return M.GetStreamingEvents(
+    ids,
+    M.ConnectionTimeout(_unicode(connection_timeout)),
+  )
+
+
+def unsubscribe(subscription_id):
+  """
+    http://msdn.microsoft.com/en-us/library/aa564263(v=exchg.140).aspx
+
+    <m:Unsubscribe>
+      <m:SubscriptionId>{subscription_id}</m:SubscriptionId>
+    </m:Unsubscribe>
+  """
+
+  return M.Unsubscribe(M.SubscriptionId(subscription_id))
+
+
 def delete_folder(folder):
 
   root = M.DeleteFolder(
@@ -317,23 +728,37 @@ def new_event(event):
 </m:CreateItem>
   """
 
-  id = T.DistinguishedFolderId(Id=event.calendar_id) if event.calendar_id in DISTINGUISHED_IDS else T.FolderId(Id=event.calendar_id)
+  return new_events([event])
 
-  start = convert_datetime_to_utc(event.start)
-  end = convert_datetime_to_utc(event.end)
+
+def new_events(events):
+  """
+  Requests several events be created in one CreateItem call. They're all saved to the first event's calendar, and
+  Exchange answers with one CreateItemResponseMessage per event, in the same order.
+  """
+
+  calendar_id = events[0].calendar_id
+  id = T.DistinguishedFolderId(Id=calendar_id) if calendar_id in DISTINGUISHED_IDS else T.FolderId(Id=calendar_id)
 
   root = M.CreateItem(
     M.SavedItemFolderId(id),
-    M.Items(
-      T.CalendarItem(
-        T.Subject(event.subject),
-        T.Body(event.body or u'', BodyType="HTML"),
-      )
-    ),
+    M.Items(*[calendar_item(event) for event in events]),
     SendMeetingInvitations="SendToAllAndSaveCopy"
   )
 
-  calendar_node = root.xpath(u'/m:CreateItem/m:Items/t:CalendarItem', namespaces=NAMESPACES)[0]
+  return root
+
+
+def calendar_item(event):
+  """ Builds the <t:CalendarItem> node CreateItem uses to describe a new event. """
+
+  start = convert_datetime_to_utc(event.start)
+  end = convert_datetime_to_utc(event.end)
+
+  calendar_node = T.CalendarItem(
+    T.Subject(event.subject),
+    T.Body(event.body or u'', BodyType="HTML"),
+  )
 
   if event.reminder_minutes_before_start:
     calendar_node.append(T.ReminderIsSet('true'))
@@ -390,7 +815,7 @@ def new_event(event):
       )
     )
 
-  return root
+  return calendar_node
 
 
 def delete_event(event):
@@ -411,16 +836,22 @@ def delete_event(event):
     </DeleteItem>
 
     """
-    root = M.DeleteItem(
-      M.ItemIds(
-        T.ItemId(Id=event.id, ChangeKey=event.change_key)
-      ),
-      DeleteType="HardDelete",
-      SendMeetingCancellations="SendToAllAndSaveCopy",
-      AffectedTaskOccurrences="AllOccurrences"
-    )
+    return delete_events([event])
 
-    return root
+
+def delete_events(events):
+  """ Requests several items be deleted from the store in one DeleteItem call. See delete_event. """
+
+  root = M.DeleteItem(
+    M.ItemIds(
+      *[T.ItemId(Id=event.id, ChangeKey=event.change_key) for event in events]
+    ),
+    DeleteType="HardDelete",
+    SendMeetingCancellations="SendToAllAndSaveCopy",
+    AffectedTaskOccurrences="AllOccurrences"
+  )
+
+  return root
 
 
 def move_event(event, folder_id):
@@ -458,22 +889,41 @@ def update_property_node(node_to_insert, field_uri):
   return root
 
 
-def update_item(event, updated_attributes, calendar_item_update_operation_type):
+def update_item(event, updated_attributes, calendar_item_update_operation_type, conflict_resolution=u"AlwaysOverwrite"):
   """ Saves updates to an event in the store. Only request changes for attributes that have actually changed."""
+  return update_items([(event, updated_attributes)], calendar_item_update_operation_type, conflict_resolution=conflict_resolution)
+
+
+def update_items(changes, calendar_item_update_operation_type, conflict_resolution=u"AlwaysOverwrite"):
+  """
+  Saves updates to several events in one UpdateItem call. changes is a list of (event, updated_attributes) pairs,
+  and Exchange answers with one UpdateItemResponseMessage per pair, in the same order.
+
+  conflict_resolution is what Exchange does if an event changed since its change key was handed out:
+  AlwaysOverwrite, AutoResolve or NeverOverwrite.
+  """
 
   root = M.UpdateItem(
     M.ItemChanges(
-      T.ItemChange(
-        T.ItemId(Id=event.id, ChangeKey=event.change_key),
-        T.Updates()
-      )
+      *[item_change(event, updated_attributes) for event, updated_attributes in changes]
     ),
-    ConflictResolution=u"AlwaysOverwrite",
+    ConflictResolution=conflict_resolution,
     MessageDisposition=u"SendAndSaveCopy",
     SendMeetingInvitationsOrCancellations=calendar_item_update_operation_type
   )
 
-  update_node = root.xpath(u'/m:UpdateItem/m:ItemChanges/t:ItemChange/t:Updates', namespaces=NAMESPACES)[0]
+  return root
+
+
+def item_change(event, updated_attributes):
+  """ Builds the <t:ItemChange> node for one event in an UpdateItem call. """
+
+  root = T.ItemChange(
+    T.ItemId(Id=event.id, ChangeKey=event.change_key),
+    T.Updates()
+  )
+
+  update_node = root.find(u'{%s}Updates' % TYPE_NS)
 
   # if not send_only_to_changed_attendees:
   #   # We want to resend invites, which you do by setting an attribute to the same value it has. Right now, events
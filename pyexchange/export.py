@@ -0,0 +1,230 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+
+Writes events out as two tables - one row per event, and one row per attendee or resource keyed by event_id - a
+batch at a time, so exporting a calendar only ever holds batch_size events in memory. CSV and JSON Lines work out of
+the box; Arrow and Parquet need pyarrow (``pip install pyexchange[arrow]``).
+
+Anything that yields events works: an event list's ``events``, ``calendar().iter_events(...)``, or either of those
+with read_only=True, which is the cheapest way to go.
+"""
+import csv
+from collections import namedtuple
+from datetime import date, datetime
+
+from . import serialization
+
+EVENT_COLUMNS = (
+  u'id', u'change_key', u'subject', u'start', u'end', u'location', u'availability', u'type', u'is_all_day',
+  u'reminder_minutes_before_start', u'organizer_name', u'organizer_email', u'recurrence', u'recurrence_interval',
+  u'recurrence_end_date', u'recurrence_days', u'html_body', u'text_body',
+)
+
+ATTENDEE_COLUMNS = (u'event_id', u'email', u'name', u'required', u'response', u'last_response', u'is_resource')
+
+# Columns that are read straight off the event, under the same name
+_EVENT_ATTRIBUTES = tuple(column for column in EVENT_COLUMNS if not column.startswith(u'organizer_'))
+
+EXPORT_BATCH_SIZE = 1000
+
+FORMATS = (u'csv', u'jsonl', u'parquet')
+
+# One batch of each table, as a dict of column name -> list of values
+ExportBatch = namedtuple('ExportBatch', ['events', 'attendees'])
+
+
+def event_batches(events, batch_size=EXPORT_BATCH_SIZE):
+  """ Yields an ExportBatch for every batch_size events. """
+  if batch_size < 1:
+    raise ValueError(u"batch_size must be a positive integer")
+
+  batch = _empty_batch()
+  count = 0
+
+  for event in events:
+    _add_event(batch, event)
+    count += 1
+
+    if count == batch_size:
+      yield batch
+      batch = _empty_batch()
+      count = 0
+
+  if count:
+    yield batch
+
+
+def _empty_batch():
+  return ExportBatch(
+    events=dict((column, []) for column in EVENT_COLUMNS),
+    attendees=dict((column, []) for column in ATTENDEE_COLUMNS),
+  )
+
+
+def _add_event(batch, event):
+  for column in _EVENT_ATTRIBUTES:
+    batch.events[column].append(getattr(event, column, None))
+
+  organizer = event.organizer
+  batch.events[u'organizer_name'].append(organizer.name if organizer is not None else None)
+  batch.events[u'organizer_email'].append(organizer.email if organizer is not None else None)
+
+  for people, is_resource in ((event.attendees, False), (event.resources, True)):
+    for person in people:
+      batch.attendees[u'event_id'].append(event.id)
+      batch.attendees[u'email'].append(person.email)
+      batch.attendees[u'name'].append(person.name)
+      batch.attendees[u'required'].append(person.required)
+      batch.attendees[u'response'].append(person.response)
+      batch.attendees[u'last_response'].append(person.last_response)
+      batch.attendees[u'is_resource'].append(is_resource)
+
+
+def _rows(table, columns):
+  return zip(*[table[column] for column in columns])
+
+
+def _text(value):
+  if isinstance(value, (datetime, date)):
+    return value.isoformat()
+  return value
+
+
+def write_csv(events, events_file, attendees_file=None, batch_size=EXPORT_BATCH_SIZE):
+  """
+  Writes events to events_file, and their attendees and resources to attendees_file if you give one. Both are text
+  files opened with newline=''. Times are written in ISO 8601 and missing values as empty cells. Returns the
+  number of events written.
+  """
+  event_writer = csv.writer(events_file)
+  event_writer.writerow(EVENT_COLUMNS)
+
+  attendee_writer = None
+  if attendees_file is not None:
+    attendee_writer = csv.writer(attendees_file)
+    attendee_writer.writerow(ATTENDEE_COLUMNS)
+
+  count = 0
+  for batch in event_batches(events, batch_size):
+    for row in _rows(batch.events, EVENT_COLUMNS):
+      event_writer.writerow([_text(value) for value in row])
+      count += 1
+
+    if attendee_writer is not None:
+      for row in _rows(batch.attendees, ATTENDEE_COLUMNS):
+        attendee_writer.writerow([_text(value) for value in row])
+
+  return count
+
+
+def write_json_lines(events, events_file, attendees_file=None, batch_size=EXPORT_BATCH_SIZE):
+  """
+  Like :func:`write_csv`, but writes one JSON object per line, encoded by :mod:`pyexchange.serialization` - keys
+  sorted, times in UTC as in ``event.as_json()``, and missing values null.
+
+  The objects are rows of the two tables, with the same columns as the CSV and Parquet output. For one nested object
+  per event that ``from_json`` can read back, use the event list's ``to_json_lines()`` instead.
+  """
+  count = 0
+  for batch in event_batches(events, batch_size):
+    for row in _rows(batch.events, EVENT_COLUMNS):
+      events_file.write(_json_line(EVENT_COLUMNS, row))
+      count += 1
+
+    if attendees_file is not None:
+      for row in _rows(batch.attendees, ATTENDEE_COLUMNS):
+        attendees_file.write(_json_line(ATTENDEE_COLUMNS, row))
+
+  return count
+
+
+def _json_line(columns, row):
+  return serialization.dumps(dict((column, serialization.json_value(value)) for column, value in zip(columns, row))) + u'\n'
+
+
+def _pyarrow():
+  try:
+    import pyarrow
+  except ImportError:
+    raise ImportError(u"Exporting to Arrow or Parquet needs pyarrow - pip install pyexchange[arrow]")
+  return pyarrow
+
+
+def arrow_schemas():
+  """ The pyarrow schemas of the event and attendee tables. """
+  pa = _pyarrow()
+  timestamp = pa.timestamp(u'us', tz=u'UTC')
+
+  event_schema = pa.schema([
+    (u'id', pa.string()), (u'change_key', pa.string()), (u'subject', pa.string()),
+    (u'start', timestamp), (u'end', timestamp), (u'location', pa.string()), (u'availability', pa.string()),
+    (u'type', pa.string()), (u'is_all_day', pa.bool_()), (u'reminder_minutes_before_start', pa.int32()),
+    (u'organizer_name', pa.string()), (u'organizer_email', pa.string()), (u'recurrence', pa.string()),
+    (u'recurrence_interval', pa.int32()), (u'recurrence_end_date', pa.date32()), (u'recurrence_days', pa.string()),
+    (u'html_body', pa.string()), (u'text_body', pa.string()),
+  ])
+
+  attendee_schema = pa.schema([
+    (u'event_id', pa.string()), (u'email', pa.string()), (u'name', pa.string()), (u'required', pa.bool_()),
+    (u'response', pa.string()), (u'last_response', timestamp), (u'is_resource', pa.bool_()),
+  ])
+
+  return event_schema, attendee_schema
+
+
+def arrow_batches(events, batch_size=EXPORT_BATCH_SIZE):
+  """ Yields a (events, attendees) pair of pyarrow.RecordBatch for every batch_size events. """
+  pa = _pyarrow()
+  event_schema, attendee_schema = arrow_schemas()
+
+  for batch in event_batches(events, batch_size):
+    yield (
+      pa.RecordBatch.from_pydict(batch.events, schema=event_schema),
+      pa.RecordBatch.from_pydict(batch.attendees, schema=attendee_schema),
+    )
+
+
+def write_parquet(events, events_file, attendees_file=None, batch_size=EXPORT_BATCH_SIZE):
+  """
+  Like :func:`write_csv`, but writes Parquet. events_file and attendees_file can be paths or binary files. Each
+  batch becomes a row group.
+  """
+  _pyarrow()
+  import pyarrow.parquet as pq
+
+  event_schema, attendee_schema = arrow_schemas()
+  event_writer = pq.ParquetWriter(events_file, event_schema)
+  attendee_writer = pq.ParquetWriter(attendees_file, attendee_schema) if attendees_file is not None else None
+
+  count = 0
+  try:
+    for event_batch, attendee_batch in arrow_batches(events, batch_size):
+      event_writer.write_batch(event_batch)
+      count += event_batch.num_rows
+
+      if attendee_writer is not None and attendee_batch.num_rows:
+        attendee_writer.write_batch(attendee_batch)
+  finally:
+    event_writer.close()
+    if attendee_writer is not None:
+      attendee_writer.close()
+
+  return count
+
+
+WRITERS = {
+  u'csv': write_csv,
+  u'jsonl': write_json_lines,
+  u'parquet': write_parquet,
+}
+
+
+def write(events, events_file, attendees_file=None, format=u'csv', batch_size=EXPORT_BATCH_SIZE):
+  """ Writes events out in format - one of FORMATS. Returns the number of events written. """
+  if format not in WRITERS:
+    raise ValueError(u"format must be one of %s" % u', '.join(FORMATS))
+
+  return WRITERS[format](events, events_file, attendees_file=attendees_file, batch_size=batch_size)
@@ -0,0 +1,161 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+
+Answers time questions about a set of events - what overlaps this window, what's on at this moment, where the gaps
+are - without scanning all of them each time.
+
+Events are kept sorted by start, alongside the latest end of each stretch of them, laid out as an implicit binary
+tree over the sorted array. A query bisects to the events that start early enough, then walks the tree skipping
+every stretch that's all over before the window opens, so it costs O(log n) plus the events it returns.
+"""
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+
+from pytz import utc
+
+from .utils import convert_datetime_to_utc, localize
+
+# Events with this availability don't stop a slot from being free
+FREE = u'Free'
+
+
+class EventIntervalIndex(object):
+
+  def __init__(self, events):
+    timed = []
+    for event in events:
+      if event.start is None or event.end is None:
+        continue
+      timed.append((convert_datetime_to_utc(event.start), convert_datetime_to_utc(event.end), event))
+
+    timed.sort(key=lambda item: item[0])
+
+    self.starts = [start for start, _, _ in timed]
+    self.ends = [end for _, end, _ in timed]
+    self.events = [event for _, _, event in timed]
+
+    # latest_end[mid] is the latest end among the events in the stretch that mid is the middle of
+    self.latest_end = list(self.ends)
+    self._build(0, len(self.events))
+
+  def __len__(self):
+    return len(self.events)
+
+  def _build(self, lo, hi):
+    if lo >= hi:
+      return None
+
+    mid = (lo + hi) // 2
+    for child in (self._build(lo, mid), self._build(mid + 1, hi)):
+      if child is not None and child > self.latest_end[mid]:
+        self.latest_end[mid] = child
+
+    return self.latest_end[mid]
+
+  def overlapping(self, start, end):
+    """ The events that overlap start to end, in order of their start. """
+    start, end = convert_datetime_to_utc(start), convert_datetime_to_utc(end)
+    return [self.events[i] for i in self._query(bisect_left(self.starts, end), start)]
+
+  def at(self, moment):
+    """ The events going on at moment - started by then and not yet over - in order of their start. """
+    moment = convert_datetime_to_utc(moment)
+    return [self.events[i] for i in self._query(bisect_right(self.starts, moment), moment)]
+
+  def _query(self, limit, moment):
+    """ The positions, in order, of the events before limit that end after moment. """
+    found = []
+    stack = [(0, len(self.events))]
+
+    while stack:
+      lo, hi = stack.pop()
+
+      # A stretch with no end is the single event at lo
+      if hi is None:
+        found.append(lo)
+        continue
+
+      if lo >= hi or lo >= limit:
+        continue
+
+      mid = (lo + hi) // 2
+      if self.latest_end[mid] <= moment:
+        continue
+
+      # Pushed backwards, so the left stretch comes off the stack first and positions come out in order
+      stack.append((mid + 1, hi))
+      if mid < limit and self.ends[mid] > moment:
+        stack.append((mid, None))
+      stack.append((lo, mid))
+
+    return found
+
+  def conflicts(self):
+    """
+    Every pair of events that overlap each other, as (earlier, later) by start. Events that only touch - one ending
+    as the other starts - don't conflict.
+    """
+    pairs = []
+    for i, end in enumerate(self.ends):
+      for j in range(i + 1, bisect_left(self.starts, end, i + 1)):
+        if self.ends[j] > self.starts[i]:
+          pairs.append((self.events[i], self.events[j]))
+
+    return pairs
+
+  def free_slots(self, start, end, min_duration=timedelta(0), working_hours=None, tz=utc):
+    """
+    The (start, end) stretches of at least min_duration between start and end with no events on, other than ones
+    marked free. working_hours, a pair of times like (time(9), time(17)), limits them to those hours of each day in
+    tz.
+    """
+    start, end = convert_datetime_to_utc(start), convert_datetime_to_utc(end)
+
+    # Merged, so the busy stretches don't overlap and their ends are in order too
+    busy = []
+    for i in self._query(bisect_left(self.starts, end), start):
+      if getattr(self.events[i], u'availability', None) == FREE:
+        continue
+      if busy and self.starts[i] <= busy[-1][1]:
+        busy[-1][1] = max(busy[-1][1], self.ends[i])
+      else:
+        busy.append([self.starts[i], self.ends[i]])
+    busy_ends = [busy_end for _, busy_end in busy]
+
+    slots = []
+    for window_start, window_end in _working_windows(start, end, working_hours, tz):
+      free_from = window_start
+
+      for k in range(bisect_right(busy_ends, window_start), len(busy)):
+        busy_start, busy_end = busy[k]
+        if busy_start >= window_end:
+          break
+        if busy_start > free_from and busy_start - free_from >= min_duration:
+          slots.append((free_from, busy_start))
+        free_from = max(free_from, busy_end)
+
+      if window_end > free_from and window_end - free_from >= min_duration:
+        slots.append((free_from, window_end))
+
+    return slots
+
+
+def _working_windows(start, end, working_hours, tz):
+  """ Yields the (start, end) stretches of working hours between start and end, or just start to end if there are none. """
+  if working_hours is None:
+    if start < end:
+      yield start, end
+    return
+
+  opens, closes = working_hours
+  day, last_day = start.astimezone(tz).date(), end.astimezone(tz).date()
+
+  while day <= last_day:
+    window_start = max(start, localize(tz, datetime.combine(day, opens)).astimezone(utc))
+    window_end = min(end, localize(tz, datetime.combine(day, closes)).astimezone(utc))
+    if window_start < window_end:
+      yield window_start, window_end
+    day += timedelta(days=1)
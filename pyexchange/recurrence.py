@@ -0,0 +1,198 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+
+Works out when a recurring event's occurrences are, without asking Exchange. Handles the daily, weekly, monthly and
+yearly patterns that soap_request.new_event creates, with an end date or none. The master already carries its
+modified and deleted occurrences, so those are applied too and nothing else has to be fetched.
+
+The nth occurrence of each pattern is found with arithmetic rather than by stepping through the ones before it, so
+expanding a window years into a long series costs the same as expanding its first week.
+"""
+import calendar
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+from pytz import utc
+
+from .utils import convert_datetime_to_utc, localize
+
+# One occurrence of a recurring event. index is Exchange's InstanceIndex, counting from 1 - pass it to
+# get_occurrence for the full event. id is only set for occurrences that were modified.
+ExchangeOccurrence = namedtuple('ExchangeOccurrence', ['index', 'start', 'end', 'original_start', 'id'])
+
+# In date.weekday() order
+WEEKDAYS = (u'Monday', u'Tuesday', u'Wednesday', u'Thursday', u'Friday', u'Saturday', u'Sunday')
+
+
+class DailyPattern(object):
+
+  def __init__(self, first, interval=1):
+    self.first = first
+    self.interval = interval
+
+  def nth(self, n):
+    """ The date of occurrence n, counting from 0. """
+    return self.first + timedelta(days=n * self.interval)
+
+  def index_near(self, day):
+    """ An occurrence number no later than the first occurrence on or after day. """
+    return max(0, (day - self.first).days // self.interval)
+
+
+class WeeklyPattern(object):
+  """ Weeks start on Sunday, like Exchange's. """
+
+  def __init__(self, first, days, interval=1):
+    names = days.split() if days else []
+    unknown = set(names).difference(WEEKDAYS)
+    if not names or unknown:
+      raise ValueError(u"Weekly recurrence needs days of the week, like 'Monday Thursday', not %r" % days)
+
+    self.interval = interval
+    self.week_start = first - timedelta(days=self._offset(first))
+    self.offsets = sorted(set(self._offset_of(name) for name in names))
+
+    # The first week only has the days from the first occurrence on
+    self.first_week = [offset for offset in self.offsets if offset >= self._offset(first)]
+
+  def _offset(self, day):
+    return (day.weekday() + 1) % 7
+
+  def _offset_of(self, name):
+    return (WEEKDAYS.index(name) + 1) % 7
+
+  def nth(self, n):
+    if n < len(self.first_week):
+      week, offset = 0, self.first_week[n]
+    else:
+      n -= len(self.first_week)
+      week, offset = 1 + n // len(self.offsets), self.offsets[n % len(self.offsets)]
+
+    return self.week_start + timedelta(days=week * self.interval * 7 + offset)
+
+  def index_near(self, day):
+    week = (day - self.week_start).days // (7 * self.interval)
+    if week <= 0:
+      return 0
+    return len(self.first_week) + (week - 1) * len(self.offsets)
+
+
+class MonthlyPattern(object):
+  """ Every interval months on the first occurrence's day of the month, or the last day of shorter months. """
+
+  def __init__(self, first, interval=1):
+    self.first = first
+    self.interval = interval
+
+  def nth(self, n):
+    return _add_months(self.first, n * self.interval)
+
+  def index_near(self, day):
+    months = (day.year - self.first.year) * 12 + day.month - self.first.month
+    return max(0, months // self.interval)
+
+
+class YearlyPattern(MonthlyPattern):
+
+  def __init__(self, first, interval=1):
+    super(YearlyPattern, self).__init__(first, interval=12)
+
+
+PATTERNS = {
+  u'daily': DailyPattern,
+  u'monthly': MonthlyPattern,
+  u'yearly': YearlyPattern,
+}
+
+
+def _add_months(day, months):
+  month = day.month - 1 + months
+  year, month = day.year + month // 12, month % 12 + 1
+  return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def pattern_for(event, first):
+  """ The pattern of event's recurrence, with its first occurrence on the date first. """
+  interval = event.recurrence_interval or 1
+  if interval < 1:
+    raise ValueError(u"recurrence_interval must be a positive integer")
+
+  if event.recurrence == u'weekly':
+    return WeeklyPattern(first, event.recurrence_days, interval)
+
+  if event.recurrence not in PATTERNS:
+    raise ValueError(u"Don't know how to expand %r recurrences" % event.recurrence)
+
+  return PATTERNS[event.recurrence](first, interval)
+
+
+def expand(event, start=None, end=None, tz=utc):
+  """
+  Yields an ExchangeOccurrence for each occurrence of event - a recurring master - that overlaps start to end, in
+  order of when they would have been. Either end of the window can be left open; a series with no end date and no
+  window end goes on forever, so take what you need from it.
+
+  Occurrences keep the same wall clock time in tz, which should be the time zone the series was created in -
+  that's how Exchange schedules them, so a series in a time zone with daylight saving time moves in UTC when the
+  clocks change. Deleted occurrences are skipped. Modified ones are yielded at their new time, but in the order of
+  their original one, which is also what decides whether they're looked at - so one moved into the window from
+  outside it is left out.
+  """
+  duration = event.end - event.start
+  local_start = convert_datetime_to_utc(event.start).astimezone(tz)
+  time_of_day = local_start.time()
+  last_day = event.recurrence_end_date
+
+  pattern = pattern_for(event, local_start.date())
+  deleted = frozenset(getattr(event, u'deleted_occurrences', None) or ())
+  modified = dict((occurrence.original_start, occurrence) for occurrence in getattr(event, u'modified_occurrences', None) or ())
+
+  if start is not None:
+    start = convert_datetime_to_utc(start)
+  if end is not None:
+    end = convert_datetime_to_utc(end)
+
+  n = 0
+  if start is not None:
+    # Anything on an earlier day than this ends before the window starts - the extra day covers clock changes
+    n = pattern.index_near((start - duration).astimezone(tz).date() - timedelta(days=1))
+
+    # index_near only promises not to overshoot, so catch up to the first occurrence that could be in the window
+    while True:
+      day = pattern.nth(n)
+      if (last_day is not None and day > last_day) or _occurrence_start(tz, day, time_of_day) + duration > start:
+        break
+      n += 1
+
+  while True:
+    day = pattern.nth(n)
+    if last_day is not None and day > last_day:
+      return
+
+    original_start = _occurrence_start(tz, day, time_of_day)
+    if end is not None and original_start >= end:
+      return
+
+    n += 1
+    if original_start in deleted:
+      continue
+
+    occurrence = modified.get(original_start)
+    if occurrence is None:
+      occurrence_start, occurrence_end, id = original_start, original_start + duration, None
+    else:
+      occurrence_start, occurrence_end, id = occurrence.start, occurrence.end, occurrence.id
+
+    if start is not None and occurrence_end <= start:
+      continue
+    if end is not None and occurrence_start >= end:
+      continue
+
+    yield ExchangeOccurrence(index=n, start=occurrence_start, end=occurrence_end, original_start=original_start, id=id)
+
+
+def _occurrence_start(tz, day, time_of_day):
+  return localize(tz, datetime.combine(day, time_of_day)).astimezone(utc)
@@ -0,0 +1,90 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import logging
+import random
+import time
+
+log = logging.getLogger('pyexchange')
+
+
+class RetryPolicy(object):
+  """
+  Decides whether and when to try a failed request again.
+
+  The wait before retry n is picked at random between 0 and base_delay * 2**n seconds, capped at max_delay
+  ("full jitter"), so clients that failed together don't all come back together. If the server said how long to
+  back off for, we wait at least that long.
+
+  Calls have a deadline: timeout seconds after the first attempt started. We give up instead of waiting past it,
+  and each attempt only gets the time that's left.
+  """
+
+  def __init__(self, base_delay=0.5, max_delay=30, sleep=time.sleep, clock=time.time):
+    self.base_delay = base_delay
+    self.max_delay = max_delay
+    self.sleep = sleep
+    self.clock = clock
+
+  def delay(self, attempt, back_off=None):
+    """ How many seconds to wait after failed attempt number attempt (counting from 0). """
+    delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    if back_off is not None:
+      delay = max(delay, back_off)
+
+    return delay
+
+  def deadline(self, timeout):
+    return None if timeout is None else self.clock() + timeout
+
+  def remaining(self, deadline):
+    return None if deadline is None else deadline - self.clock()
+
+  def next_delay(self, attempt, retries, deadline, back_off=None):
+    """
+    How many seconds to wait before the attempt after attempt number attempt, or None if there shouldn't be one -
+    it would be more than retries retries, or would start past the deadline.
+    """
+    if attempt >= retries:
+      return None
+
+    delay = self.delay(attempt, back_off)
+    if deadline is not None and self.clock() + delay >= deadline:
+      log.debug(u'Not retrying, waiting %.2fs would go past the deadline', delay)
+      return None
+
+    log.debug(u'Retrying in %.2fs', delay)
+    return delay
+
+  def wait(self, attempt, retries, deadline, back_off=None):
+    """
+    Sleeps until it's time for the attempt after attempt number attempt, and returns True. Returns False straight
+    away if there shouldn't be another attempt - see next_delay.
+    """
+    delay = self.next_delay(attempt, retries, deadline, back_off)
+    if delay is None:
+      return False
+
+    self.sleep(delay)
+    return True
+
+  def call(self, func, retries, timeout, retry_on):
+    """
+    Calls func(remaining_seconds) until it returns, retrying up to retries times when it raises one of the
+    exceptions in retry_on. The last exception is raised if we run out of retries or time.
+    """
+    deadline = self.deadline(timeout)
+    attempt = 0
+
+    while True:
+      try:
+        return func(self.remaining(deadline))
+      except retry_on as err:
+        log.info(u'Attempt %s failed: %s', attempt + 1, err)
+        if not self.wait(attempt, retries, deadline, getattr(err, 'back_off', None)):
+          raise
+        attempt += 1
@@ -0,0 +1,183 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+
+Turns events into plain, JSON-ready dicts and back. Output is stable - keys are sorted and times are always UTC in
+the same format - so the same event always serializes to the same string. orjson is used when it's installed,
+otherwise the standard library's json, and both produce the same output.
+"""
+import json
+from datetime import date, datetime
+
+from pytz import utc
+
+from .base.calendar import ExchangeEventOrganizer, ExchangeEventResponse, ExchangeModifiedOccurrence
+from .utils import convert_datetime_to_utc
+
+try:
+  import orjson
+except ImportError:
+  orjson = None
+
+DATETIME_FORMAT = u"%Y-%m-%dT%H:%M:%SZ"
+DATE_FORMAT = u"%Y-%m-%d"
+
+# Properties that are written out just as they are
+PLAIN_PROPERTIES = (
+  u'subject', u'location', u'availability', u'html_body', u'text_body', u'reminder_minutes_before_start',
+  u'is_all_day', u'recurrence', u'recurrence_interval', u'recurrence_days',
+)
+
+# Read-only event properties, and the attribute an event keeps each one in
+PRIVATE_PROPERTIES = {u'type': u'_type', u'conflicting_event_ids': u'_conflicting_event_ids'}
+
+
+def dumps(data):
+  """ Serializes data to a compact JSON string with sorted keys. """
+  if orjson is not None:
+    return orjson.dumps(data, option=orjson.OPT_SORT_KEYS).decode('utf-8')
+  return json.dumps(data, sort_keys=True, separators=(u',', u':'), ensure_ascii=False)
+
+
+def loads(data):
+  if orjson is not None:
+    return orjson.loads(data)
+  if isinstance(data, bytes):
+    data = data.decode('utf-8')
+  return json.loads(data)
+
+
+def event_to_dict(event):
+  """
+  Every property of event - an Exchange2010CalendarEvent or an Exchange2010CalendarEventRecord - as a dict of
+  JSON types, ids and change key included.
+  """
+  organizer = event.organizer
+
+  result = {
+    u'id': event.id,
+    u'change_key': event.change_key,
+    u'calendar_id': getattr(event, u'calendar_id', None),
+    u'start': _format_datetime(event.start),
+    u'end': _format_datetime(event.end),
+    u'recurrence_end_date': _format_date(event.recurrence_end_date),
+    u'organizer': {u'name': organizer.name, u'email': organizer.email} if organizer is not None else None,
+    u'attendees': [_person_to_dict(attendee) for attendee in event.attendees],
+    u'resources': [_person_to_dict(resource) for resource in event.resources],
+    u'type': event.type,
+    u'conflicting_event_ids': list(event.conflicting_event_ids or []),
+    u'modified_occurrences': [_occurrence_to_dict(occurrence) for occurrence in event.modified_occurrences],
+    u'deleted_occurrences': [_format_datetime(occurrence) for occurrence in event.deleted_occurrences],
+  }
+
+  for name in PLAIN_PROPERTIES:
+    result[name] = getattr(event, name, None)
+
+  return result
+
+
+def event_properties(data):
+  """
+  The reverse of :func:`event_to_dict`: turns its output into the properties an event is built from, named as the
+  event keeps them - so type comes back as _type, attendees as the _attendees dict, and so on. id, change_key and
+  calendar_id are left to the caller.
+  """
+  properties = dict((name, data.get(name)) for name in PLAIN_PROPERTIES)
+
+  for name, attribute in PRIVATE_PROPERTIES.items():
+    properties[attribute] = data.get(name)
+
+  properties[u'start'] = _parse_datetime(data.get(u'start'))
+  properties[u'end'] = _parse_datetime(data.get(u'end'))
+  properties[u'recurrence_end_date'] = _parse_date(data.get(u'recurrence_end_date'))
+  properties[u'_conflicting_event_ids'] = list(properties[u'_conflicting_event_ids'] or [])
+  properties[u'_modified_occurrences'] = [_occurrence_from_dict(occurrence) for occurrence in data.get(u'modified_occurrences') or []]
+  properties[u'_deleted_occurrences'] = [_parse_datetime(occurrence) for occurrence in data.get(u'deleted_occurrences') or []]
+
+  organizer = data.get(u'organizer')
+  properties[u'organizer'] = ExchangeEventOrganizer(**organizer) if organizer is not None else None
+
+  for name in (u'attendees', u'resources'):
+    people = [_person_from_dict(person) for person in data.get(name) or []]
+    properties[u'_' + name] = dict((person.email, person) for person in people)
+
+  return properties
+
+
+def json_value(value):
+  """ value the way it's written out here - datetimes as UTC strings, dates as YYYY-MM-DD, anything else as it is. """
+  if isinstance(value, datetime):
+    return _format_datetime(value)
+  if isinstance(value, date):
+    return _format_date(value)
+  return value
+
+
+def iter_json_lines(events):
+  """ Yields each event as a line of JSON, newline included. """
+  for event in events:
+    yield dumps(event_to_dict(event)) + u'\n'
+
+
+def _person_to_dict(person):
+  return {
+    u'name': person.name,
+    u'email': person.email,
+    u'response': person.response,
+    u'last_response': _format_datetime(person.last_response),
+    u'required': person.required,
+  }
+
+
+def _person_from_dict(data):
+  return ExchangeEventResponse(
+    name=data.get(u'name'),
+    email=data.get(u'email'),
+    response=data.get(u'response'),
+    last_response=_parse_datetime(data.get(u'last_response')),
+    required=data.get(u'required', True),
+  )
+
+
+def _occurrence_to_dict(occurrence):
+  return {
+    u'id': occurrence.id,
+    u'change_key': occurrence.change_key,
+    u'start': _format_datetime(occurrence.start),
+    u'end': _format_datetime(occurrence.end),
+    u'original_start': _format_datetime(occurrence.original_start),
+  }
+
+
+def _occurrence_from_dict(data):
+  return ExchangeModifiedOccurrence(
+    id=data.get(u'id'),
+    change_key=data.get(u'change_key'),
+    start=_parse_datetime(data.get(u'start')),
+    end=_parse_datetime(data.get(u'end')),
+    original_start=_parse_datetime(data.get(u'original_start')),
+  )
+
+
+def _format_datetime(value):
+  if value is None:
+    return None
+  return convert_datetime_to_utc(value).strftime(DATETIME_FORMAT)
+
+
+def _parse_datetime(text):
+  if text is None:
+    return None
+  return utc.localize(datetime.strptime(text, DATETIME_FORMAT))
+
+
+def _format_date(value):
+  return value.strftime(DATE_FORMAT) if value is not None else None
+
+
+def _parse_date(text):
+  if text is None:
+    return None
+  return datetime.strptime(text, DATE_FORMAT).date()
@@ -15,3 +15,10 @@ def convert_datetime_to_utc(datetime_to_convert):
     return datetime_to_convert.astimezone(utc)
   else:
     return utc.localize(datetime_to_convert)
+
+
+def localize(tz, naive):
+  """ Attaches tz to a naive datetime - with localize() for pytz zones, so DST is right, or plain replace() otherwise. """
+  if hasattr(tz, u'localize'):
+    return tz.localize(naive)
+  return naive.replace(tzinfo=tz)
@@ -27,6 +27,10 @@ setup(
   include_package_data=True,
   packages=find_packages('.', exclude=['test*']),
   install_requires=['lxml', 'pytz', 'requests', 'requests-ntlm'],
+  extras_require={
+    'async': ['httpx', 'httpx-ntlm'],
+    'arrow': ['pyarrow'],
+  },
   classifiers=[
     'Development Status :: 4 - Beta',
     'Intended Audience :: Developers',
@@ -8,6 +8,9 @@ Unless required by applicable law or agreed to in writing, software?distributed
 from datetime import datetime, timedelta, date
 from pytz import utc
 from collections import namedtuple
+from threading import Lock
+from httpretty import HTTPretty
+from pyexchange.connection import ExchangeBaseConnection
 from pyexchange.base.calendar import ExchangeEventOrganizer, ExchangeEventResponse, RESPONSE_ACCEPTED, RESPONSE_DECLINED, RESPONSE_TENTATIVE, RESPONSE_UNKNOWN
 from pyexchange.exchange2010.soap_request import EXCHANGE_DATE_FORMAT, EXCHANGE_DATETIME_FORMAT  # noqa
 
@@ -589,6 +592,27 @@ GET_RECURRING_MASTER_DAILY_EVENT = u"""<s:Envelope xmlns:s="http://schemas.xmlso
   organizer=ORGANIZER,
 )
 
+# The daily master, with its second occurrence moved three hours later and its third deleted
+GET_RECURRING_MASTER_DAILY_EVENT_WITH_EXCEPTIONS = GET_RECURRING_MASTER_DAILY_EVENT.replace(u"""</t:Recurrence>""", u"""</t:Recurrence>
+              <t:ModifiedOccurrences>
+                <t:Occurrence>
+                  <t:ItemId Id="moved" ChangeKey="movedck"/>
+                  <t:Start>{moved_start:%Y-%m-%dT%H:%M:%SZ}</t:Start>
+                  <t:End>{moved_end:%Y-%m-%dT%H:%M:%SZ}</t:End>
+                  <t:OriginalStart>{second_start:%Y-%m-%dT%H:%M:%SZ}</t:OriginalStart>
+                </t:Occurrence>
+              </t:ModifiedOccurrences>
+              <t:DeletedOccurrences>
+                <t:DeletedOccurrence>
+                  <t:Start>{third_start:%Y-%m-%dT%H:%M:%SZ}</t:Start>
+                </t:DeletedOccurrence>
+              </t:DeletedOccurrences>""".format(
+  moved_start=TEST_RECURRING_EVENT_DAILY.start + timedelta(days=1, hours=3),
+  moved_end=TEST_RECURRING_EVENT_DAILY.end + timedelta(days=1, hours=3),
+  second_start=TEST_RECURRING_EVENT_DAILY.start + timedelta(days=1),
+  third_start=TEST_RECURRING_EVENT_DAILY.start + timedelta(days=2),
+))
+
 GET_RECURRING_MASTER_WEEKLY_EVENT = u"""<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
   <s:Header>
     <h:ServerVersionInfo xmlns:h="http://schemas.microsoft.com/exchange/services/2006/types" xmlns="http://schemas.microsoft.com/exchange/services/2006/types" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:xsd="http://www.w3.org/2001/XMLSchema" MajorVersion="14" MinorVersion="3" MajorBuildNumber="195" MinorBuildNumber="1"/>
@@ -1715,3 +1739,449 @@ LIST_EVENTS_RESPONSE = u"""<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/
     </m:FindItemResponse>
   </s:Body>
 </s:Envelope>"""
+
+LIST_EVENTS_PAGE_TEMPLATE = u"""<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+  <s:Body xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:xsd="http://www.w3.org/2001/XMLSchema">
+    <m:FindItemResponse xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages" xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">
+      <m:ResponseMessages>
+        <m:FindItemResponseMessage ResponseClass="Success">
+          <m:ResponseCode>NoError</m:ResponseCode>
+          <m:RootFolder TotalItemsInView="{count}" IncludesLastItemInRange="{includes_last}">
+            <t:Items>
+              {items}
+            </t:Items>
+          </m:RootFolder>
+        </m:FindItemResponseMessage>
+      </m:ResponseMessages>
+    </m:FindItemResponse>
+  </s:Body>
+</s:Envelope>"""
+
+LIST_EVENTS_PAGE_ITEM_TEMPLATE = u"""<t:CalendarItem>
+                <t:ItemId Id="{id}" ChangeKey="ck-{id}"/>
+                <t:Subject>Subject {id}</t:Subject>
+                <t:Start>{start}</t:Start>
+                <t:End>{end}</t:End>
+                <t:CalendarItemType>Single</t:CalendarItemType>
+              </t:CalendarItem>"""
+
+
+def list_events_page(items, includes_last=True):
+  """ Builds a FindItem CalendarView response out of (id, start, end) tuples. """
+  body = u''.join(
+    LIST_EVENTS_PAGE_ITEM_TEMPLATE.format(
+      id=id,
+      start=start.strftime(EXCHANGE_DATETIME_FORMAT),
+      end=end.strftime(EXCHANGE_DATETIME_FORMAT),
+    ) for id, start, end in items
+  )
+  return LIST_EVENTS_PAGE_TEMPLATE.format(count=len(items), includes_last=str(includes_last).lower(), items=body)
+
+
+GET_ITEMS_TEMPLATE = u"""<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+  <s:Body xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:xsd="http://www.w3.org/2001/XMLSchema">
+    <m:GetItemResponse xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages" xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">
+      <m:ResponseMessages>
+        {messages}
+      </m:ResponseMessages>
+    </m:GetItemResponse>
+  </s:Body>
+</s:Envelope>"""
+
+GET_ITEMS_MESSAGE_TEMPLATE = u"""<m:GetItemResponseMessage ResponseClass="Success">
+          <m:ResponseCode>NoError</m:ResponseCode>
+          <m:Items>
+            {item}
+          </m:Items>
+        </m:GetItemResponseMessage>"""
+
+
+def get_items_response(items):
+  """ Builds a GetItem response with one message per (id, start, end) tuple. """
+  messages = u''.join(
+    GET_ITEMS_MESSAGE_TEMPLATE.format(
+      item=LIST_EVENTS_PAGE_ITEM_TEMPLATE.format(
+        id=id,
+        start=start.strftime(EXCHANGE_DATETIME_FORMAT),
+        end=end.strftime(EXCHANGE_DATETIME_FORMAT),
+      )
+    ) for id, start, end in items
+  )
+  return GET_ITEMS_TEMPLATE.format(messages=messages)
+
+
+CONFLICTING_ITEM_TEMPLATE = u"""<t:CalendarItem>
+                <t:ItemId Id="{id}" ChangeKey="ck-{id}"/>
+                <t:Subject>Subject {id}</t:Subject>
+                <t:Start>{start}</t:Start>
+                <t:End>{end}</t:End>
+                <t:CalendarItemType>Single</t:CalendarItemType>
+                <t:ConflictingMeetings>
+                  {conflicts}
+                </t:ConflictingMeetings>
+              </t:CalendarItem>"""
+
+CONFLICT_TEMPLATE = u"""<t:CalendarItem>
+                    <t:ItemId Id="{id}" ChangeKey="ck-{id}"/>
+                  </t:CalendarItem>"""
+
+
+def details_response(items):
+  """ Builds a GetItem response out of (id, [conflicting ids]) tuples. """
+  messages = u''.join(
+    GET_ITEMS_MESSAGE_TEMPLATE.format(
+      item=CONFLICTING_ITEM_TEMPLATE.format(
+        id=id,
+        start=TEST_EVENT.start.strftime(EXCHANGE_DATETIME_FORMAT),
+        end=TEST_EVENT.end.strftime(EXCHANGE_DATETIME_FORMAT),
+        conflicts=u''.join(CONFLICT_TEMPLATE.format(id=conflict_id) for conflict_id in conflict_ids),
+      )
+    ) for id, conflict_ids in items
+  )
+  return GET_ITEMS_TEMPLATE.format(messages=messages)
+
+
+BULK_RESPONSE_TEMPLATE = u"""<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+  <s:Body xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:xsd="http://www.w3.org/2001/XMLSchema">
+    <m:{operation}Response xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages" xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">
+      <m:ResponseMessages>
+        {messages}
+      </m:ResponseMessages>
+    </m:{operation}Response>
+  </s:Body>
+</s:Envelope>"""
+
+BULK_RESPONSE_MESSAGE_TEMPLATE = u"""<m:{operation}ResponseMessage ResponseClass="{response_class}">
+          <m:ResponseCode>{code}</m:ResponseCode>
+          {items}
+        </m:{operation}ResponseMessage>"""
+
+BULK_RESPONSE_ITEM_TEMPLATE = u"""<m:Items>
+            <t:CalendarItem>
+              <t:ItemId Id="{id}" ChangeKey="{change_key}"/>
+            </t:CalendarItem>
+          </m:Items>"""
+
+
+def bulk_response(operation, results):
+  """
+  Builds a CreateItem/UpdateItem/GetItem/DeleteItem response with one message per result. A result is either an
+  (id, change_key) tuple, None for a success without items, or the name of an error ResponseCode.
+  """
+  messages = []
+  for result in results:
+    if isinstance(result, tuple):
+      code, items = u'NoError', BULK_RESPONSE_ITEM_TEMPLATE.format(id=result[0], change_key=result[1])
+    elif result is None:
+      code, items = u'NoError', u''
+    else:
+      code, items = result, u''
+
+    messages.append(BULK_RESPONSE_MESSAGE_TEMPLATE.format(
+      operation=operation,
+      response_class=u'Success' if code == u'NoError' else u'Error',
+      code=code,
+      items=items,
+    ))
+
+  return BULK_RESPONSE_TEMPLATE.format(operation=operation, messages=u''.join(messages))
+
+
+SERVER_BUSY_FAULT = u"""<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+  <s:Body>
+    <s:Fault>
+      <faultcode xmlns:a="http://schemas.microsoft.com/exchange/services/2006/types">a:ErrorServerBusy</faultcode>
+      <faultstring xml:lang="en-US">The server cannot service this request right now. Try again later.</faultstring>
+      <detail>
+        <e:ResponseCode xmlns:e="http://schemas.microsoft.com/exchange/services/2006/errors">ErrorServerBusy</e:ResponseCode>
+        <e:Message xmlns:e="http://schemas.microsoft.com/exchange/services/2006/errors">The server cannot service this request right now. Try again later.</e:Message>
+        <t:MessageXml xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">
+          <t:Value Name="BackOffMilliseconds">2500</t:Value>
+        </t:MessageXml>
+      </detail>
+    </s:Fault>
+  </s:Body>
+</s:Envelope>"""
+
+SERVER_BUSY_RESPONSE = u"""<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+  <s:Body xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:xsd="http://www.w3.org/2001/XMLSchema">
+    <m:GetItemResponse xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages" xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">
+      <m:ResponseMessages>
+        <m:GetItemResponseMessage ResponseClass="Error">
+          <m:MessageText>The server cannot service this request right now. Try again later.</m:MessageText>
+          <m:ResponseCode>ErrorServerBusy</m:ResponseCode>
+          <m:DescriptiveLinkKey>0</m:DescriptiveLinkKey>
+          <m:MessageXml>
+            <t:Value Name="BackOffMilliseconds">1500</t:Value>
+          </m:MessageXml>
+          <m:Items/>
+        </m:GetItemResponseMessage>
+      </m:ResponseMessages>
+    </m:GetItemResponse>
+  </s:Body>
+</s:Envelope>"""
+
+TRANSIENT_ERROR_RESPONSE = ITEM_DOES_NOT_EXIST.replace(u'ErrorItemNotFound', u'ErrorInternalServerTransientError')
+
+SYNC_FOLDER_ITEMS_RESPONSE = u"""<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+  <s:Body xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:xsd="http://www.w3.org/2001/XMLSchema">
+    <m:SyncFolderItemsResponse xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages" xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">
+      <m:ResponseMessages>
+        <m:SyncFolderItemsResponseMessage ResponseClass="Success">
+          <m:ResponseCode>NoError</m:ResponseCode>
+          <m:SyncState>{state}</m:SyncState>
+          <m:IncludesLastItemInRange>{includes_last}</m:IncludesLastItemInRange>
+          <m:Changes>
+            <t:Create>
+              <t:CalendarItem>
+                <t:ItemId Id="created1" ChangeKey="ck1"/>
+              </t:CalendarItem>
+            </t:Create>
+            <t:Update>
+              <t:CalendarItem>
+                <t:ItemId Id="updated1" ChangeKey="ck2"/>
+              </t:CalendarItem>
+            </t:Update>
+            <t:ReadFlagChange>
+              <t:ItemId Id="read1" ChangeKey="ck3"/>
+              <t:IsRead>true</t:IsRead>
+            </t:ReadFlagChange>
+            <t:Delete>
+              <t:ItemId Id="deleted1" ChangeKey="ck4"/>
+            </t:Delete>
+            <t:Create>
+              <t:CalendarItem>
+                <t:ItemId Id="created2" ChangeKey="ck5"/>
+              </t:CalendarItem>
+            </t:Create>
+          </m:Changes>
+        </m:SyncFolderItemsResponseMessage>
+      </m:ResponseMessages>
+    </m:SyncFolderItemsResponse>
+  </s:Body>
+</s:Envelope>"""
+
+
+SYNC_FOLDER_HIERARCHY_RESPONSE = u"""<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+  <s:Body xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:xsd="http://www.w3.org/2001/XMLSchema">
+    <m:SyncFolderHierarchyResponse xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages" xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">
+      <m:ResponseMessages>
+        <m:SyncFolderHierarchyResponseMessage ResponseClass="Success">
+          <m:ResponseCode>NoError</m:ResponseCode>
+          <m:SyncState>{state}</m:SyncState>
+          <m:IncludesLastFolderInRange>{includes_last}</m:IncludesLastFolderInRange>
+          <m:Changes>
+            <t:Create>
+              <t:CalendarFolder>
+                <t:FolderId Id="created1" ChangeKey="ck1"/>
+                <t:ParentFolderId Id="AABBCCDDEEFF" ChangeKey="AQAAAA=="/>
+                <t:FolderClass>IPF.Appointment</t:FolderClass>
+                <t:DisplayName>conference2</t:DisplayName>
+              </t:CalendarFolder>
+            </t:Create>
+            <t:Update>
+              <t:Folder>
+                <t:FolderId Id="updated1" ChangeKey="ck2"/>
+                <t:ParentFolderId Id="AABBCCDDEEFF" ChangeKey="AQAAAA=="/>
+                <t:DisplayName>classrooms</t:DisplayName>
+              </t:Folder>
+            </t:Update>
+            <t:Delete>
+              <t:FolderId Id="deleted1" ChangeKey="ck3"/>
+            </t:Delete>
+          </m:Changes>
+        </m:SyncFolderHierarchyResponseMessage>
+      </m:ResponseMessages>
+    </m:SyncFolderHierarchyResponse>
+  </s:Body>
+</s:Envelope>"""
+
+
+SUBSCRIBE_RESPONSE = u"""<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+  <s:Body xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:xsd="http://www.w3.org/2001/XMLSchema">
+    <m:SubscribeResponse xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages" xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">
+      <m:ResponseMessages>
+        <m:SubscribeResponseMessage ResponseClass="Success">
+          <m:ResponseCode>NoError</m:ResponseCode>
+          <m:SubscriptionId>{subscription_id}</m:SubscriptionId>
+          <m:Watermark>{watermark}</m:Watermark>
+        </m:SubscribeResponseMessage>
+      </m:ResponseMessages>
+    </m:SubscribeResponse>
+  </s:Body>
+</s:Envelope>"""
+
+SUBSCRIBE_STREAMING_RESPONSE = u"""<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+  <s:Body xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:xsd="http://www.w3.org/2001/XMLSchema">
+    <m:SubscribeResponse xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages" xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">
+      <m:ResponseMessages>
+        <m:SubscribeResponseMessage ResponseClass="Success">
+          <m:ResponseCode>NoError</m:ResponseCode>
+          <m:SubscriptionId>{subscription_id}</m:SubscriptionId>
+        </m:SubscribeResponseMessage>
+      </m:ResponseMessages>
+    </m:SubscribeResponse>
+  </s:Body>
+</s:Envelope>"""
+
+NOTIFICATION_EVENTS = u"""<t:CreatedEvent>
+            <t:Watermark>wm1</t:Watermark>
+            <t:TimeStamp>2013-07-01T10:00:00Z</t:TimeStamp>
+            <t:ItemId Id="created1" ChangeKey="ck1"/>
+            <t:ParentFolderId Id="calendar1" ChangeKey="fck"/>
+          </t:CreatedEvent>
+          <t:StatusEvent>
+            <t:Watermark>wm2</t:Watermark>
+          </t:StatusEvent>
+          <t:MovedEvent>
+            <t:Watermark>wm3</t:Watermark>
+            <t:TimeStamp>2013-07-01T10:05:00Z</t:TimeStamp>
+            <t:ItemId Id="moved1" ChangeKey="ck2"/>
+            <t:ParentFolderId Id="calendar2" ChangeKey="fck"/>
+            <t:OldItemId Id="moved0" ChangeKey="ck0"/>
+            <t:OldParentFolderId Id="calendar1" ChangeKey="fck"/>
+          </t:MovedEvent>"""
+
+GET_EVENTS_RESPONSE = u"""<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+  <s:Body xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:xsd="http://www.w3.org/2001/XMLSchema">
+    <m:GetEventsResponse xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages" xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">
+      <m:ResponseMessages>
+        <m:GetEventsResponseMessage ResponseClass="Success">
+          <m:ResponseCode>NoError</m:ResponseCode>
+          <m:Notification>
+            <t:SubscriptionId>sub1</t:SubscriptionId>
+            <t:PreviousWatermark>wm0</t:PreviousWatermark>
+            <t:MoreEvents>{more_events}</t:MoreEvents>
+            {events}
+          </m:Notification>
+        </m:GetEventsResponseMessage>
+      </m:ResponseMessages>
+    </m:GetEventsResponse>
+  </s:Body>
+</s:Envelope>"""
+
+GET_STREAMING_EVENTS_RESPONSE = u"""<?xml version="1.0" encoding="utf-8"?>
+<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+  <s:Body xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:xsd="http://www.w3.org/2001/XMLSchema">
+    <m:GetStreamingEventsResponse xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages" xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">
+      <m:ResponseMessages>
+        <m:GetStreamingEventsResponseMessage ResponseClass="Success">
+          <m:ResponseCode>NoError</m:ResponseCode>
+          <m:ConnectionStatus>{status}</m:ConnectionStatus>
+          <m:Notifications>
+            <m:Notification>
+              <t:SubscriptionId>sub1</t:SubscriptionId>
+              {events}
+            </m:Notification>
+          </m:Notifications>
+        </m:GetStreamingEventsResponseMessage>
+      </m:ResponseMessages>
+    </m:GetStreamingEventsResponse>
+  </s:Body>
+</s:Envelope>"""
+
+SUBSCRIPTION_EXPIRED_RESPONSE = u"""<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+  <s:Body xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:xsd="http://www.w3.org/2001/XMLSchema">
+    <m:GetEventsResponse xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages" xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">
+      <m:ResponseMessages>
+        <m:GetEventsResponseMessage ResponseClass="Error">
+          <m:MessageText>The specified subscription was not found.</m:MessageText>
+          <m:ResponseCode>ErrorSubscriptionNotFound</m:ResponseCode>
+          <m:DescriptiveLinkKey>0</m:DescriptiveLinkKey>
+        </m:GetEventsResponseMessage>
+      </m:ResponseMessages>
+    </m:GetEventsResponse>
+  </s:Body>
+</s:Envelope>"""
+
+UNSUBSCRIBE_RESPONSE = u"""<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+  <s:Body xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:xsd="http://www.w3.org/2001/XMLSchema">
+    <m:UnsubscribeResponse xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages" xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">
+      <m:ResponseMessages>
+        <m:UnsubscribeResponseMessage ResponseClass="Success">
+          <m:ResponseCode>NoError</m:ResponseCode>
+        </m:UnsubscribeResponseMessage>
+      </m:ResponseMessages>
+    </m:UnsubscribeResponse>
+  </s:Body>
+</s:Envelope>"""
+
+
+AVAILABILITY_TEMPLATE = u"""<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+  <s:Body xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:xsd="http://www.w3.org/2001/XMLSchema">
+    <GetUserAvailabilityResponse xmlns="http://schemas.microsoft.com/exchange/services/2006/messages">
+      <FreeBusyResponseArray>
+        {responses}
+      </FreeBusyResponseArray>
+    </GetUserAvailabilityResponse>
+  </s:Body>
+</s:Envelope>"""
+
+AVAILABILITY_RESPONSE_TEMPLATE = u"""<FreeBusyResponse>
+          <ResponseMessage ResponseClass="{response_class}">
+            <ResponseCode>{code}</ResponseCode>
+          </ResponseMessage>
+          <FreeBusyView>
+            <FreeBusyViewType xmlns="http://schemas.microsoft.com/exchange/services/2006/types">MergedOnly</FreeBusyViewType>
+            <MergedFreeBusy xmlns="http://schemas.microsoft.com/exchange/services/2006/types">{merged}</MergedFreeBusy>
+          </FreeBusyView>
+        </FreeBusyResponse>"""
+
+
+def availability_response(results):
+  """ A GetUserAvailability response. results has a MergedFreeBusy string, or an error code, for each mailbox. """
+  responses = []
+  for result in results:
+    if result.startswith(u'Error'):
+      responses.append(AVAILABILITY_RESPONSE_TEMPLATE.format(response_class=u'Error', code=result, merged=u''))
+    else:
+      responses.append(AVAILABILITY_RESPONSE_TEMPLATE.format(response_class=u'Success', code=u'NoError', merged=result))
+
+  return AVAILABILITY_TEMPLATE.format(responses=u''.join(responses))
+
+
+def register_responder(respond):
+  """
+  Answers every request to FAKE_EXCHANGE_URL with respond(request body). Returns the list the request bodies are
+  added to as they come in. Call it from an @httprettified test.
+  """
+  requests_sent = []
+
+  def next_response(request, uri, headers):
+    body = request.body.decode('utf-8')
+    requests_sent.append(body)
+    return 200, headers, respond(body).encode('utf-8')
+
+  HTTPretty.register_uri(HTTPretty.POST, FAKE_EXCHANGE_URL, body=next_response, content_type='text/xml; charset=utf-8')
+  return requests_sent
+
+
+def register_responses(*responses):
+  """ Replays responses in order, one per request. A list of strings is sent back to back in one response. """
+  responses = list(responses)
+
+  def respond(body):
+    response = responses.pop(0)
+    if isinstance(response, list):
+      response = u''.join(response)
+    return response
+
+  return register_responder(respond)
+
+
+class FakeConnection(ExchangeBaseConnection):
+  """
+  Answers each request with respond(request body), and keeps the bodies in requests_sent. Safe to call from many
+  threads at once, unlike HTTPretty.
+  """
+
+  def __init__(self, respond):
+    self.respond = respond
+    self.requests_sent = []
+    self.lock = Lock()
+
+  def send(self, body, headers=None, retries=2, timeout=30, encoding=u"utf-8"):
+    body = body.decode('utf-8')
+    with self.lock:
+      self.requests_sent.append(body)
+    return self.respond(body)
@@ -0,0 +1,363 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+import pytest
+from pytest import raises
+
+httpx = pytest.importorskip('httpx')
+pytest.importorskip('httpx_ntlm')
+
+from pyexchange.async_connection import AsyncExchangeNTLMAuthConnection  # noqa
+from pyexchange.cache import MemoryEventCache  # noqa
+from pyexchange.exchange2010 import soap_request  # noqa
+from pyexchange.exchange2010.async_service import AsyncExchange2010Service  # noqa
+from pyexchange.exceptions import *  # noqa
+from pyexchange.retry import RetryPolicy  # noqa
+
+from .fixtures import *  # noqa
+
+
+class Test_AsyncService(unittest.TestCase):
+
+  def setUp(self):
+    self.connection = AsyncExchangeNTLMAuthConnection(url=FAKE_EXCHANGE_URL, username=FAKE_EXCHANGE_USERNAME, password=FAKE_EXCHANGE_PASSWORD)
+    self.service = AsyncExchange2010Service(connection=self.connection)
+    self.requests_sent = []
+    self.headers_sent = []
+    self.responses = []
+
+  def _respond_with(self, *responses, **kwargs):
+    """ Answers each request with the next response - a body, or a (status code, body) pair. """
+    self.responses = list(responses)
+    status_code = kwargs.get('status_code', 200)
+
+    def handler(request):
+      self.requests_sent.append(request.content.decode('utf-8'))
+      self.headers_sent.append(request.headers)
+      response = self.responses.pop(0)
+      status, body = response if isinstance(response, tuple) else (status_code, response)
+      return httpx.Response(status, content=body.encode('utf-8'), headers={'Content-Type': 'text/xml; charset=utf-8'})
+
+    self.connection.client = httpx.AsyncClient(auth=self.connection.build_password_manager(), transport=httpx.MockTransport(handler))
+
+  def run_until_complete(self, coroutine):
+    async def run_and_close():
+      try:
+        return await coroutine
+      finally:
+        await self.service.close()
+
+    return asyncio.run(run_and_close())
+
+  def test_get_event(self):
+    self._respond_with(GET_ITEM_RESPONSE)
+
+    event = self.run_until_complete(self.service.calendar().get_event(id=TEST_EVENT.id))
+
+    assert event.id == TEST_EVENT.id
+    assert event.subject == TEST_EVENT.subject
+    assert event.organizer.email == ORGANIZER.email
+    assert len(event.attendees) == len(ATTENDEE_LIST)
+
+  def test_get_event_with_fields(self):
+    self._respond_with(GET_ITEM_RESPONSE)
+
+    event = self.run_until_complete(self.service.calendar().get_event(id=TEST_EVENT.id, fields=[u'subject', u'text_body']))
+
+    assert event.text_body == TEST_EVENT.body
+    assert u'<t:FieldURI FieldURI="item:Subject"/>' in self.requests_sent[0]
+    assert u'<t:BodyType>Text</t:BodyType>' in self.requests_sent[0]
+
+  def test_get_event_uses_the_event_cache(self):
+    cache = MemoryEventCache()
+    self.service = AsyncExchange2010Service(connection=self.connection, event_cache=cache)
+    self._respond_with(GET_ITEM_RESPONSE, GET_ITEM_RESPONSE_ID_ONLY)
+
+    async def get_twice():
+      await self.service.calendar().get_event(id=TEST_EVENT.id)
+      return await self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    event = self.run_until_complete(get_twice())
+
+    assert event.subject == TEST_EVENT.subject
+    assert cache.get(TEST_EVENT.id).change_key == TEST_EVENT.change_key
+    assert len(self.requests_sent) == 2
+    assert u'IdOnly' in self.requests_sent[1]
+
+  def test_updating_an_event_forgets_its_cached_copy(self):
+    cache = MemoryEventCache()
+    self.service = AsyncExchange2010Service(connection=self.connection, event_cache=cache)
+    self._respond_with(GET_ITEM_RESPONSE, GET_ITEM_RESPONSE_ID_ONLY, UPDATE_ITEM_RESPONSE)
+
+    async def update():
+      event = await self.service.calendar().get_event(id=TEST_EVENT.id)
+      event.location = TEST_EVENT_UPDATED.location
+      await event.update()
+
+    self.run_until_complete(update())
+
+    assert cache.get(TEST_EVENT.id) is None
+
+  def test_list_events(self):
+    self._respond_with(LIST_EVENTS_RESPONSE)
+
+    event_list = self.run_until_complete(self.service.calendar().list_events(start=TEST_EVENT_LIST_START, end=TEST_EVENT_LIST_END))
+
+    assert event_list.event_ids == [u'id1', u'id2', u'id3']
+    assert len(self.requests_sent) == 1
+
+  def test_list_events_with_details(self):
+    self._respond_with(
+      LIST_EVENTS_RESPONSE,
+      get_items_response([(u'id%s' % i, TEST_EVENT.start, TEST_EVENT.end) for i in (1, 2, 3)]),
+    )
+
+    event_list = self.run_until_complete(
+      self.service.calendar().list_events(start=TEST_EVENT_LIST_START, end=TEST_EVENT_LIST_END, details=True)
+    )
+
+    assert [event.id for event in event_list.events] == [u'id1', u'id2', u'id3']
+    assert event_list.events[0].start == TEST_EVENT.start
+    assert len(self.requests_sent) == 2
+
+  def test_create_event(self):
+    self._respond_with(CREATE_ITEM_RESPONSE)
+
+    event = self.service.calendar().new_event(
+      subject=TEST_EVENT.subject,
+      start=TEST_EVENT.start,
+      end=TEST_EVENT.end,
+    )
+    self.run_until_complete(event.create())
+
+    assert event.id == TEST_EVENT.id
+    assert TEST_EVENT.subject in self.requests_sent[-1]
+
+  def test_update_event(self):
+    self._respond_with(GET_ITEM_RESPONSE, GET_ITEM_RESPONSE_ID_ONLY, UPDATE_ITEM_RESPONSE)
+
+    async def update():
+      event = await self.service.calendar().get_event(id=TEST_EVENT.id)
+      event.location = TEST_EVENT_UPDATED.location
+      return await event.update()
+
+    event = self.run_until_complete(update())
+
+    assert TEST_EVENT_UPDATED.location in self.requests_sent[-1]
+    assert not event._dirty_attributes
+
+  def test_cancel_event(self):
+    self._respond_with(GET_ITEM_RESPONSE, GET_ITEM_RESPONSE_ID_ONLY, DELETE_ITEM_RESPONSE)
+
+    async def cancel():
+      event = await self.service.calendar().get_event(id=TEST_EVENT.id)
+      await event.cancel()
+
+    self.run_until_complete(cancel())
+
+    assert u'DeleteItem' in self.requests_sent[-1]
+
+  def test_find_folder(self):
+    self._respond_with(FIND_FOLDER_RESPONSE)
+
+    folders = self.run_until_complete(self.service.folder().find_folder(parent_id=TEST_FOLDER.id))
+
+    assert len(folders) == 4
+
+  def test_exchange_errors_are_raised(self):
+    self._respond_with(ITEM_DOES_NOT_EXIST)
+
+    with raises(ExchangeItemNotFoundException):
+      self.run_until_complete(self.service.calendar().get_event(id=TEST_EVENT.id))
+
+  def test_http_errors_are_raised(self):
+    self._respond_with(u'', status_code=500)
+
+    with raises(FailedExchangeException):
+      self.run_until_complete(self.service.calendar().get_event(id=TEST_EVENT.id))
+
+  def test_gateway_errors_are_retried_by_the_service(self):
+    self.service = AsyncExchange2010Service(connection=self.connection, retry_policy=RetryPolicy(base_delay=0.001))
+    self._respond_with((503, u''), (502, u''), GET_ITEM_RESPONSE)
+
+    event = self.run_until_complete(self.service.calendar().get_event(id=TEST_EVENT.id))
+
+    assert event.id == TEST_EVENT.id
+    assert len(self.requests_sent) == 3
+
+  def test_connection_retries_gateway_errors_on_its_own(self):
+    self.connection.retry_policy = RetryPolicy(base_delay=0.001)
+    self._respond_with((503, u''), (503, u''))
+
+    with raises(ExchangeTransientConnectionException):
+      self.run_until_complete(self.connection.send(b'yo', retries=1))
+
+    assert len(self.requests_sent) == 2
+
+  def test_soap_faults_in_server_errors_are_parsed(self):
+    self._respond_with((500, SERVER_BUSY_FAULT))
+
+    with raises(ExchangeServerBusyException):
+      self.run_until_complete(self.service.send(soap_request.get_item(exchange_id=TEST_EVENT.id), retries=0))
+
+  def test_events_cant_be_loaded_in_the_constructor(self):
+    with raises(TypeError):
+      self.service.calendar().event(id=TEST_EVENT.id)
+
+  def test_fan_out(self):
+    self._respond_with(LIST_EVENTS_RESPONSE, SOAP_FAULT)
+
+    async def list_events(service):
+      event_list = await service.calendar().list_events(start=TEST_EVENT_LIST_START, end=TEST_EVENT_LIST_END)
+      return event_list.event_ids
+
+    results = self.run_until_complete(self.service.fan_out([u'ann@example.com', u'bob@example.com'], list_events, max_workers=1))
+
+    assert results[u'ann@example.com'].result == [u'id1', u'id2', u'id3']
+    assert isinstance(results[u'bob@example.com'].error, FailedExchangeException)
+    assert (results.stats.succeeded, results.stats.failed) == (1, 1)
+    assert u'<t:PrimarySmtpAddress>bob@example.com</t:PrimarySmtpAddress>' in self.requests_sent[1]
+
+  def test_fan_out_needs_workers(self):
+    async def nothing(service):
+      return None
+
+    with raises(ValueError):
+      self.run_until_complete(self.service.fan_out([u'bob@example.com'], nothing, max_workers=0))
+
+  def test_availability(self):
+    self._respond_with(availability_response([u'0220']))
+
+    start = datetime(2030, 5, 2, 9, tzinfo=utc)
+    result = self.run_until_complete(self.service.availability([u'room1@example.com'], start, start + timedelta(hours=2)))
+
+    half_hour = timedelta(minutes=30)
+    assert result[u'room1@example.com'].busy == [(start + half_hour, start + 3 * half_hour)]
+
+  def test_send_passes_headers_on(self):
+    self._respond_with(GET_ITEM_RESPONSE)
+
+    self.run_until_complete(self.service.send(soap_request.get_item(exchange_id=TEST_EVENT.id), headers={u'X-AnchorMailbox': u'bob@example.com'}))
+
+    assert self.headers_sent[0][u'X-AnchorMailbox'] == u'bob@example.com'
+    assert self.headers_sent[0][u'Content-Type'].startswith(u'text/xml')
+
+  def test_send_batch_passes_headers_on(self):
+    self._respond_with(bulk_response(u'GetItem', [(TEST_EVENT.id, TEST_EVENT.change_key)]))
+
+    self.run_until_complete(self.service.send_batch(soap_request.get_item(exchange_id=TEST_EVENT.id), headers={u'X-AnchorMailbox': u'bob@example.com'}))
+
+    assert self.headers_sent[0][u'X-AnchorMailbox'] == u'bob@example.com'
+
+  def test_send_batch_returns_failed_messages_too(self):
+    self._respond_with(bulk_response(u'GetItem', [(u'id1', u'ck1'), u'ErrorItemNotFound']))
+
+    messages = self.run_until_complete(self.service.send_batch(soap_request.get_item(exchange_id=[u'id1', u'id2'], format=u'IdOnly')))
+
+    assert [message.get(u'ResponseClass') for message in messages] == [u'Success', u'Error']
+
+  def test_conflict_graph(self):
+    self._respond_with(
+      list_events_page([(id, TEST_EVENT.start, TEST_EVENT.end) for id in (u'a', u'b')]),
+      details_response([(u'a', [u'x']), (u'b', [])]),
+      get_items_response([(u'x', TEST_EVENT.start, TEST_EVENT.end)]),
+    )
+
+    async def conflict_graph():
+      event_list = await self.service.calendar().list_events(start=TEST_EVENT_LIST_START, end=TEST_EVENT_LIST_END, details=True)
+      return await event_list.conflict_graph()
+
+    graph = self.run_until_complete(conflict_graph())
+
+    assert [event.id for event in graph.conflicts(u'a')] == [u'x']
+    assert len(self.requests_sent) == 3
+
+  def test_move_event(self):
+    self._respond_with(GET_ITEM_RESPONSE, GET_ITEM_RESPONSE_ID_ONLY, MOVE_EVENT_RESPONSE)
+
+    async def move():
+      event = await self.service.calendar().get_event(id=TEST_EVENT.id)
+      return await event.move_to(u'AABBCCDDEEFFGG==')
+
+    event = self.run_until_complete(move())
+
+    assert event.id == TEST_EVENT_MOVED.id
+    assert event.calendar_id == u'AABBCCDDEEFFGG=='
+
+  def test_resend_invitations(self):
+    self._respond_with(GET_ITEM_RESPONSE, GET_ITEM_RESPONSE_ID_ONLY, UPDATE_ITEM_RESPONSE)
+
+    async def resend():
+      event = await self.service.calendar().get_event(id=TEST_EVENT.id)
+      await event.resend_invitations()
+
+    self.run_until_complete(resend())
+
+    assert u'SendOnlyToAll' in self.requests_sent[-1]
+
+  def test_get_master_and_occurrence(self):
+    self._respond_with(GET_EVENT_OCCURRENCE, GET_RECURRING_MASTER_DAILY_EVENT, GET_DAILY_OCCURRENCES)
+
+    async def master_and_occurrences():
+      event = await self.service.calendar().get_event(id=TEST_EVENT_DAILY_OCCURRENCES[0].id)
+      master = await event.get_master()
+      return master, await master.get_occurrence(range(len(TEST_EVENT_DAILY_OCCURRENCES)))
+
+    master, occurrences = self.run_until_complete(master_and_occurrences())
+
+    assert master.id == TEST_RECURRING_EVENT_DAILY.id
+    assert [occurrence.id for occurrence in occurrences] == [occurrence.id for occurrence in TEST_EVENT_DAILY_OCCURRENCES[:len(occurrences)]]
+    assert isinstance(occurrences[0], master.__class__)
+
+  def test_conflicting_events(self):
+    self._respond_with(GET_ITEM_RESPONSE, CONFLICTING_EVENTS_RESPONSE)
+
+    async def conflicting_events():
+      event = await self.service.calendar().get_event(id=TEST_EVENT.id)
+      return await event.conflicting_events()
+
+    conflicting_events = self.run_until_complete(conflicting_events())
+
+    assert [event.id for event in conflicting_events] == [TEST_CONFLICT_EVENT.id]
+
+  def test_folders(self):
+    self._respond_with(GET_FOLDER_RESPONSE, MOVE_FOLDER_RESPONSE, DELETE_FOLDER_RESPONSE)
+
+    async def move_and_delete():
+      folder = await self.service.folder().get_folder(id=TEST_FOLDER.id)
+      await folder.move_to(u'AABBCCDDEEFFGG==')
+      parent_id = folder.parent_id
+      await folder.delete()
+      return parent_id, folder
+
+    parent_id, folder = self.run_until_complete(move_and_delete())
+
+    assert parent_id == u'AABBCCDDEEFFGG=='
+    assert folder.id is None
+    assert u'DeleteFolder' in self.requests_sent[-1]
+
+  def test_folders_cant_be_loaded_in_the_constructor(self):
+    with raises(TypeError):
+      self.service.folder().folder(id=TEST_FOLDER.id)
+
+  def test_blocking_only_operations_are_not_exposed(self):
+    for obj, name in [
+      (self.service, u'send_streaming'),
+      (self.service, u'subscribe'),
+      (self.service, u'get_events'),
+      (self.service.calendar(), u'sync'),
+      (self.service.calendar(), u'iter_events'),
+      (self.service.calendar(), u'bulk_create'),
+      (self.service.calendar(), u'bulk_update'),
+      (self.service.calendar(), u'bulk_cancel'),
+      (self.service.calendar(), u'get_masters'),
+      (self.service.calendar(), u'get_occurrences'),
+      (self.service.folder(), u'sync_hierarchy'),
+    ]:
+      assert not hasattr(obj, name), name
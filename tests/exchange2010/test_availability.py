@@ -0,0 +1,95 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import unittest
+from datetime import datetime, timedelta
+from httpretty import httprettified
+from pytest import raises
+from pytz import utc
+from pyexchange import Exchange2010Service
+from pyexchange.connection import ExchangeNTLMAuthConnection
+from pyexchange.exceptions import *  # noqa
+
+from .fixtures import *  # noqa
+
+START = datetime(year=2050, month=5, day=20, hour=9, tzinfo=utc)
+END = START + timedelta(hours=4)
+
+
+class Test_Availability(unittest.TestCase):
+  service = None
+
+  @classmethod
+  def setUpClass(cls):
+    cls.service = Exchange2010Service(
+      connection=ExchangeNTLMAuthConnection(
+        url=FAKE_EXCHANGE_URL,
+        username=FAKE_EXCHANGE_USERNAME,
+        password=FAKE_EXCHANGE_PASSWORD
+      )
+    )
+
+  @httprettified
+  def test_busy_slots_are_merged_into_intervals(self):
+    self.requests_sent = register_responses(availability_response([u'02200130']))
+
+    result = self.service.availability([u'room1@example.com'], START, END, interval=30)
+
+    half_hour = timedelta(minutes=30)
+    assert result[u'room1@example.com'].busy == [
+      (START + half_hour, START + 3 * half_hour),
+      (START + 5 * half_hour, START + 7 * half_hour),
+    ]
+    assert result[u'room1@example.com'].error is None
+
+  @httprettified
+  def test_free_mailboxes_have_no_busy_time(self):
+    self.requests_sent = register_responses(availability_response([u'00004444']))
+
+    result = self.service.availability([u'room1@example.com'], START, END)
+
+    assert result[u'room1@example.com'].busy == []
+
+  @httprettified
+  def test_sends_the_window_and_interval(self):
+    self.requests_sent = register_responses(availability_response([u'0000']))
+
+    self.service.availability([RESOURCE], START, END, interval=60)
+
+    request = self.requests_sent[0]
+    assert u'<t:Address>%s</t:Address>' % RESOURCE.email in request
+    assert u'<t:StartTime>2050-05-20T09:00:00</t:StartTime>' in request
+    assert u'<t:MergedFreeBusyIntervalInMinutes>60</t:MergedFreeBusyIntervalInMinutes>' in request
+
+  @httprettified
+  def test_large_lists_are_chunked(self):
+    emails = [u'room%s@example.com' % i for i in range(150)]
+    self.requests_sent = register_responses(availability_response([u'0'] * 100), availability_response([u'2'] * 50))
+
+    result = self.service.availability(emails, START, END)
+
+    assert len(self.requests_sent) == 2
+    assert self.requests_sent[0].count(u'<t:MailboxData>') == 100
+    assert result[u'room0@example.com'].busy == []
+    assert result[u'room149@example.com'].busy == [(START, START + timedelta(minutes=30))]
+
+  @httprettified
+  def test_mailbox_errors_are_reported_per_mailbox(self):
+    self.requests_sent = register_responses(availability_response([u'ErrorMailRecipientNotFound', u'2']))
+
+    result = self.service.availability([u'nobody@example.com', u'room1@example.com'], START, END)
+
+    assert result[u'nobody@example.com'].busy is None
+    assert isinstance(result[u'nobody@example.com'].error, FailedExchangeException)
+    assert result[u'room1@example.com'].busy
+
+  def test_interval_must_be_in_range(self):
+    with raises(ValueError):
+      self.service.availability([u'room1@example.com'], START, END, interval=1)
+
+  def test_end_must_come_after_start(self):
+    with raises(ValueError):
+      self.service.availability([u'room1@example.com'], END, START)
@@ -0,0 +1,222 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import unittest
+from collections import OrderedDict
+from httpretty import httprettified
+from lxml import etree
+from pytest import raises
+from pyexchange import Exchange2010Service
+from pyexchange.connection import ExchangeNTLMAuthConnection
+from pyexchange.exchange2010 import soap_request
+from pyexchange.exceptions import *  # noqa
+
+from .fixtures import *  # noqa
+
+
+class Test_BulkEventOperations(unittest.TestCase):
+  service = None
+
+  @classmethod
+  def setUpClass(cls):
+    cls.service = Exchange2010Service(
+      connection=ExchangeNTLMAuthConnection(
+        url=FAKE_EXCHANGE_URL,
+        username=FAKE_EXCHANGE_USERNAME,
+        password=FAKE_EXCHANGE_PASSWORD
+      )
+    )
+
+  def _new_events(self, count, **properties):
+    return [
+      self.service.calendar().new_event(subject=u'event %s' % i, start=TEST_EVENT.start, end=TEST_EVENT.end, **properties)
+      for i in range(count)
+    ]
+
+  def _created_events(self, count):
+    events = self._new_events(count)
+    for i, event in enumerate(events):
+      event._id, event._change_key = u'id%s' % i, u'old%s' % i
+      event._reset_dirty_attributes()
+    return events
+
+  @httprettified
+  def test_bulk_create_sends_one_request(self):
+    self.requests_sent = register_responses(bulk_response(u'CreateItem', [(u'id0', u'ck0'), (u'id1', u'ck1'), (u'id2', u'ck2')]))
+    events = self._new_events(3)
+
+    errors = self.service.calendar().bulk_create(events)
+
+    assert errors == [None, None, None]
+    assert [(event.id, event.change_key) for event in events] == [(u'id0', u'ck0'), (u'id1', u'ck1'), (u'id2', u'ck2')]
+    assert len(self.requests_sent) == 1
+    assert self.requests_sent[0].count(u'<t:CalendarItem>') == 3
+
+  @httprettified
+  def test_bulk_create_chunks_requests(self):
+    self.requests_sent = register_responses(
+      bulk_response(u'CreateItem', [(u'id0', u'ck0'), (u'id1', u'ck1')]),
+      bulk_response(u'CreateItem', [(u'id2', u'ck2')]),
+    )
+    events = self._new_events(3)
+
+    self.service.calendar().bulk_create(events, chunk_size=2)
+
+    assert [event.id for event in events] == [u'id0', u'id1', u'id2']
+    assert len(self.requests_sent) == 2
+
+  @httprettified
+  def test_bulk_create_groups_events_by_calendar(self):
+    self.requests_sent = register_responses(
+      bulk_response(u'CreateItem', [(u'id0', u'ck0'), (u'id2', u'ck2')]),
+      bulk_response(u'CreateItem', [(u'id1', u'ck1')]),
+    )
+    events = self._new_events(3)
+    events[1].calendar_id = TEST_FOLDER.id
+
+    self.service.calendar().bulk_create(events)
+
+    assert [event.id for event in events] == [u'id0', u'id1', u'id2']
+    assert TEST_FOLDER.id in self.requests_sent[1]
+
+  @httprettified
+  def test_bulk_create_reports_errors_per_event(self):
+    self.requests_sent = register_responses(bulk_response(u'CreateItem', [(u'id0', u'ck0'), u'ErrorCalendarInvalidRecurrence']))
+    events = self._new_events(2)
+
+    errors = self.service.calendar().bulk_create(events)
+
+    assert errors[0] is None
+    assert isinstance(errors[1], FailedExchangeException)
+    assert events[1].id is None
+
+  def test_bulk_create_validates_before_sending(self):
+    events = self._new_events(2)
+    events[1].start = None
+
+    with raises(ValueError):
+      self.service.calendar().bulk_create(events)
+
+  @httprettified
+  def test_bulk_update_refreshes_change_keys_once_per_chunk(self):
+    self.requests_sent = register_responses(
+      bulk_response(u'GetItem', [(u'id0', u'fresh0'), (u'id1', u'fresh1')]),
+      bulk_response(u'UpdateItem', [(u'id0', u'new0'), (u'id1', u'new1')]),
+    )
+    events = self._created_events(2)
+    for event in events:
+      event.location = TEST_EVENT_UPDATED.location
+
+    errors = self.service.calendar().bulk_update(events)
+
+    assert errors == [None, None]
+    assert len(self.requests_sent) == 2
+    assert u'ChangeKey="fresh0"' in self.requests_sent[1]
+    assert self.requests_sent[1].count(TEST_EVENT_UPDATED.location) == 2
+    assert [event.change_key for event in events] == [u'new0', u'new1']
+    assert not any(event._dirty_attributes for event in events)
+
+  @httprettified
+  def test_bulk_update_skips_events_that_are_missing(self):
+    self.requests_sent = register_responses(
+      bulk_response(u'GetItem', [u'ErrorItemNotFound', (u'id1', u'fresh1')]),
+      bulk_response(u'UpdateItem', [(u'id1', u'new1')]),
+    )
+    events = self._created_events(2)
+    for event in events:
+      event.location = TEST_EVENT_UPDATED.location
+
+    errors = self.service.calendar().bulk_update(events)
+
+    assert isinstance(errors[0], ExchangeItemNotFoundException)
+    assert errors[1] is None
+    assert u'id0' not in self.requests_sent[1]
+    assert events[0]._dirty_attributes
+
+  @httprettified
+  def test_bulk_update_ignores_unchanged_events(self):
+    self.requests_sent = register_responses()
+    events = self._created_events(2)
+
+    assert self.service.calendar().bulk_update(events) == [None, None]
+    assert self.requests_sent == []
+
+  @httprettified
+  def test_bulk_cancel(self):
+    self.requests_sent = register_responses(
+      bulk_response(u'GetItem', [(u'id0', u'fresh0'), (u'id1', u'fresh1')]),
+      bulk_response(u'DeleteItem', [None, u'ErrorItemNotFound']),
+    )
+    events = self._created_events(2)
+
+    errors = self.service.calendar().bulk_cancel(events)
+
+    assert errors[0] is None
+    assert isinstance(errors[1], ExchangeItemNotFoundException)
+    assert self.requests_sent[1].count(u'ChangeKey="fresh') == 2
+
+  def test_bulk_cancel_needs_created_events(self):
+    with raises(TypeError):
+      self.service.calendar().bulk_cancel(self._new_events(1))
+
+  @httprettified
+  def test_mismatched_responses_are_raised(self):
+    self.requests_sent = register_responses(bulk_response(u'CreateItem', [(u'id0', u'ck0')]))
+
+    with raises(FailedExchangeException):
+      self.service.calendar().bulk_create(self._new_events(2))
+
+  @httprettified
+  def test_soap_faults_are_raised(self):
+    self.requests_sent = register_responses(SOAP_FAULT)
+
+    with raises(FailedExchangeException):
+      self.service.calendar().bulk_create(self._new_events(1))
+
+  @httprettified
+  def test_get_masters_sends_one_request(self):
+    self.requests_sent = register_responses(bulk_response(u'GetItem', [(u'master0', u'ck0'), u'ErrorItemNotFound', (u'master0', u'ck0')]))
+
+    masters = self.service.calendar().get_masters([u'occ0', u'occ1', u'occ2'])
+
+    assert [master.id for master in (masters[0], masters[2])] == [u'master0', u'master0']
+    assert isinstance(masters[1], ExchangeItemNotFoundException)
+    assert len(self.requests_sent) == 1
+    assert self.requests_sent[0].count(u'<t:RecurringMasterItemId') == 3
+    assert u'OccurrenceId="occ1"' in self.requests_sent[0]
+
+  def test_get_masters_needs_occurrences(self):
+    with raises(InvalidEventType):
+      self.service.calendar().get_masters(self._created_events(1))
+
+  @httprettified
+  def test_get_occurrences_maps_results_back_per_master(self):
+    self.requests_sent = register_responses(
+      bulk_response(u'GetItem', [(u'a1', u'ck'), (u'a2', u'ck'), u'ErrorCalendarOccurrenceIndexIsOutOfRecurrenceRange']),
+      bulk_response(u'GetItem', [(u'b1', u'ck'), u'ErrorItemNotFound']),
+    )
+
+    occurrences = self.service.calendar().get_occurrences(OrderedDict([
+      (u'master_a', [1, 2, 3]),
+      (u'master_b', [1]),
+      (u'master_c', [1]),
+    ]), chunk_size=3)
+
+    assert [event.id for event in occurrences[u'master_a']] == [u'a1', u'a2']
+    assert [event.id for event in occurrences[u'master_b']] == [u'b1']
+    assert isinstance(occurrences[u'master_c'], ExchangeItemNotFoundException)
+    assert len(self.requests_sent) == 2
+    assert u'RecurringMasterId="master_b" InstanceIndex="1"' in self.requests_sent[1]
+
+  def test_get_occurrences_needs_int_indexes(self):
+    with raises(TypeError):
+      self.service.calendar().get_occurrences({u'master': [u'1']})
+
+  def test_masters_and_occurrences_can_share_a_request(self):
+    xml = etree.tostring(soap_request.get_recurring_items([u'occ0', (u'master0', 4)])).decode('utf-8')
+
+    assert u'<t:RecurringMasterItemId OccurrenceId="occ0"/>' in xml
+    assert u'<t:OccurrenceItemId RecurringMasterId="master0" InstanceIndex="4"/>' in xml
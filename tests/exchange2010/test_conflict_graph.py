@@ -0,0 +1,106 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import unittest
+from httpretty import httprettified
+from pytest import raises
+from pyexchange import Exchange2010Service
+from pyexchange.connection import ExchangeNTLMAuthConnection
+
+from .fixtures import *  # noqa
+
+
+class Test_ConflictGraph(unittest.TestCase):
+  service = None
+
+  @classmethod
+  def setUpClass(cls):
+    cls.service = Exchange2010Service(
+      connection=ExchangeNTLMAuthConnection(
+        url=FAKE_EXCHANGE_URL,
+        username=FAKE_EXCHANGE_USERNAME,
+        password=FAKE_EXCHANGE_PASSWORD
+      )
+    )
+
+  def _list_events(self, items):
+    """ Lists events with details - the listing and the GetItem for the details are the first two responses. """
+    return [
+      list_events_page([(id, TEST_EVENT.start, TEST_EVENT.end) for id, _ in items]),
+      details_response(items),
+    ]
+
+  @httprettified
+  def test_shared_conflicts_are_loaded_once(self):
+    items = [(u'a', [u'x', u'y']), (u'b', [u'x']), (u'c', [])]
+    self.requests_sent = register_responses(
+      *self._list_events(items) + [get_items_response([(u'x', TEST_EVENT.start, TEST_EVENT.end), (u'y', TEST_EVENT.start, TEST_EVENT.end)])]
+    )
+
+    event_list = self.service.calendar().list_events(start=TEST_EVENT_LIST_START, end=TEST_EVENT_LIST_END, details=True)
+    graph = event_list.conflict_graph()
+
+    assert len(self.requests_sent) == 3
+    assert self.requests_sent[2].count(u'<t:ItemId') == 2
+
+    assert graph.adjacency == {
+      u'a': set([u'x', u'y']), u'b': set([u'x']), u'c': set(), u'x': set([u'a', u'b']), u'y': set([u'a']),
+    }
+    assert [event.id for event in graph.conflicts(u'a')] == [u'x', u'y']
+    assert [event.id for event in graph.conflicts(u'x')] == [u'a', u'b']
+    assert graph.events[u'y'].subject == u'Subject y'
+    assert sorted(graph.conflicting_ids()) == [u'a', u'b', u'x', u'y']
+
+  @httprettified
+  def test_conflicts_within_the_list_are_not_fetched(self):
+    self.requests_sent = register_responses(*self._list_events([(u'a', [u'b']), (u'b', [u'a'])]))
+
+    event_list = self.service.calendar().list_events(start=TEST_EVENT_LIST_START, end=TEST_EVENT_LIST_END, details=True)
+    graph = event_list.conflict_graph()
+
+    assert len(self.requests_sent) == 2
+    assert graph.conflicts(u'a') == [event_list.events[1]]
+
+  @httprettified
+  def test_conflicts_are_fetched_in_batches(self):
+    self.requests_sent = register_responses(*self._list_events([(u'a', [u'x', u'y', u'z'])]) + [
+      get_items_response([(u'x', TEST_EVENT.start, TEST_EVENT.end), (u'y', TEST_EVENT.start, TEST_EVENT.end)]),
+      get_items_response([(u'z', TEST_EVENT.start, TEST_EVENT.end)]),
+    ])
+
+    event_list = self.service.calendar().list_events(start=TEST_EVENT_LIST_START, end=TEST_EVENT_LIST_END, details=True)
+    graph = event_list.conflict_graph(batch_size=2)
+
+    assert len(self.requests_sent) == 4
+    assert sorted(graph.events) == [u'a', u'x', u'y', u'z']
+
+  @httprettified
+  def test_conflicts_that_cannot_be_loaded_have_no_event(self):
+    self.requests_sent = register_responses(*self._list_events([(u'a', [u'gone'])]) + [bulk_response(u'GetItem', [u'ErrorItemNotFound'])])
+
+    event_list = self.service.calendar().list_events(start=TEST_EVENT_LIST_START, end=TEST_EVENT_LIST_END, details=True)
+    graph = event_list.conflict_graph()
+
+    assert graph.adjacency[u'a'] == set([u'gone'])
+    assert graph.conflicts(u'a') == []
+
+  @httprettified
+  def test_read_only_lists_give_records(self):
+    self.requests_sent = register_responses(*self._list_events([(u'a', [u'x'])]) + [get_items_response([(u'x', TEST_EVENT.start, TEST_EVENT.end)])])
+
+    event_list = self.service.calendar().list_events(start=TEST_EVENT_LIST_START, end=TEST_EVENT_LIST_END, details=True, read_only=True)
+    graph = event_list.conflict_graph()
+
+    assert type(graph.events[u'x']).__name__ == u'Exchange2010CalendarEventRecord'
+
+  @httprettified
+  def test_batch_size_must_be_positive(self):
+    self.requests_sent = register_responses(*self._list_events([(u'a', [u'x'])]))
+
+    event_list = self.service.calendar().list_events(start=TEST_EVENT_LIST_START, end=TEST_EVENT_LIST_END, details=True)
+
+    with raises(ValueError):
+      event_list.conflict_graph(batch_size=-1)
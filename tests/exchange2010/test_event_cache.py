@@ -0,0 +1,111 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import unittest
+from httpretty import httprettified
+from pytest import raises
+from pyexchange import Exchange2010Service
+from pyexchange.cache import MemoryEventCache
+from pyexchange.connection import ExchangeNTLMAuthConnection
+from pyexchange.exceptions import *  # noqa
+
+from .fixtures import *  # noqa
+
+
+class Test_EventCache(unittest.TestCase):
+
+  def setUp(self):
+    self.now = 0.0
+    self.cache = MemoryEventCache(clock=lambda: self.now)
+    self.service = Exchange2010Service(
+      connection=ExchangeNTLMAuthConnection(
+        url=FAKE_EXCHANGE_URL,
+        username=FAKE_EXCHANGE_USERNAME,
+        password=FAKE_EXCHANGE_PASSWORD
+      ),
+      event_cache=self.cache,
+    )
+
+  @httprettified
+  def test_first_get_caches_the_event(self):
+    self.requests_sent = register_responses(GET_ITEM_RESPONSE)
+
+    event = self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    assert event.subject == TEST_EVENT.subject
+    assert self.cache.get(TEST_EVENT.id).change_key == TEST_EVENT.change_key
+
+  @httprettified
+  def test_unchanged_events_are_revalidated_with_an_id_only_request(self):
+    self.requests_sent = register_responses(GET_ITEM_RESPONSE, GET_ITEM_RESPONSE_ID_ONLY)
+    self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    event = self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    assert event.subject == TEST_EVENT.subject
+    assert event.organizer.email == ORGANIZER.email
+    assert len(self.requests_sent) == 2
+    assert u'IdOnly' in self.requests_sent[1]
+
+  @httprettified
+  def test_changed_events_are_fetched_again(self):
+    stale_id_only = GET_ITEM_RESPONSE_ID_ONLY.replace(TEST_EVENT.change_key, u'newchangekey')
+    self.requests_sent = register_responses(GET_ITEM_RESPONSE, stale_id_only, GET_ITEM_RESPONSE)
+    self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    assert len(self.requests_sent) == 3
+    assert u'AllProperties' in self.requests_sent[2]
+
+  @httprettified
+  def test_fresh_events_are_served_without_asking(self):
+    self.cache.revalidate_after = 60
+    self.requests_sent = register_responses(GET_ITEM_RESPONSE)
+    self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    self.now = 30
+    self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    assert len(self.requests_sent) == 1
+
+  @httprettified
+  def test_deleted_events_are_dropped(self):
+    self.requests_sent = register_responses(GET_ITEM_RESPONSE, ITEM_DOES_NOT_EXIST)
+    self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    with raises(ExchangeItemNotFoundException):
+      self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    assert self.cache.get(TEST_EVENT.id) is None
+
+  @httprettified
+  def test_update_invalidates(self):
+    self.requests_sent = register_responses(GET_ITEM_RESPONSE, GET_ITEM_RESPONSE_ID_ONLY, UPDATE_ITEM_RESPONSE)
+    event = self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    event.location = TEST_EVENT_UPDATED.location
+    event.update()
+
+    assert self.cache.get(TEST_EVENT.id) is None
+
+  @httprettified
+  def test_cancel_invalidates(self):
+    self.requests_sent = register_responses(GET_ITEM_RESPONSE, GET_ITEM_RESPONSE_ID_ONLY, DELETE_ITEM_RESPONSE)
+    event = self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    event.cancel()
+
+    assert self.cache.get(TEST_EVENT.id) is None
+
+  @httprettified
+  def test_move_invalidates_the_old_id(self):
+    self.requests_sent = register_responses(GET_ITEM_RESPONSE, GET_ITEM_RESPONSE_ID_ONLY, MOVE_EVENT_RESPONSE)
+    event = self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    event.move_to(TEST_FOLDER.id)
+
+    assert self.cache.get(TEST_EVENT.id) is None
@@ -0,0 +1,79 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import unittest
+from datetime import timedelta
+from httpretty import HTTPretty, httprettified
+from pytest import raises
+from pyexchange import Exchange2010Service
+from pyexchange.connection import ExchangeNTLMAuthConnection
+
+from .fixtures import *  # noqa
+
+HOUR = timedelta(hours=1)
+
+
+class Test_EventListTimeQueries(unittest.TestCase):
+  service = None
+
+  @classmethod
+  def setUpClass(cls):
+    cls.service = Exchange2010Service(
+      connection=ExchangeNTLMAuthConnection(
+        url=FAKE_EXCHANGE_URL,
+        username=FAKE_EXCHANGE_USERNAME,
+        password=FAKE_EXCHANGE_PASSWORD
+      )
+    )
+
+  @httprettified
+  def setUp(self):
+    start = TEST_EVENT.start
+    HTTPretty.register_uri(
+      HTTPretty.POST, FAKE_EXCHANGE_URL,
+      body=list_events_page([
+        (u'a', start, start + 2 * HOUR),
+        (u'b', start + HOUR, start + 3 * HOUR),
+        (u'c', start + 4 * HOUR, start + 5 * HOUR),
+      ]),
+      content_type='text/xml; charset=utf-8',
+    )
+    self.start = start
+    self.event_list = self.service.calendar().list_events(start=start - HOUR, end=start + 6 * HOUR)
+
+  def test_overlapping(self):
+    assert [event.id for event in self.event_list.overlapping(self.start + 2 * HOUR, self.start + 5 * HOUR)] == [u'b', u'c']
+
+  def test_at(self):
+    assert [event.id for event in self.event_list.at(self.start + 90 * timedelta(minutes=1))] == [u'a', u'b']
+
+  def test_conflicts(self):
+    assert [(a.id, b.id) for a, b in self.event_list.conflicts()] == [(u'a', u'b')]
+
+  def test_free_slots_default_to_the_listed_range(self):
+    assert self.event_list.free_slots(min_duration=HOUR) == [
+      (self.start - HOUR, self.start), (self.start + 3 * HOUR, self.start + 4 * HOUR), (self.start + 5 * HOUR, self.start + 6 * HOUR),
+    ]
+
+  def test_the_index_is_built_once(self):
+    self.event_list.at(self.start)
+    index = self.event_list._index
+
+    self.event_list.overlapping(self.start, self.start + HOUR)
+    assert self.event_list._index is index
+
+  def test_reindex_picks_up_changed_events(self):
+    self.event_list.at(self.start)
+    del self.event_list.events[0]
+    self.event_list.reindex()
+
+    assert [event.id for event in self.event_list.at(self.start + 30 * timedelta(minutes=1))] == []
+
+  def test_free_slots_need_a_range(self):
+    self.event_list.start = None
+
+    with raises(ValueError):
+      self.event_list.free_slots()
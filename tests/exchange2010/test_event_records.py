@@ -0,0 +1,125 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import pickle
+import unittest
+from httpretty import httprettified
+from lxml import etree
+from pytest import raises
+from pyexchange import Exchange2010Service
+from pyexchange.connection import ExchangeNTLMAuthConnection
+from pyexchange.exchange2010 import (
+  Exchange2010CalendarEvent, Exchange2010CalendarEventRecord, Exchange2010CalendarItemParser, CALENDAR_ITEM_XPATH,
+)
+
+from .fixtures import *  # noqa
+
+
+class Test_EventRecords(unittest.TestCase):
+  service = None
+
+  @classmethod
+  def setUpClass(cls):
+    cls.service = Exchange2010Service(
+      connection=ExchangeNTLMAuthConnection(
+        url=FAKE_EXCHANGE_URL,
+        username=FAKE_EXCHANGE_USERNAME,
+        password=FAKE_EXCHANGE_PASSWORD
+      )
+    )
+
+  def _record(self):
+    calendar_item = CALENDAR_ITEM_XPATH(etree.fromstring(GET_ITEM_RESPONSE.encode('utf-8')))[0]
+    return Exchange2010CalendarEventRecord.from_xml(Exchange2010CalendarItemParser(self.service), calendar_item)
+
+  def test_records_have_the_same_properties_as_events(self):
+    record = self._record()
+    event = Exchange2010CalendarEvent(service=self.service, xml=etree.fromstring(GET_ITEM_RESPONSE.encode('utf-8')))
+
+    for name in (u'id', u'change_key', u'subject', u'start', u'end', u'location', u'body', u'organizer', u'type',
+                 u'is_all_day', u'reminder_minutes_before_start', u'conference_room'):
+      assert getattr(record, name) == getattr(event, name)
+
+    assert sorted(record.attendees) == sorted(event.attendees)
+    assert sorted(record.required_attendees) == sorted(event.required_attendees)
+    assert sorted(record.optional_attendees) == sorted(event.optional_attendees)
+
+  def test_records_are_read_only(self):
+    record = self._record()
+
+    with raises(AttributeError):
+      record.subject = u'something else'
+
+    with raises(AttributeError):
+      record.anything = u'at all'
+
+    assert not hasattr(record, '__dict__')
+
+  def test_unknown_properties_are_rejected(self):
+    with raises(TypeError):
+      Exchange2010CalendarEventRecord(id=u'id1', colour=u'blue')
+
+  def test_records_can_be_pickled(self):
+    record = self._record()
+
+    copy = pickle.loads(pickle.dumps(record))
+
+    assert copy.id == record.id
+    assert copy.start == record.start
+    assert copy.attendees == record.attendees
+
+  @httprettified
+  def test_list_events_can_return_records(self):
+    self.requests_sent = register_responses(LIST_EVENTS_RESPONSE)
+
+    event_list = self.service.calendar().list_events(start=TEST_EVENT_LIST_START, end=TEST_EVENT_LIST_END, read_only=True)
+
+    assert all(isinstance(event, Exchange2010CalendarEventRecord) for event in event_list.events)
+    assert event_list.event_ids == [u'id1', u'id2', u'id3']
+    assert event_list.events[0].subject == u'Event Subject 1'
+
+  @httprettified
+  def test_details_are_loaded_as_records(self):
+    self.requests_sent = register_responses(
+      LIST_EVENTS_RESPONSE,
+      get_items_response([(u'id%s' % i, TEST_EVENT.start, TEST_EVENT.end) for i in (1, 2, 3)]),
+    )
+
+    event_list = self.service.calendar().list_events(
+      start=TEST_EVENT_LIST_START, end=TEST_EVENT_LIST_END, details=True, read_only=True,
+    )
+
+    assert [event.id for event in event_list.events] == [u'id1', u'id2', u'id3']
+    assert all(isinstance(event, Exchange2010CalendarEventRecord) for event in event_list.events)
+    assert event_list.events[0].start == TEST_EVENT.start
+
+  @httprettified
+  def test_iter_events_can_yield_records(self):
+    self.requests_sent = register_responses(list_events_page([(u'id1', TEST_EVENT.start, TEST_EVENT.end)]))
+
+    events = list(self.service.calendar().iter_events(start=TEST_EVENT_LIST_START, end=TEST_EVENT_LIST_END, read_only=True))
+
+    assert [event.id for event in events] == [u'id1']
+    assert isinstance(events[0], Exchange2010CalendarEventRecord)
+
+  @httprettified
+  def test_records_can_be_turned_into_events_and_updated(self):
+    self.requests_sent = register_responses(GET_ITEM_RESPONSE_ID_ONLY, UPDATE_ITEM_RESPONSE)
+    record = self._record()
+
+    event = record.to_event(self.service)
+
+    assert isinstance(event, Exchange2010CalendarEvent)
+    assert (event.id, event.change_key) == (record.id, record.change_key)
+    assert event.subject == record.subject
+    assert sorted(event.attendees) == sorted(record.attendees)
+    assert not event._dirty_attributes
+
+    event.location = TEST_EVENT_UPDATED.location
+    event.update()
+
+    assert TEST_EVENT_UPDATED.location in self.requests_sent[-1]
+    assert record.location == TEST_EVENT.location
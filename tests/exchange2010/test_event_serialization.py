@@ -0,0 +1,110 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import json
+import pickle
+import unittest
+from httpretty import HTTPretty, httprettified
+from lxml import etree
+from pyexchange import Exchange2010Service, serialization
+from pyexchange.connection import ExchangeNTLMAuthConnection
+from pyexchange.exchange2010 import Exchange2010CalendarEvent
+
+from .fixtures import *  # noqa
+
+PROPERTIES = (
+  u'id', u'change_key', u'calendar_id', u'subject', u'start', u'end', u'location', u'html_body', u'text_body',
+  u'organizer', u'reminder_minutes_before_start', u'is_all_day', u'type', u'recurrence', u'recurrence_interval',
+  u'recurrence_end_date', u'recurrence_days', u'conflicting_event_ids',
+)
+
+
+class Test_SerializingEvents(unittest.TestCase):
+  service = None
+
+  @classmethod
+  def setUpClass(cls):
+    cls.service = Exchange2010Service(
+      connection=ExchangeNTLMAuthConnection(
+        url=FAKE_EXCHANGE_URL,
+        username=FAKE_EXCHANGE_USERNAME,
+        password=FAKE_EXCHANGE_PASSWORD
+      )
+    )
+
+  def _event(self, response=GET_ITEM_RESPONSE):
+    return Exchange2010CalendarEvent(service=self.service, xml=etree.fromstring(response.encode('utf-8')))
+
+  def _assert_same_event(self, copy, event):
+    for name in PROPERTIES:
+      assert getattr(copy, name) == getattr(event, name), name
+
+    assert sorted(copy.attendees) == sorted(event.attendees)
+    assert sorted(copy.resources) == sorted(event.resources)
+
+  def test_json_round_trips_every_property(self):
+    event = self._event()
+
+    copy = Exchange2010CalendarEvent.from_json(self.service, event.as_json())
+
+    self._assert_same_event(copy, event)
+    assert not copy._dirty_attributes
+
+  def test_json_round_trips_recurrence(self):
+    event = self._event(GET_RECURRING_MASTER_WEEKLY_EVENT)
+
+    copy = Exchange2010CalendarEvent.from_json(self.service, event.as_json())
+
+    self._assert_same_event(copy, event)
+    assert copy.recurrence == u'weekly'
+
+  def test_json_is_stable(self):
+    event = self._event()
+
+    as_json = event.as_json()
+
+    assert as_json == Exchange2010CalendarEvent.from_json(self.service, as_json).as_json()
+    assert list(json.loads(as_json)) == sorted(json.loads(as_json))
+
+  def test_orjson_and_json_agree(self):
+    data = serialization.event_to_dict(self._event())
+
+    orjson, serialization.orjson = serialization.orjson, None
+    try:
+      with_json = serialization.dumps(data)
+    finally:
+      serialization.orjson = orjson
+
+    assert with_json == serialization.dumps(data)
+
+  def test_from_json_takes_decoded_dicts(self):
+    event = self._event()
+
+    copy = Exchange2010CalendarEvent.from_json(self.service, json.loads(event.as_json()))
+
+    assert copy.id == event.id
+
+  def test_events_pickle_without_the_service(self):
+    event = self._event()
+    event.location = TEST_EVENT_UPDATED.location
+
+    copy = pickle.loads(pickle.dumps(event))
+
+    self._assert_same_event(copy, event)
+    assert copy.service is None
+    assert copy._dirty_attributes == set([u'location'])
+
+  @httprettified
+  def test_event_lists_stream_json_lines(self):
+    HTTPretty.register_uri(HTTPretty.POST, FAKE_EXCHANGE_URL, body=LIST_EVENTS_RESPONSE.encode('utf-8'), content_type='text/xml; charset=utf-8')
+
+    event_list = self.service.calendar().list_events(start=TEST_EVENT_LIST_START, end=TEST_EVENT_LIST_END)
+    lines = list(event_list.to_json_lines())
+
+    assert len(lines) == 3
+    assert all(line.endswith(u'\n') for line in lines)
+    assert [json.loads(line)[u'id'] for line in lines] == [u'id1', u'id2', u'id3']
+    assert lines[0] == event_list.events[0].as_json() + u'\n'
@@ -0,0 +1,78 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import unittest
+from datetime import timedelta
+from lxml import etree
+from pytest import raises
+from pyexchange import Exchange2010Service, recurrence
+from pyexchange.connection import ExchangeNTLMAuthConnection
+from pyexchange.exchange2010 import Exchange2010CalendarEvent, Exchange2010CalendarEventRecord, Exchange2010CalendarItemParser, CALENDAR_ITEM_XPATH
+from pyexchange.exceptions import InvalidEventType
+
+from .fixtures import *  # noqa
+
+
+class Test_ExpandingRecurringEvents(unittest.TestCase):
+  service = None
+
+  @classmethod
+  def setUpClass(cls):
+    cls.service = Exchange2010Service(
+      connection=ExchangeNTLMAuthConnection(
+        url=FAKE_EXCHANGE_URL,
+        username=FAKE_EXCHANGE_USERNAME,
+        password=FAKE_EXCHANGE_PASSWORD
+      )
+    )
+
+  def _event(self, response):
+    return Exchange2010CalendarEvent(service=self.service, xml=etree.fromstring(response.encode('utf-8')))
+
+  def test_masters_have_their_exceptions(self):
+    event = self._event(GET_RECURRING_MASTER_DAILY_EVENT_WITH_EXCEPTIONS)
+
+    assert [occurrence.id for occurrence in event.modified_occurrences] == [u'moved']
+    assert event.modified_occurrences[0].original_start == TEST_RECURRING_EVENT_DAILY.start + timedelta(days=1)
+    assert event.deleted_occurrences == [TEST_RECURRING_EVENT_DAILY.start + timedelta(days=2)]
+
+  def test_expand(self):
+    event = self._event(GET_RECURRING_MASTER_DAILY_EVENT_WITH_EXCEPTIONS)
+
+    occurrences = list(event.expand())
+
+    assert [occurrence.index for occurrence in occurrences] == [1, 2, 4, 5, 6]
+    assert occurrences[0].start == TEST_RECURRING_EVENT_DAILY.start
+    assert occurrences[1].start == TEST_RECURRING_EVENT_DAILY.start + timedelta(days=1, hours=3)
+    assert occurrences[1].id == u'moved'
+    assert occurrences[-1].start.date() == TEST_RECURRING_EVENT_DAILY.recurrence_end_date
+
+  def test_expand_a_window(self):
+    event = self._event(GET_RECURRING_MASTER_DAILY_EVENT)
+    window_start = TEST_RECURRING_EVENT_DAILY.start + timedelta(days=2)
+
+    occurrences = list(event.expand(start=window_start, end=window_start + timedelta(days=2)))
+
+    assert [occurrence.index for occurrence in occurrences] == [3, 4]
+
+  def test_records_can_be_expanded(self):
+    calendar_item = CALENDAR_ITEM_XPATH(etree.fromstring(GET_RECURRING_MASTER_DAILY_EVENT_WITH_EXCEPTIONS.encode('utf-8')))[0]
+    record = Exchange2010CalendarEventRecord.from_xml(Exchange2010CalendarItemParser(self.service), calendar_item)
+    event = self._event(GET_RECURRING_MASTER_DAILY_EVENT_WITH_EXCEPTIONS)
+
+    assert list(recurrence.expand(record)) == list(event.expand())
+
+  def test_exceptions_survive_json(self):
+    event = self._event(GET_RECURRING_MASTER_DAILY_EVENT_WITH_EXCEPTIONS)
+
+    copy = Exchange2010CalendarEvent.from_json(self.service, event.as_json())
+
+    assert copy.modified_occurrences == event.modified_occurrences
+    assert copy.deleted_occurrences == event.deleted_occurrences
+
+  def test_only_recurring_events_expand(self):
+    with raises(InvalidEventType):
+      self._event(GET_ITEM_RESPONSE).expand()
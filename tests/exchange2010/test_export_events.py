@@ -0,0 +1,69 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import io
+import json
+import unittest
+from httpretty import httprettified
+from pyexchange import Exchange2010Service
+from pyexchange.connection import ExchangeNTLMAuthConnection
+
+from .fixtures import *  # noqa
+
+
+class Test_ExportingEvents(unittest.TestCase):
+  service = None
+
+  @classmethod
+  def setUpClass(cls):
+    cls.service = Exchange2010Service(
+      connection=ExchangeNTLMAuthConnection(
+        url=FAKE_EXCHANGE_URL,
+        username=FAKE_EXCHANGE_USERNAME,
+        password=FAKE_EXCHANGE_PASSWORD
+      )
+    )
+
+  @httprettified
+  def test_event_lists_can_be_exported(self):
+    self.requests_sent = register_responses(LIST_EVENTS_RESPONSE)
+    events_file = io.StringIO()
+
+    event_list = self.service.calendar().list_events(start=TEST_EVENT_LIST_START, end=TEST_EVENT_LIST_END, read_only=True)
+
+    assert event_list.export(events_file, format=u'jsonl') == 3
+    rows = [json.loads(line) for line in events_file.getvalue().splitlines()]
+    assert [row[u'id'] for row in rows] == [u'id1', u'id2', u'id3']
+
+  @httprettified
+  def test_export_events_streams_pages(self):
+    self.requests_sent = register_responses(
+      list_events_page([(u'id1', TEST_EVENT.start, TEST_EVENT.end)], includes_last=False),
+      list_events_page([(u'id1', TEST_EVENT.start, TEST_EVENT.end), (u'id2', TEST_EVENT.end, TEST_EVENT.end)]),
+    )
+    events_file = io.StringIO()
+
+    count = self.service.calendar().export_events(TEST_EVENT_LIST_START, TEST_EVENT_LIST_END, events_file, page_size=1)
+
+    assert count == 2
+    assert len(self.requests_sent) == 2
+    assert events_file.getvalue().splitlines()[0].startswith(u'id,change_key,subject')
+
+  @httprettified
+  def test_export_events_can_load_details(self):
+    self.requests_sent = register_responses(
+      list_events_page([(u'id1', TEST_EVENT.start, TEST_EVENT.end), (u'id2', TEST_EVENT.start, TEST_EVENT.end)]),
+      get_items_response([(u'id1', TEST_EVENT.start, TEST_EVENT.end), (u'id2', TEST_EVENT.start, TEST_EVENT.end)]),
+    )
+    events_file, attendees_file = io.StringIO(), io.StringIO()
+
+    count = self.service.calendar().export_events(
+      TEST_EVENT_LIST_START, TEST_EVENT_LIST_END, events_file, attendees_file, format=u'jsonl', details=True,
+    )
+
+    assert count == 2
+    assert u'GetItem' in self.requests_sent[1]
+    assert self.requests_sent[1].count(u'<t:ItemId') == 2
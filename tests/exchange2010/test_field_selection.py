@@ -0,0 +1,145 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import unittest
+from datetime import datetime, timedelta
+from httpretty import httprettified
+from lxml import etree
+from pytest import raises
+from pytz import utc
+from pyexchange import Exchange2010Service
+from pyexchange.connection import ExchangeNTLMAuthConnection
+from pyexchange.exchange2010 import soap_request
+
+from .fixtures import *  # noqa
+
+WINDOW_START = datetime(year=2050, month=5, day=1, tzinfo=utc)
+WINDOW_END = datetime(year=2050, month=6, day=1, tzinfo=utc)
+
+
+class Test_Shapes(unittest.TestCase):
+
+  def test_no_fields_asks_for_the_base_shape(self):
+    xml = etree.tostring(soap_request.get_item(exchange_id=u'id1', format=u'AllProperties')).decode('utf-8')
+
+    assert u'<t:BaseShape>AllProperties</t:BaseShape>' in xml
+    assert u'AdditionalProperties' not in xml
+
+  def test_fields_ask_for_just_those_properties(self):
+    xml = etree.tostring(soap_request.get_item(exchange_id=u'id1', format=u'AllProperties', fields=[u'subject', u'attendees'])).decode('utf-8')
+
+    assert u'<t:BaseShape>IdOnly</t:BaseShape>' in xml
+    assert u'<t:FieldURI FieldURI="item:Subject"/>' in xml
+    assert u'<t:FieldURI FieldURI="calendar:RequiredAttendees"/>' in xml
+    assert u'<t:FieldURI FieldURI="calendar:OptionalAttendees"/>' in xml
+
+  def test_fields_are_only_asked_for_once(self):
+    xml = etree.tostring(soap_request.get_item(exchange_id=u'id1', fields=[u'html_body', u'text_body'])).decode('utf-8')
+
+    assert xml.count(u'item:Body') == 1
+
+  def test_text_body_asks_for_a_text_body(self):
+    xml = etree.tostring(soap_request.get_item(exchange_id=u'id1', fields=[u'subject', u'text_body'])).decode('utf-8')
+
+    assert u'<t:BaseShape>IdOnly</t:BaseShape><t:BodyType>Text</t:BodyType><t:AdditionalProperties>' in xml
+
+  def test_html_body_asks_for_an_html_body(self):
+    xml = etree.tostring(soap_request.get_item(exchange_id=u'id1', fields=[u'html_body'])).decode('utf-8')
+
+    assert u'<t:BodyType>HTML</t:BodyType>' in xml
+
+  def test_both_bodies_get_whichever_the_item_has(self):
+    xml = etree.tostring(soap_request.get_item(exchange_id=u'id1', fields=[u'html_body', u'text_body'])).decode('utf-8')
+
+    assert u'BodyType' not in xml
+
+  def test_unknown_fields_are_rejected(self):
+    with raises(ValueError):
+      soap_request.get_item(exchange_id=u'id1', fields=[u'shoe_size'])
+
+  def test_folder_fields(self):
+    xml = etree.tostring(soap_request.find_folder(parent_id=u'calendar', fields=[u'display_name'])).decode('utf-8')
+
+    assert u'<t:FieldURI FieldURI="folder:DisplayName"/>' in xml
+
+
+class Test_SelectingFields(unittest.TestCase):
+  service = None
+
+  @classmethod
+  def setUpClass(cls):
+    cls.service = Exchange2010Service(
+      connection=ExchangeNTLMAuthConnection(
+        url=FAKE_EXCHANGE_URL,
+        username=FAKE_EXCHANGE_USERNAME,
+        password=FAKE_EXCHANGE_PASSWORD
+      )
+    )
+
+  @httprettified
+  def test_list_events_with_fields(self):
+    start = WINDOW_START + timedelta(hours=9)
+    self.requests_sent = register_responses(list_events_page([(u'id1', start, start + timedelta(hours=1))]))
+
+    event_list = self.service.calendar().list_events(start=WINDOW_START, end=WINDOW_END, fields=[u'subject', u'start', u'end'])
+
+    assert event_list.events[0].start == start
+    assert u'<t:FieldURI FieldURI="calendar:End"/>' in self.requests_sent[0]
+    assert u'AllProperties' not in self.requests_sent[0]
+
+  def test_list_events_needs_details_for_bodies(self):
+    with raises(ValueError):
+      self.service.calendar().list_events(start=WINDOW_START, end=WINDOW_END, fields=[u'subject', u'html_body'])
+
+  @httprettified
+  def test_list_events_with_details_loads_the_rest_with_get_item(self):
+    start = WINDOW_START + timedelta(hours=9)
+    self.requests_sent = register_responses(
+      list_events_page([(u'id1', start, start + timedelta(hours=1))]),
+      get_items_response([(u'id1', start, start + timedelta(hours=1))]),
+    )
+
+    self.service.calendar().list_events(start=WINDOW_START, end=WINDOW_END, details=True, fields=[u'subject', u'attendees'])
+
+    assert u'calendar:RequiredAttendees' not in self.requests_sent[0]
+    assert u'item:Subject' in self.requests_sent[0]
+    assert u'calendar:RequiredAttendees' in self.requests_sent[1]
+
+  @httprettified
+  def test_iter_events_always_asks_for_the_start(self):
+    self.requests_sent = register_responses(list_events_page([]))
+
+    list(self.service.calendar().iter_events(start=WINDOW_START, end=WINDOW_END, fields=[u'subject']))
+
+    assert u'calendar:Start' in self.requests_sent[0]
+
+  @httprettified
+  def test_get_event_with_fields(self):
+    self.requests_sent = register_responses(GET_ITEM_RESPONSE)
+
+    event = self.service.calendar().get_event(id=TEST_EVENT.id, fields=[u'subject', u'organizer'])
+
+    assert event.id == TEST_EVENT.id
+    assert event.subject == TEST_EVENT.subject
+    assert u'calendar:Organizer' in self.requests_sent[0]
+
+  @httprettified
+  def test_get_event_with_text_body(self):
+    self.requests_sent = register_responses(GET_ITEM_RESPONSE)
+
+    event = self.service.calendar().get_event(id=TEST_EVENT.id, fields=[u'text_body'])
+
+    assert event.text_body == TEST_EVENT.body
+    assert u'<t:BodyType>Text</t:BodyType>' in self.requests_sent[0]
+
+  @httprettified
+  def test_get_folder_with_fields(self):
+    self.requests_sent = register_responses(GET_FOLDER_RESPONSE)
+
+    folder = self.service.folder().get_folder(id=TEST_FOLDER.id, fields=[u'display_name'])
+
+    assert folder.id == TEST_FOLDER.id
+    assert u'folder:DisplayName' in self.requests_sent[0]
@@ -0,0 +1,101 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import unittest
+from datetime import datetime, timedelta
+from httpretty import httprettified
+from pytest import raises
+from pytz import utc
+from pyexchange import Exchange2010Service
+from pyexchange.connection import ExchangeNTLMAuthConnection
+from pyexchange.exceptions import *  # noqa
+
+from .fixtures import *  # noqa
+
+WINDOW_START = datetime(year=2050, month=5, day=1, tzinfo=utc)
+WINDOW_END = datetime(year=2050, month=6, day=1, tzinfo=utc)
+
+FIRST = WINDOW_START + timedelta(hours=9)
+SECOND = WINDOW_START + timedelta(hours=10)
+THIRD = WINDOW_START + timedelta(hours=11)
+
+
+class Test_IteratingOverEvents(unittest.TestCase):
+  service = None
+
+  @classmethod
+  def setUpClass(cls):
+    cls.service = Exchange2010Service(
+      connection=ExchangeNTLMAuthConnection(
+        url=FAKE_EXCHANGE_URL,
+        username=FAKE_EXCHANGE_USERNAME,
+        password=FAKE_EXCHANGE_PASSWORD
+      )
+    )
+
+  @httprettified
+  def test_single_page(self):
+    self.requests_sent = register_responses(
+      list_events_page([(u'id1', FIRST, SECOND), (u'id2', SECOND, THIRD)], includes_last=True),
+    )
+
+    events = list(self.service.calendar().iter_events(start=WINDOW_START, end=WINDOW_END, page_size=10))
+
+    assert [event.id for event in events] == [u'id1', u'id2']
+    assert len(self.requests_sent) == 1
+    assert u'MaxEntriesReturned="10"' in self.requests_sent[-1]
+
+  @httprettified
+  def test_follows_pages_until_the_last_item_is_included(self):
+    self.requests_sent = register_responses(
+      # a long running event that started before the window, and two that start at the same moment
+      list_events_page([
+        (u'early', WINDOW_START - timedelta(days=1), WINDOW_END),
+        (u'id1', FIRST, SECOND),
+        (u'id2', SECOND, THIRD),
+      ], includes_last=False),
+      # the second page restarts at SECOND, so Exchange hands back everything overlapping it again
+      list_events_page([
+        (u'early', WINDOW_START - timedelta(days=1), WINDOW_END),
+        (u'id2', SECOND, THIRD),
+        (u'id3', SECOND, THIRD),
+        (u'id4', THIRD, THIRD + timedelta(hours=1)),
+      ], includes_last=True),
+    )
+
+    events = list(self.service.calendar().iter_events(start=WINDOW_START, end=WINDOW_END, page_size=3))
+
+    assert [event.id for event in events] == [u'early', u'id1', u'id2', u'id3', u'id4']
+    assert len(self.requests_sent) == 2
+    assert u'StartDate="%s"' % SECOND.strftime(EXCHANGE_DATETIME_FORMAT) in self.requests_sent[-1]
+
+  @httprettified
+  def test_grows_page_size_when_a_page_makes_no_progress(self):
+    self.requests_sent = register_responses(
+      list_events_page([(u'id1', FIRST, SECOND), (u'id2', FIRST, SECOND)], includes_last=False),
+      list_events_page([(u'id1', FIRST, SECOND), (u'id2', FIRST, SECOND), (u'id3', FIRST, SECOND)], includes_last=True),
+    )
+
+    events = list(self.service.calendar().iter_events(start=FIRST, end=WINDOW_END, page_size=2))
+
+    assert [event.id for event in events] == [u'id1', u'id2', u'id3']
+    assert u'MaxEntriesReturned="4"' in self.requests_sent[-1]
+
+  @httprettified
+  def test_events_are_yielded_lazily(self):
+    self.requests_sent = register_responses(
+      list_events_page([(u'id1', FIRST, SECOND)], includes_last=True),
+    )
+
+    iterator = self.service.calendar().iter_events(start=WINDOW_START, end=WINDOW_END)
+    assert len(self.requests_sent) == 0
+
+    next(iterator)
+    assert len(self.requests_sent) == 1
+
+  def test_page_size_must_be_positive(self):
+    with raises(ValueError):
+      next(self.service.calendar().iter_events(start=WINDOW_START, end=WINDOW_END, page_size=0))
@@ -2,7 +2,9 @@
 import unittest
 from pytest import raises
 from httpretty import HTTPretty, httprettified
+from lxml import etree
 from pyexchange import Exchange2010Service
+from pyexchange.exchange2010 import Exchange2010CalendarEvent, soap_request
 from pyexchange.connection import ExchangeNTLMAuthConnection
 from pyexchange.exceptions import *
 
@@ -81,3 +83,17 @@ class Test_FailingToListEvents(unittest.TestCase):
         #        start=TEST_EVENT_LIST_START,
         #        end=TEST_EVENT_LIST_END
         #    )
+
+
+class Test_ParsingEventsInPlace(unittest.TestCase):
+
+    def setUp(self):
+        self.service = Exchange2010Service(connection=None)
+        self.response = etree.XML(LIST_EVENTS_RESPONSE.encode('utf-8'))
+        self.items = self.response.xpath(u'//t:CalendarItem', namespaces=soap_request.NAMESPACES)
+
+    def test_each_calendar_item_is_parsed_relative_to_itself(self):
+        events = [Exchange2010CalendarEvent(service=self.service, xml=item) for item in self.items]
+
+        assert [event.id for event in events] == [u'id1', u'id2', u'id3']
+        assert [event.subject for event in events] == [u'Event Subject 1', u'Event Subject 2', u'Subject 3']
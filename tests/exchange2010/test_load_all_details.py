@@ -0,0 +1,83 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import re
+import unittest
+from httpretty import HTTPretty, httprettified
+from pytest import raises
+from pyexchange import Exchange2010Service
+from pyexchange.connection import ExchangeNTLMAuthConnection
+from pyexchange.exceptions import *  # noqa
+
+from .fixtures import *  # noqa
+
+EVENT_IDS = [u'id%s' % i for i in range(1, 8)]
+
+
+def _item_ids(body):
+  return re.findall(u'ItemId Id="([^"]+)"', body)
+
+
+class Test_LoadingAllDetails(unittest.TestCase):
+  service = None
+
+  @classmethod
+  def setUpClass(cls):
+    cls.service = Exchange2010Service(
+      connection=ExchangeNTLMAuthConnection(
+        url=FAKE_EXCHANGE_URL,
+        username=FAKE_EXCHANGE_USERNAME,
+        password=FAKE_EXCHANGE_PASSWORD
+      )
+    )
+
+  @httprettified
+  def setUp(self):
+    HTTPretty.register_uri(
+      HTTPretty.POST, FAKE_EXCHANGE_URL,
+      body=list_events_page([(id, TEST_EVENT.start, TEST_EVENT.end) for id in EVENT_IDS]).encode('utf-8'),
+      content_type='text/xml; charset=utf-8'
+    )
+    self.event_list = self.service.calendar().list_events(start=TEST_EVENT_LIST_START, end=TEST_EVENT_LIST_END)
+
+  def _register_get_item(self):
+    self.batches = []
+
+    def get_item(request, uri, headers):
+      ids = _item_ids(request.body.decode('utf-8'))
+      self.batches.append(ids)
+      return 200, headers, get_items_response([(id, TEST_EVENT.start, TEST_EVENT.end) for id in ids]).encode('utf-8')
+
+    HTTPretty.register_uri(HTTPretty.POST, FAKE_EXCHANGE_URL, body=get_item, content_type='text/xml; charset=utf-8')
+
+  @httprettified
+  def test_ids_are_requested_in_batches(self):
+    self._register_get_item()
+    self.event_list.load_all_details(batch_size=3)
+
+    assert self.batches == [EVENT_IDS[0:3], EVENT_IDS[3:6], EVENT_IDS[6:7]]
+    assert [event.id for event in self.event_list.events] == EVENT_IDS
+    assert self.event_list.count == len(EVENT_IDS)
+
+  @httprettified
+  def test_default_batch_size_sends_small_lists_at_once(self):
+    self._register_get_item()
+    self.event_list.load_all_details()
+
+    assert self.batches == [EVENT_IDS]
+
+  def test_parallel_batches_keep_their_order(self):
+    # httpretty isn't thread safe, so answer the GetItem calls from a plain connection object instead
+    connection = FakeConnection(lambda body: get_items_response([(id, TEST_EVENT.start, TEST_EVENT.end) for id in _item_ids(body)]))
+    self.event_list.service = Exchange2010Service(connection=connection)
+    self.event_list.load_all_details(batch_size=2, max_workers=3)
+
+    assert sorted(_item_ids(body) for body in connection.requests_sent) == sorted([EVENT_IDS[0:2], EVENT_IDS[2:4], EVENT_IDS[4:6], EVENT_IDS[6:7]])
+    assert [event.id for event in self.event_list.events] == EVENT_IDS
+
+  def test_batch_size_must_be_positive(self):
+    with raises(ValueError):
+      self.event_list.load_all_details(batch_size=-1)
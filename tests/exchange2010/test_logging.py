@@ -0,0 +1,56 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import logging
+import unittest
+from httpretty import HTTPretty, httprettified
+from mock import patch
+from lxml import etree
+from pyexchange import Exchange2010Service
+from pyexchange.connection import ExchangeNTLMAuthConnection
+
+from .fixtures import *  # noqa
+
+
+class Test_PayloadLogging(unittest.TestCase):
+
+  def setUp(self):
+    self.service = Exchange2010Service(
+      connection=ExchangeNTLMAuthConnection(
+        url=FAKE_EXCHANGE_URL,
+        username=FAKE_EXCHANGE_USERNAME,
+        password=FAKE_EXCHANGE_PASSWORD
+      )
+    )
+    self.logger = logging.getLogger('pyexchange')
+    self.original_level = self.logger.level
+
+  def tearDown(self):
+    self.logger.setLevel(self.original_level)
+
+  def _get_event(self):
+    HTTPretty.register_uri(
+      HTTPretty.POST, FAKE_EXCHANGE_URL,
+      body=GET_ITEM_RESPONSE.encode('utf-8'),
+      content_type='text/xml; charset=utf-8',
+    )
+
+    with patch('pyexchange.base.soap.etree.tostring', wraps=etree.tostring) as tostring:
+      self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    return [call for call in tostring.call_args_list if call[1].get('pretty_print')]
+
+  @httprettified
+  def test_payloads_are_not_pretty_printed_when_logging_is_off(self):
+    self.logger.setLevel(logging.WARNING)
+
+    assert self._get_event() == []
+
+  @httprettified
+  def test_payloads_are_pretty_printed_at_info(self):
+    self.logger.setLevel(logging.INFO)
+
+    assert len(self._get_event()) >= 2
@@ -0,0 +1,105 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import re
+import unittest
+from httpretty import httprettified
+from pytest import raises
+from pyexchange import Exchange2010Service
+from pyexchange.connection import ExchangeNTLMAuthConnection
+from pyexchange.exceptions import *  # noqa
+
+from .fixtures import *  # noqa
+
+
+class Test_MailboxTargeting(unittest.TestCase):
+  service = None
+
+  @classmethod
+  def setUpClass(cls):
+    cls.service = Exchange2010Service(
+      connection=ExchangeNTLMAuthConnection(
+        url=FAKE_EXCHANGE_URL,
+        username=FAKE_EXCHANGE_USERNAME,
+        password=FAKE_EXCHANGE_PASSWORD
+      )
+    )
+
+  def _list_events(self, service):
+    return service.calendar().list_events(start=TEST_EVENT_LIST_START, end=TEST_EVENT_LIST_END).event_ids
+
+  @httprettified
+  def test_our_own_mailbox_has_no_header(self):
+    self.requests_sent = register_responder(lambda body: LIST_EVENTS_RESPONSE)
+
+    self._list_events(self.service)
+
+    assert u'Header' not in self.requests_sent[0]
+    assert u'Mailbox' not in self.requests_sent[0]
+
+  @httprettified
+  def test_impersonated_calendars_send_an_impersonation_header(self):
+    self.requests_sent = register_responder(lambda body: LIST_EVENTS_RESPONSE)
+
+    self.service.calendar(mailbox=u'bob@example.com').list_events(start=TEST_EVENT_LIST_START, end=TEST_EVENT_LIST_END)
+
+    assert u'<t:PrimarySmtpAddress>bob@example.com</t:PrimarySmtpAddress>' in self.requests_sent[0]
+    assert u'<t:RequestServerVersion Version="Exchange2010"/>' in self.requests_sent[0]
+    assert u'<t:Mailbox>' not in self.requests_sent[0]
+
+  @httprettified
+  def test_delegate_calendars_name_the_mailbox_in_the_folder_id(self):
+    self.requests_sent = register_responder(lambda body: LIST_EVENTS_RESPONSE)
+
+    self.service.calendar(mailbox=u'bob@example.com', impersonate=False).list_events(start=TEST_EVENT_LIST_START, end=TEST_EVENT_LIST_END)
+
+    assert u'ExchangeImpersonation' not in self.requests_sent[0]
+    assert u'<t:Mailbox><t:EmailAddress>bob@example.com</t:EmailAddress></t:Mailbox></t:DistinguishedFolderId>' in self.requests_sent[0]
+
+  def test_mailbox_services_share_the_connection(self):
+    bob = self.service.for_mailbox(u'bob@example.com')
+
+    assert bob.connection is self.service.connection
+    assert bob.retry_policy is self.service.retry_policy
+    assert self.service.mailbox is None
+
+  def test_fan_out_runs_in_each_mailbox(self):
+    connection = FakeConnection(lambda body: LIST_EVENTS_RESPONSE)
+    mailboxes = [u'user%s@example.com' % i for i in range(6)]
+
+    results = Exchange2010Service(connection=connection).fan_out(mailboxes, self._list_events, max_workers=3)
+
+    assert results.mailboxes == mailboxes
+    assert all(result.result == [u'id1', u'id2', u'id3'] for result in results.values())
+    assert sorted(re.search(u'<t:PrimarySmtpAddress>(.*?)<', body).group(1) for body in connection.requests_sent) == sorted(mailboxes)
+
+    assert results.stats.mailboxes == 6
+    assert results.stats.succeeded == 6
+    assert results.stats.failed == 0
+    assert results.stats.max_seconds >= results.stats.mean_seconds
+    assert results.stats.total_seconds >= results.stats.max_seconds
+
+  def test_fan_out_keeps_errors_to_their_mailbox(self):
+    connection = FakeConnection(lambda body: SOAP_FAULT if u'bad@example.com' in body else LIST_EVENTS_RESPONSE)
+    service = Exchange2010Service(connection=connection)
+
+    results = service.fan_out([u'good@example.com', u'bad@example.com', u'good@example.com'], self._list_events, max_workers=2)
+
+    assert results.mailboxes == [u'good@example.com', u'bad@example.com']
+    assert results[u'good@example.com'].error is None
+    assert results[u'bad@example.com'].result is None
+    assert isinstance(results[u'bad@example.com'].error, FailedExchangeException)
+    assert [result.mailbox for result in results.failed()] == [u'bad@example.com']
+    assert [result.mailbox for result in results.succeeded()] == [u'good@example.com']
+    assert (results.stats.succeeded, results.stats.failed) == (1, 1)
+
+  def test_fan_out_needs_workers(self):
+    with raises(ValueError):
+      self.service.fan_out([u'bob@example.com'], self._list_events, max_workers=-1)
+
+  def test_fan_out_doesnt_take_zero_workers_to_mean_the_default(self):
+    with raises(ValueError):
+      self.service.fan_out([u'bob@example.com'], self._list_events, max_workers=0)
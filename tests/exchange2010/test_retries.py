@@ -0,0 +1,127 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import unittest
+from pytest import raises
+from pyexchange import Exchange2010Service
+from pyexchange.connection import ExchangeBaseConnection
+from pyexchange.exchange2010 import soap_request
+from pyexchange.exceptions import *  # noqa
+from pyexchange.retry import RetryPolicy
+
+from .fixtures import *  # noqa
+
+
+class QueuedConnection(ExchangeBaseConnection):
+  """
+  Answers each request with the next canned response, or raises it if it's an exception. Remembers how long each
+  request was given, and how many retries.
+  """
+
+  def __init__(self, *responses):
+    self.responses = list(responses)
+    self.timeouts = []
+    self.retries = []
+
+  def send(self, body, headers=None, retries=2, timeout=30, encoding=u"utf-8"):
+    self.timeouts.append(timeout)
+    self.retries.append(retries)
+    response = self.responses.pop(0)
+    if isinstance(response, Exception):
+      raise response
+    return response
+
+
+class Test_RetryingBusyResponses(unittest.TestCase):
+
+  def _service(self, *responses):
+    self.sleeps = []
+    self.connection = QueuedConnection(*responses)
+    return Exchange2010Service(connection=self.connection, retry_policy=RetryPolicy(base_delay=0.001, sleep=self.sleeps.append))
+
+  def test_busy_responses_are_retried_after_the_servers_back_off(self):
+    service = self._service(SERVER_BUSY_RESPONSE, GET_ITEM_RESPONSE)
+
+    event = service.calendar().get_event(id=TEST_EVENT.id)
+
+    assert event.subject == TEST_EVENT.subject
+    assert self.sleeps == [1.5]
+
+  def test_busy_faults_are_retried_after_the_servers_back_off(self):
+    service = self._service(SERVER_BUSY_FAULT, GET_ITEM_RESPONSE)
+
+    service.calendar().get_event(id=TEST_EVENT.id)
+
+    assert self.sleeps == [2.5]
+
+  def test_transient_errors_are_retried(self):
+    service = self._service(TRANSIENT_ERROR_RESPONSE, TRANSIENT_ERROR_RESPONSE, GET_ITEM_RESPONSE)
+
+    service.calendar().get_event(id=TEST_EVENT.id)
+
+    assert len(self.sleeps) == 2
+
+  def test_gives_up_when_retries_run_out(self):
+    service = self._service(SERVER_BUSY_RESPONSE, SERVER_BUSY_RESPONSE, GET_ITEM_RESPONSE)
+
+    with raises(ExchangeServerBusyException) as excinfo:
+      service.send(soap_request.get_item(exchange_id=TEST_EVENT.id), retries=1)
+
+    assert excinfo.value.back_off == 1.5
+
+  def test_gives_up_rather_than_waiting_past_the_timeout(self):
+    service = self._service(SERVER_BUSY_RESPONSE, GET_ITEM_RESPONSE)
+
+    with raises(ExchangeServerBusyException):
+      service.send(soap_request.get_item(exchange_id=TEST_EVENT.id), timeout=1)
+
+    assert self.sleeps == []
+
+  def test_each_attempt_gets_what_is_left_of_the_timeout(self):
+    service = self._service(GET_ITEM_RESPONSE)
+
+    service.send(soap_request.get_item(exchange_id=TEST_EVENT.id), timeout=10)
+
+    assert 0 < self.connection.timeouts[0] <= 10
+
+  def test_other_errors_are_not_retried(self):
+    service = self._service(ITEM_DOES_NOT_EXIST, GET_ITEM_RESPONSE)
+
+    with raises(ExchangeItemNotFoundException):
+      service.calendar().get_event(id=TEST_EVENT.id)
+
+    assert self.sleeps == []
+
+  def test_streamed_requests_are_retried(self):
+    service = self._service(SERVER_BUSY_FAULT, LIST_EVENTS_RESPONSE)
+
+    event_list = service.calendar().list_events(start=TEST_EVENT_LIST_START, end=TEST_EVENT_LIST_END)
+
+    assert event_list.event_ids == [u'id1', u'id2', u'id3']
+    assert self.sleeps == [2.5]
+
+  def test_batches_are_retried(self):
+    service = self._service(SERVER_BUSY_FAULT, bulk_response(u'CreateItem', [(u'id0', u'ck0')]))
+    event = service.calendar().new_event(subject=TEST_EVENT.subject, start=TEST_EVENT.start, end=TEST_EVENT.end)
+
+    assert service.calendar().bulk_create([event]) == [None]
+    assert event.id == u'id0'
+
+  def test_connection_errors_are_retried_by_the_service_only(self):
+    service = self._service(ExchangeTransientConnectionException(u'nobody home'), GET_ITEM_RESPONSE)
+
+    service.calendar().get_event(id=TEST_EVENT.id)
+
+    assert len(self.sleeps) == 1
+    assert self.connection.retries == [0, 0]
+
+  def test_connection_errors_give_up_after_retries_attempts(self):
+    service = self._service(*[ExchangeTransientConnectionException(u'nobody home')] * 3)
+
+    with raises(ExchangeTransientConnectionException):
+      service.send(soap_request.get_item(exchange_id=TEST_EVENT.id), retries=1)
+
+    assert len(self.connection.retries) == 2
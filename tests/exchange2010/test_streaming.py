@@ -0,0 +1,95 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import unittest
+from pytest import raises
+from pyexchange import Exchange2010Service
+from pyexchange.connection import ExchangeBaseConnection
+from pyexchange.exchange2010 import soap_request
+from pyexchange.exceptions import *  # noqa
+
+from .fixtures import *  # noqa
+
+T_CALENDAR_ITEM = u'{%s}CalendarItem' % soap_request.TYPE_NS
+
+
+class ChunkedConnection(ExchangeBaseConnection):
+  """ Hands back a canned response a few bytes at a time. """
+
+  def __init__(self, response, chunk_size=7):
+    self.response = response.encode('utf-8')
+    self.chunk_size = chunk_size
+
+  def send_streaming(self, body, headers=None, retries=2, timeout=30, encoding=u"utf-8"):
+    return (self.response[i:i + self.chunk_size] for i in range(0, len(self.response), self.chunk_size))
+
+
+class WholeResponseConnection(ExchangeBaseConnection):
+  """ A connection that only knows how to send, like most custom connections written before streaming existed. """
+
+  def __init__(self, response):
+    self.response = response
+
+  def send(self, body, headers=None, retries=2, timeout=30, encoding=u"utf-8"):
+    return self.response
+
+
+def stream_calendar_items(connection):
+  service = Exchange2010Service(connection=connection)
+  return service.send_streaming(soap_request.get_item(exchange_id=TEST_EVENT.id), tags=[T_CALENDAR_ITEM])
+
+
+class Test_StreamingResponses(unittest.TestCase):
+
+  def test_yields_items_as_they_are_parsed(self):
+    ids = [element.find(u't:ItemId', namespaces=soap_request.NAMESPACES).get(u'Id')
+           for element in stream_calendar_items(ChunkedConnection(LIST_EVENTS_RESPONSE))]
+
+    assert ids == [u'id1', u'id2', u'id3']
+
+  def test_nested_items_are_not_yielded_on_their_own(self):
+    # GET_ITEM_RESPONSE has conflicting and adjacent meetings nested inside the calendar item
+    elements = list(stream_calendar_items(ChunkedConnection(GET_ITEM_RESPONSE)))
+
+    assert len(elements) == 1
+
+  def test_earlier_items_are_released(self):
+    earlier_items = []
+    for element in stream_calendar_items(ChunkedConnection(LIST_EVENTS_RESPONSE)):
+      earlier_items.append([len(sibling) for sibling in element.itersiblings(preceding=True)])
+
+    # by the time we're looking at an item, everything before it has been cleared or dropped
+    assert earlier_items == [[], [0], [0]]
+
+  def test_connections_without_streaming_still_work(self):
+    elements = list(stream_calendar_items(WholeResponseConnection(LIST_EVENTS_RESPONSE)))
+
+    assert len(elements) == 3
+
+  def test_exchange_errors_are_raised(self):
+    with raises(ExchangeItemNotFoundException):
+      list(stream_calendar_items(ChunkedConnection(ITEM_DOES_NOT_EXIST)))
+
+  def test_busy_responses_keep_their_back_off_hint(self):
+    # BackOffMilliseconds comes after the ResponseCode, in a later chunk
+    service = Exchange2010Service(connection=ChunkedConnection(SERVER_BUSY_RESPONSE, chunk_size=64))
+
+    with raises(ExchangeServerBusyException) as excinfo:
+      list(service.send_streaming(soap_request.get_item(exchange_id=TEST_EVENT.id), tags=[T_CALENDAR_ITEM], retries=0))
+
+    assert excinfo.value.back_off == 1.5
+
+  def test_soap_faults_are_raised(self):
+    with raises(FailedExchangeException):
+      list(stream_calendar_items(ChunkedConnection(SOAP_FAULT)))
+
+  def test_garbage_is_raised(self):
+    with raises(FailedExchangeException):
+      list(stream_calendar_items(ChunkedConnection(u'<html><body>Please log in</body></html')))
+
+  def test_responses_without_a_status_are_raised(self):
+    with raises(FailedExchangeException):
+      list(stream_calendar_items(ChunkedConnection(u'<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/"/>')))
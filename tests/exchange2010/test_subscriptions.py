@@ -0,0 +1,264 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import unittest
+from datetime import datetime
+from httpretty import HTTPretty, httprettified
+from pytest import raises
+from pytz import utc
+from pyexchange import Exchange2010Service
+from pyexchange.exchange2010 import Exchange2010StreamingSubscription
+from pyexchange.connection import ExchangeNTLMAuthConnection
+from pyexchange.retry import RetryPolicy
+from pyexchange.exceptions import *  # noqa
+
+from .fixtures import *  # noqa
+
+
+def _get_events(events=NOTIFICATION_EVENTS, more_events=u'false'):
+  return GET_EVENTS_RESPONSE.format(events=events, more_events=more_events)
+
+
+def _streaming_events(events=NOTIFICATION_EVENTS, status=u'OK'):
+  return GET_STREAMING_EVENTS_RESPONSE.format(events=events, status=status)
+
+
+class SubscriptionTestCase(unittest.TestCase):
+
+  def setUp(self):
+    self.sleeps = []
+    self.service = Exchange2010Service(
+      connection=ExchangeNTLMAuthConnection(
+        url=FAKE_EXCHANGE_URL,
+        username=FAKE_EXCHANGE_USERNAME,
+        password=FAKE_EXCHANGE_PASSWORD,
+        retry_policy=RetryPolicy(sleep=self.sleeps.append),
+      ),
+      retry_policy=RetryPolicy(sleep=self.sleeps.append),
+    )
+
+
+class Test_PullSubscriptions(SubscriptionTestCase):
+
+  @httprettified
+  def test_subscribe(self):
+    self.requests_sent = register_responses(SUBSCRIBE_RESPONSE.format(subscription_id=u'sub1', watermark=u'wm0'))
+
+    subscription = self.service.subscribe(folder_ids=[u'calendar', TEST_FOLDER.id], event_types=[u'created', u'deleted'], timeout=10)
+
+    assert subscription.id == u'sub1'
+    assert subscription.watermark == u'wm0'
+    assert u'<t:DistinguishedFolderId Id="calendar"/>' in self.requests_sent[0]
+    assert u'<t:FolderId Id="%s"/>' % TEST_FOLDER.id in self.requests_sent[0]
+    assert u'<t:EventType>DeletedEvent</t:EventType>' in self.requests_sent[0]
+    assert u'<t:Timeout>10</t:Timeout>' in self.requests_sent[0]
+
+  def test_unknown_event_types_are_rejected(self):
+    with raises(ValueError):
+      self.service.subscribe(event_types=[u'exploded'])
+
+  def test_timeout_must_be_in_range(self):
+    with raises(ValueError):
+      self.service.subscribe(timeout=0)
+
+  @httprettified
+  def test_get_events(self):
+    self.requests_sent = register_responses(SUBSCRIBE_RESPONSE.format(subscription_id=u'sub1', watermark=u'wm0'), _get_events())
+    subscription = self.service.subscribe()
+
+    notifications = list(subscription.get_events())
+
+    assert [n.type for n in notifications] == [u'created', u'moved']
+    created, moved = notifications
+    assert created.item_id == u'created1'
+    assert created.change_key == u'ck1'
+    assert created.parent_folder_id == u'calendar1'
+    assert created.timestamp == datetime(2013, 7, 1, 10, 0, 0, tzinfo=utc)
+    assert moved.old_item_id == u'moved0'
+    assert moved.old_parent_folder_id == u'calendar1'
+    assert subscription.watermark == u'wm3'
+    assert u'<m:Watermark>wm0</m:Watermark>' in self.requests_sent[1]
+
+  @httprettified
+  def test_get_events_asks_again_while_there_are_more(self):
+    self.requests_sent = register_responses(
+      SUBSCRIBE_RESPONSE.format(subscription_id=u'sub1', watermark=u'wm0'),
+      _get_events(more_events=u'true'),
+      _get_events(events=u''),
+    )
+    subscription = self.service.subscribe()
+
+    assert len(list(subscription.get_events())) == 2
+    assert u'<m:Watermark>wm3</m:Watermark>' in self.requests_sent[2]
+
+  @httprettified
+  def test_get_events_keeps_the_pages_it_has_when_a_later_one_fails(self):
+    self.requests_sent = register_responses(
+      SUBSCRIBE_RESPONSE.format(subscription_id=u'sub1', watermark=u'wm0'),
+      _get_events(more_events=u'true'),
+      SUBSCRIPTION_EXPIRED_RESPONSE,
+    )
+    subscription = self.service.subscribe()
+    notifications = []
+
+    with raises(ExchangeSubscriptionExpiredException):
+      for notification in subscription.get_events():
+        notifications.append(notification)
+
+    assert [n.item_id for n in notifications] == [u'created1', u'moved1']
+    assert subscription.watermark == u'wm3'
+
+  @httprettified
+  def test_the_watermark_waits_until_the_page_has_been_handed_out(self):
+    self.requests_sent = register_responses(SUBSCRIBE_RESPONSE.format(subscription_id=u'sub1', watermark=u'wm0'), _get_events())
+    subscription = self.service.subscribe()
+
+    next(subscription.get_events())
+
+    assert subscription.watermark == u'wm0'
+
+  @httprettified
+  def test_iter_events_resubscribes_after_the_last_page_it_delivered(self):
+    self.requests_sent = register_responses(
+      SUBSCRIBE_RESPONSE.format(subscription_id=u'sub1', watermark=u'wm0'),
+      _get_events(more_events=u'true'),
+      SUBSCRIPTION_EXPIRED_RESPONSE,
+      SUBSCRIBE_RESPONSE.format(subscription_id=u'sub2', watermark=u'wm3'),
+      _get_events(),
+    )
+    subscription = self.service.subscribe()
+    events = subscription.iter_events(poll_interval=5)
+
+    delivered = [next(events).item_id for _ in range(3)]
+
+    assert delivered == [u'created1', u'moved1', u'created1']
+    assert u'<t:Watermark>wm3</t:Watermark>' in self.requests_sent[3]
+    assert u'<m:Watermark>wm3</m:Watermark>' in self.requests_sent[4]
+
+  @httprettified
+  def test_iter_events_resubscribes_from_the_watermark(self):
+    self.requests_sent = register_responses(
+      SUBSCRIBE_RESPONSE.format(subscription_id=u'sub1', watermark=u'wm0'),
+      SUBSCRIPTION_EXPIRED_RESPONSE,
+      SUBSCRIBE_RESPONSE.format(subscription_id=u'sub2', watermark=u'wm0'),
+      _get_events(),
+    )
+    subscription = self.service.subscribe()
+
+    events = subscription.iter_events(poll_interval=5)
+    first = next(events)
+
+    assert first.item_id == u'created1'
+    assert subscription.id == u'sub2'
+    assert u'<t:Watermark>wm0</t:Watermark>' in self.requests_sent[2]
+
+  @httprettified
+  def test_iter_events_polls(self):
+    self.requests_sent = register_responses(
+      SUBSCRIBE_RESPONSE.format(subscription_id=u'sub1', watermark=u'wm0'),
+      _get_events(events=u''),
+      _get_events(),
+    )
+    subscription = self.service.subscribe()
+
+    notification = next(subscription.iter_events(poll_interval=5))
+
+    assert notification.item_id == u'created1'
+    assert self.sleeps == [5]
+
+  @httprettified
+  def test_unsubscribe(self):
+    self.requests_sent = register_responses(SUBSCRIBE_RESPONSE.format(subscription_id=u'sub1', watermark=u'wm0'), UNSUBSCRIBE_RESPONSE)
+    subscription = self.service.subscribe()
+
+    subscription.unsubscribe()
+
+    assert subscription.id is None
+    assert u'<m:SubscriptionId>sub1</m:SubscriptionId>' in self.requests_sent[1]
+
+
+class Test_StreamingSubscriptions(SubscriptionTestCase):
+
+  @httprettified
+  def test_get_events_reads_every_envelope(self):
+    self.requests_sent = register_responses(
+      SUBSCRIBE_STREAMING_RESPONSE.format(subscription_id=u'sub1'),
+      [_streaming_events(), _streaming_events(events=u''), _streaming_events(events=u'', status=u'Closed')],
+    )
+    subscription = self.service.subscribe_streaming()
+
+    notifications = list(subscription.get_events(connection_timeout=5))
+
+    assert [n.item_id for n in notifications] == [u'created1', u'moved1']
+    assert u'<m:ConnectionTimeout>5</m:ConnectionTimeout>' in self.requests_sent[1]
+    assert u'<t:SubscriptionId>sub1</t:SubscriptionId>' in self.requests_sent[1]
+    assert u'StreamingSubscriptionRequest' in self.requests_sent[0]
+
+  @httprettified
+  def test_iter_events_reconnects_when_the_connection_closes(self):
+    self.requests_sent = register_responses(
+      SUBSCRIBE_STREAMING_RESPONSE.format(subscription_id=u'sub1'),
+      [_streaming_events(events=u'', status=u'Closed')],
+      [_streaming_events()],
+    )
+    subscription = self.service.subscribe_streaming()
+
+    notification = next(subscription.iter_events())
+
+    assert notification.item_id == u'created1'
+    assert len(self.requests_sent) == 3
+
+  @httprettified
+  def test_iter_events_resubscribes_when_the_subscription_expires(self):
+    self.requests_sent = register_responses(
+      SUBSCRIBE_STREAMING_RESPONSE.format(subscription_id=u'sub1'),
+      [SUBSCRIPTION_EXPIRED_RESPONSE.replace(u'GetEvents', u'GetStreamingEvents')],
+      SUBSCRIBE_STREAMING_RESPONSE.format(subscription_id=u'sub2'),
+      [_streaming_events()],
+    )
+    subscription = self.service.subscribe_streaming()
+
+    next(subscription.iter_events())
+
+    assert subscription.id == u'sub2'
+    assert u'<t:SubscriptionId>sub2</t:SubscriptionId>' in self.requests_sent[3]
+
+  @httprettified
+  def test_iter_events_reconnects_after_connection_errors(self):
+    responses = [
+      (200, SUBSCRIBE_STREAMING_RESPONSE.format(subscription_id=u'sub1')),
+      (503, u''),
+      (200, _streaming_events()),
+    ]
+
+    def next_response(request, uri, headers):
+      status, body = responses.pop(0)
+      return status, headers, body.encode('utf-8')
+
+    HTTPretty.register_uri(HTTPretty.POST, FAKE_EXCHANGE_URL, body=next_response, content_type='text/xml; charset=utf-8')
+    subscription = self.service.subscribe_streaming()
+
+    notification = next(subscription.iter_events())
+
+    assert notification.item_id == u'created1'
+    assert len(self.sleeps) == 1
+
+  @httprettified
+  def test_half_an_envelope_is_an_error(self):
+    self.requests_sent = register_responses(
+      SUBSCRIBE_STREAMING_RESPONSE.format(subscription_id=u'sub1'),
+      [_streaming_events(), _streaming_events()[:200]],
+    )
+    subscription = self.service.subscribe_streaming()
+
+    with raises(FailedExchangeException):
+      list(subscription.get_events())
+
+  def test_connection_timeout_must_be_in_range(self):
+    subscription = Exchange2010StreamingSubscription(service=self.service, id=u'sub1')
+
+    with raises(ValueError):
+      list(subscription.get_events(connection_timeout=31))
@@ -0,0 +1,80 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import unittest
+from httpretty import HTTPretty, httprettified
+from pytest import raises
+from pyexchange import Exchange2010Service
+from pyexchange.connection import ExchangeNTLMAuthConnection
+from pyexchange.exceptions import *  # noqa
+
+from .fixtures import *  # noqa
+
+
+class Test_SyncingACalendar(unittest.TestCase):
+  service = None
+
+  @classmethod
+  def setUpClass(cls):
+    cls.service = Exchange2010Service(
+      connection=ExchangeNTLMAuthConnection(
+        url=FAKE_EXCHANGE_URL,
+        username=FAKE_EXCHANGE_USERNAME,
+        password=FAKE_EXCHANGE_PASSWORD
+      )
+    )
+
+  @httprettified
+  def test_changes_are_sorted_by_kind(self):
+    register_responses(SYNC_FOLDER_ITEMS_RESPONSE.format(state=u'state2', includes_last=u'true'))
+
+    changes = self.service.calendar().sync(state=u'state1')
+
+    assert changes.created == [u'created1', u'created2']
+    assert changes.updated == [u'updated1']
+    assert changes.deleted == [u'deleted1']
+
+  @httprettified
+  def test_returns_the_new_state(self):
+    register_responses(SYNC_FOLDER_ITEMS_RESPONSE.format(state=u'state2', includes_last=u'false'))
+
+    changes = self.service.calendar().sync(state=u'state1')
+
+    assert changes.state == u'state2'
+    assert changes.includes_last_item is False
+
+  @httprettified
+  def test_sends_the_state_and_page_size(self):
+    register_responses(SYNC_FOLDER_ITEMS_RESPONSE.format(state=u'state2', includes_last=u'true'))
+
+    self.service.calendar(id=TEST_FOLDER.id).sync(state=u'state1', max_changes=50)
+
+    request = HTTPretty.last_request.body.decode('utf-8')
+    assert u'<m:SyncState>state1</m:SyncState>' in request
+    assert u'<m:MaxChangesReturned>50</m:MaxChangesReturned>' in request
+    assert u'<t:FolderId Id="%s"/>' % TEST_FOLDER.id in request
+
+  @httprettified
+  def test_first_sync_sends_no_state(self):
+    register_responses(SYNC_FOLDER_ITEMS_RESPONSE.format(state=u'state1', includes_last=u'true'))
+
+    self.service.calendar().sync()
+
+    assert u'SyncState' not in HTTPretty.last_request.body.decode('utf-8')
+
+  def test_max_changes_must_be_in_range(self):
+    with raises(ValueError):
+      self.service.calendar().sync(max_changes=0)
+
+    with raises(ValueError):
+      self.service.calendar().sync(max_changes=513)
+
+  @httprettified
+  def test_invalid_state_is_raised(self):
+    register_responses(ITEM_DOES_NOT_EXIST.replace(u'ErrorItemNotFound', u'ErrorInvalidSyncStateData'))
+
+    with raises(FailedExchangeException):
+      self.service.calendar().sync(state=u'garbage')
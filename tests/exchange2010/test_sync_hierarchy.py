@@ -0,0 +1,121 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import unittest
+from httpretty import HTTPretty, httprettified
+from pytest import raises
+from pyexchange import Exchange2010Service
+from pyexchange.connection import ExchangeNTLMAuthConnection
+from pyexchange.exceptions import *  # noqa
+
+from .fixtures import *  # noqa
+
+
+class Test_SyncingTheFolderHierarchy(unittest.TestCase):
+  service = None
+
+  @classmethod
+  def setUpClass(cls):
+    cls.service = Exchange2010Service(
+      connection=ExchangeNTLMAuthConnection(
+        url=FAKE_EXCHANGE_URL,
+        username=FAKE_EXCHANGE_USERNAME,
+        password=FAKE_EXCHANGE_PASSWORD
+      )
+    )
+
+  @httprettified
+  def test_changes_are_sorted_by_kind(self):
+    register_responses(SYNC_FOLDER_HIERARCHY_RESPONSE.format(state=u'state2', includes_last=u'true'))
+
+    changes = self.service.folder().sync_hierarchy(state=u'state1')
+
+    assert [folder.id for folder in changes.created] == [u'created1']
+    assert [folder.id for folder in changes.updated] == [u'updated1']
+    assert changes.deleted == [u'deleted1']
+
+  @httprettified
+  def test_changed_folders_are_parsed(self):
+    register_responses(SYNC_FOLDER_HIERARCHY_RESPONSE.format(state=u'state2', includes_last=u'true'))
+
+    changes = self.service.folder().sync_hierarchy(state=u'state1')
+
+    created = changes.created[0]
+    assert created.display_name == u'conference2'
+    assert created.folder_type == u'CalendarFolder'
+    assert created.parent_id == TEST_FOLDER.id
+    assert changes.updated[0].folder_type == u'Folder'
+
+  @httprettified
+  def test_returns_the_new_state(self):
+    register_responses(SYNC_FOLDER_HIERARCHY_RESPONSE.format(state=u'state2', includes_last=u'false'))
+
+    changes = self.service.folder().sync_hierarchy(state=u'state1')
+
+    assert changes.state == u'state2'
+    assert changes.includes_last_folder is False
+
+  @httprettified
+  def test_sends_the_state_and_folder(self):
+    register_responses(SYNC_FOLDER_HIERARCHY_RESPONSE.format(state=u'state2', includes_last=u'true'))
+
+    self.service.folder().sync_hierarchy(state=u'state1', folder_id=u'calendar')
+
+    request = HTTPretty.last_request.body.decode('utf-8')
+    assert u'<m:SyncState>state1</m:SyncState>' in request
+    assert u'<t:DistinguishedFolderId Id="calendar"/>' in request
+
+  @httprettified
+  def test_first_sync_of_the_whole_mailbox_sends_no_state_or_folder(self):
+    register_responses(SYNC_FOLDER_HIERARCHY_RESPONSE.format(state=u'state1', includes_last=u'true'))
+
+    self.service.folder().sync_hierarchy()
+
+    request = HTTPretty.last_request.body.decode('utf-8')
+    assert u'SyncState' not in request
+    assert u'SyncFolderId' not in request
+
+  @httprettified
+  def test_invalid_state_is_raised(self):
+    register_responses(ITEM_DOES_NOT_EXIST.replace(u'ErrorItemNotFound', u'ErrorInvalidSyncStateData'))
+
+    with raises(FailedExchangeException):
+      self.service.folder().sync_hierarchy(state=u'garbage')
+
+
+class Test_FindingFoldersDeep(unittest.TestCase):
+  service = None
+
+  @classmethod
+  def setUpClass(cls):
+    cls.service = Exchange2010Service(
+      connection=ExchangeNTLMAuthConnection(
+        url=FAKE_EXCHANGE_URL,
+        username=FAKE_EXCHANGE_USERNAME,
+        password=FAKE_EXCHANGE_PASSWORD
+      )
+    )
+
+  @httprettified
+  def test_deep_traversal_is_one_request(self):
+    HTTPretty.register_uri(HTTPretty.POST, FAKE_EXCHANGE_URL, body=FIND_FOLDER_RESPONSE.encode('utf-8'), content_type='text/xml; charset=utf-8')
+
+    folders = self.service.folder().find_folder(parent_id=u'msgfolderroot', traversal=u'Deep')
+
+    assert len(folders) == 4
+    assert u'Traversal="Deep"' in HTTPretty.last_request.body.decode('utf-8')
+
+  @httprettified
+  def test_shallow_traversal_is_the_default(self):
+    HTTPretty.register_uri(HTTPretty.POST, FAKE_EXCHANGE_URL, body=FIND_FOLDER_RESPONSE.encode('utf-8'), content_type='text/xml; charset=utf-8')
+
+    self.service.folder().find_folder(parent_id=TEST_FOLDER.id)
+
+    assert u'Traversal="Shallow"' in HTTPretty.last_request.body.decode('utf-8')
+
+  def test_unknown_traversals_are_rejected(self):
+    with raises(ValueError):
+      self.service.folder().find_folder(parent_id=TEST_FOLDER.id, traversal=u'SoftDeleted')
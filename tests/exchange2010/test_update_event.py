@@ -10,6 +10,7 @@ from pytest import raises
 from pyexchange import Exchange2010Service
 
 from pyexchange.connection import ExchangeNTLMAuthConnection
+from pyexchange.exceptions import ExchangeIrresolvableConflictException
 
 from .fixtures import *  # noqa
 
@@ -431,3 +432,95 @@ class Test_UpdatingAnEvent(unittest.TestCase):
     with raises(ValueError):
       self.event.update(calendar_item_update_operation_type='SendToTheWholeWorld')
       assert u"SendToTheWholeWorld" in HTTPretty.last_request.body.decode('utf-8')
+
+  @httprettified
+  def test_updates_overwrite_by_default(self):
+
+    HTTPretty.register_uri(HTTPretty.POST, FAKE_EXCHANGE_URL,
+                           responses=[
+                               self.get_change_key_response,
+                               self.update_event_response,
+                            ])
+
+    self.event.location = TEST_EVENT_UPDATED.location
+    self.event.update()
+
+    assert u'ConflictResolution="AlwaysOverwrite"' in HTTPretty.last_request.body.decode('utf-8')
+
+  @httprettified
+  def test_optimistic_updates_skip_refreshing_the_change_key(self):
+
+    HTTPretty.register_uri(HTTPretty.POST, FAKE_EXCHANGE_URL,
+                           responses=[
+                               self.update_event_response,
+                            ])
+
+    self.event.location = TEST_EVENT_UPDATED.location
+    self.event.update(optimistic=True)
+
+    body = HTTPretty.last_request.body.decode('utf-8')
+    assert u'UpdateItem' in body
+    assert u'ConflictResolution="AutoResolve"' in body
+    assert u'ChangeKey="%s"' % TEST_EVENT.change_key in body
+    assert not [request for request in HTTPretty.latest_requests if b'IdOnly' in request.body]
+
+  @httprettified
+  def test_optimistic_updates_retry_with_a_fresh_change_key(self):
+    conflict_response = HTTPretty.Response(
+      body=ITEM_DOES_NOT_EXIST.replace(u'ErrorItemNotFound', u'ErrorIrresolvableConflict').encode('utf-8'),
+      status=200, content_type='text/xml; charset=utf-8',
+    )
+
+    HTTPretty.register_uri(HTTPretty.POST, FAKE_EXCHANGE_URL,
+                           responses=[
+                               conflict_response,
+                               self.get_change_key_response,
+                               self.update_event_response,
+                            ])
+
+    self.event.location = TEST_EVENT_UPDATED.location
+    self.event.update(optimistic=True)
+
+    assert u'ConflictResolution="AutoResolve"' in HTTPretty.last_request.body.decode('utf-8')
+    assert [request for request in HTTPretty.latest_requests if b'IdOnly' in request.body]
+    assert not self.event._dirty_attributes
+
+  @httprettified
+  def test_never_overwrite_updates_raise_conflicts_instead_of_retrying(self):
+    conflict_response = HTTPretty.Response(
+      body=ITEM_DOES_NOT_EXIST.replace(u'ErrorItemNotFound', u'ErrorIrresolvableConflict').encode('utf-8'),
+      status=200, content_type='text/xml; charset=utf-8',
+    )
+
+    HTTPretty.register_uri(HTTPretty.POST, FAKE_EXCHANGE_URL,
+                           responses=[
+                               conflict_response,
+                               self.get_change_key_response,
+                               self.update_event_response,
+                            ])
+
+    self.event.location = TEST_EVENT_UPDATED.location
+    with raises(ExchangeIrresolvableConflictException):
+      self.event.update(optimistic=True, conflict_resolution=u'NeverOverwrite')
+
+    assert not [request for request in HTTPretty.latest_requests if b'IdOnly' in request.body]
+    assert self.event._dirty_attributes
+
+  @httprettified
+  def test_change_key_is_taken_from_the_update_response(self):
+    new_change_key = UPDATE_ITEM_RESPONSE.replace(u'ChangeKey="%s"' % TEST_EVENT.change_key, u'ChangeKey="afterupdate"')
+
+    HTTPretty.register_uri(HTTPretty.POST, FAKE_EXCHANGE_URL,
+                           responses=[
+                               HTTPretty.Response(body=new_change_key.encode('utf-8'), status=200, content_type='text/xml; charset=utf-8'),
+                            ])
+
+    self.event.location = TEST_EVENT_UPDATED.location
+    self.event.update(optimistic=True)
+
+    assert self.event.change_key == u'afterupdate'
+
+  def test_wrong_conflict_resolution(self):
+    self.event.location = TEST_EVENT_UPDATED.location
+    with raises(ValueError):
+      self.event.update(optimistic=True, conflict_resolution=u'Whatever')
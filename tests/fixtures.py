@@ -7,3 +7,18 @@ Unless required by applicable law or agreed to in writing, software?distributed
 FAKE_EXCHANGE_URL = u'http://10.0.0.0/nothing'
 FAKE_EXCHANGE_USERNAME = u'FAKEDOMAIN\\nobody'
 FAKE_EXCHANGE_PASSWORD = u'totallyfake'
+
+
+class FakeClock(object):
+  """ A clock for code that takes clock and sleep functions. It only moves when something sleeps or a test sets now. """
+
+  def __init__(self):
+    self.now = 0.0
+    self.sleeps = []
+
+  def __call__(self):
+    return self.now
+
+  def sleep(self, seconds):
+    self.sleeps.append(seconds)
+    self.now += seconds
@@ -0,0 +1,89 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import pytest
+
+from pyexchange.cache import MemoryEventCache, SQLiteEventCache
+
+from .fixtures import FakeClock
+
+
+@pytest.fixture(params=[u'memory', u'sqlite'])
+def make_cache(request):
+  def make(**kwargs):
+    if request.param == u'memory':
+      return MemoryEventCache(**kwargs)
+    return SQLiteEventCache(u':memory:', **kwargs)
+  return make
+
+
+def test_stores_and_returns_events(make_cache):
+  cache = make_cache()
+  cache.set(u'id1', u'ck1', b'<xml/>')
+
+  entry = cache.get(u'id1')
+
+  assert entry.change_key == u'ck1'
+  assert entry.data == b'<xml/>'
+  assert cache.get(u'id2') is None
+
+
+def test_discard_and_clear(make_cache):
+  cache = make_cache()
+  cache.set(u'id1', u'ck1', b'1')
+  cache.set(u'id2', u'ck2', b'2')
+
+  cache.discard(u'id1')
+  assert cache.get(u'id1') is None
+  assert len(cache) == 1
+
+  cache.clear()
+  assert len(cache) == 0
+
+
+def test_entries_expire(make_cache):
+  clock = FakeClock()
+  cache = make_cache(ttl=60, clock=clock)
+  cache.set(u'id1', u'ck1', b'1')
+
+  clock.now = 59
+  assert cache.get(u'id1') is not None
+
+  clock.now = 60
+  assert cache.get(u'id1') is None
+
+
+def test_entries_are_fresh_until_revalidate_after(make_cache):
+  clock = FakeClock()
+  cache = make_cache(revalidate_after=10, clock=clock)
+  cache.set(u'id1', u'ck1', b'1')
+
+  assert cache.is_fresh(cache.get(u'id1'))
+
+  clock.now = 10
+  assert not cache.is_fresh(cache.get(u'id1'))
+
+
+def test_memory_cache_drops_least_recently_used():
+  cache = MemoryEventCache(max_size=2)
+  cache.set(u'id1', u'ck1', b'1')
+  cache.set(u'id2', u'ck2', b'2')
+  cache.get(u'id1')
+
+  cache.set(u'id3', u'ck3', b'3')
+
+  assert cache.get(u'id2') is None
+  assert cache.get(u'id1') is not None
+  assert cache.get(u'id3') is not None
+
+
+def test_sqlite_cache_survives_reopening(tmpdir):
+  path = str(tmpdir.join(u'events.db'))
+  cache = SQLiteEventCache(path)
+  cache.set(u'id1', u'ck1', b'1')
+  cache.close()
+
+  assert SQLiteEventCache(path).get(u'id1').change_key == u'ck1'
@@ -1,15 +1,21 @@
+# -*- coding: utf-8 -*-
 """
 (c) 2013 LinkedIn Corp. All rights reserved.
 Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
 
 Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 """
+import io
 import httpretty
+import requests
+import socket
 import unittest
+from multiprocessing.pool import ThreadPool
 from mock import patch, MagicMock, call
 from pytest import raises
-from pyexchange.connection import ExchangeNTLMAuthConnection
+from pyexchange.connection import ExchangeNTLMAuthConnection, enable_wire_trace, wire_log
 from pyexchange.exceptions import *
+from pyexchange.retry import RetryPolicy
 
 from .fixtures import *
 
@@ -82,3 +88,204 @@ def test_session_is_cached():
 
     # assert we only get called once, after that it's cached
     manager.MockSession.assert_called_once_with()
+
+
+@httpretty.activate
+def test_wire_trace_writes_raw_bodies(tmpdir):
+
+  httpretty.register_uri(httpretty.POST, FAKE_EXCHANGE_URL,
+                           status=200,
+                           body=u"<yo>réponse</yo>".encode('utf-8'), )
+
+  trace_file = str(tmpdir.join('wire.log'))
+  handler = enable_wire_trace(trace_file)
+
+  try:
+    connection = ExchangeNTLMAuthConnection(url=FAKE_EXCHANGE_URL,
+                                            username=FAKE_EXCHANGE_USERNAME,
+                                            password=FAKE_EXCHANGE_PASSWORD)
+    connection.send(u"<hello>requête</hello>".encode('utf-8'))
+  finally:
+    wire_log.removeHandler(handler)
+    handler.close()
+
+  with io.open(trace_file, encoding='utf-8') as f:
+    trace = f.read()
+
+  assert u"<hello>requête</hello>" in trace
+  assert u"<yo>réponse</yo>" in trace
+
+
+@httpretty.activate
+def test_response_body_is_decoded_once():
+
+  httpretty.register_uri(httpretty.POST, FAKE_EXCHANGE_URL,
+                           status=200,
+                           body=u"<yo/>", )
+
+  decoded = []
+  text = requests.Response.text
+
+  def counting_text(response):
+    decoded.append(1)
+    return text.fget(response)
+
+  with patch.object(requests.Response, 'text', property(counting_text)):
+    connection = ExchangeNTLMAuthConnection(url=FAKE_EXCHANGE_URL,
+                                            username=FAKE_EXCHANGE_USERNAME,
+                                            password=FAKE_EXCHANGE_PASSWORD)
+    assert connection.send(b"test") == u"<yo/>"
+
+  assert len(decoded) == 1
+
+
+def connection_without_sleeping():
+  return ExchangeNTLMAuthConnection(url=FAKE_EXCHANGE_URL,
+                                    username=FAKE_EXCHANGE_USERNAME,
+                                    password=FAKE_EXCHANGE_PASSWORD,
+                                    retry_policy=RetryPolicy(sleep=lambda seconds: None))
+
+
+def register_statuses(*statuses):
+  requests_sent = []
+  statuses = list(statuses)
+
+  def next_response(request, uri, headers):
+    requests_sent.append(request)
+    return statuses.pop(0), headers, b"<ok/>"
+
+  httpretty.register_uri(httpretty.POST, FAKE_EXCHANGE_URL, body=next_response, content_type='text/xml; charset=utf-8')
+  return requests_sent
+
+
+@httpretty.activate
+def test_gateway_errors_are_retried():
+  requests_sent = register_statuses(503, 502, 200)
+
+  assert connection_without_sleeping().send(b'yo', retries=2) == u"<ok/>"
+  assert len(requests_sent) == 3
+
+
+@httpretty.activate
+def test_gateway_errors_are_raised_when_retries_run_out():
+  requests_sent = register_statuses(503, 503)
+
+  with raises(ExchangeTransientConnectionException):
+    connection_without_sleeping().send(b'yo', retries=1)
+
+  assert len(requests_sent) == 2
+
+
+@httpretty.activate
+def test_client_errors_are_not_retried():
+  requests_sent = register_statuses(401, 200)
+
+  with raises(FailedExchangeException):
+    connection_without_sleeping().send(b'yo', retries=2)
+
+  assert len(requests_sent) == 1
+
+
+@httpretty.activate
+def test_soap_faults_are_handed_back():
+  register_statuses(500)
+
+  assert connection_without_sleeping().send(b'yo') == u"<ok/>"
+
+
+def test_connection_errors_are_retried_and_timeout_is_passed_on():
+  connection = connection_without_sleeping()
+  response = MagicMock(status_code=200, text=u"<ok/>", content=b"<ok/>", encoding='utf-8')
+  connection.session = MagicMock()
+  connection.session.post.side_effect = [requests.exceptions.ConnectionError(u"nobody home"), response]
+
+  assert connection.send(b'yo', retries=2, timeout=12) == u"<ok/>"
+  assert connection.session.post.call_count == 2
+
+  timeouts = [kwargs['timeout'] for args, kwargs in connection.session.post.call_args_list]
+  assert 0 < timeouts[0] <= 12
+  assert timeouts[1] <= timeouts[0]
+
+
+def test_streamed_responses_stop_at_the_deadline():
+  now = [0]
+  connection = ExchangeNTLMAuthConnection(url=FAKE_EXCHANGE_URL,
+                                          username=FAKE_EXCHANGE_USERNAME,
+                                          password=FAKE_EXCHANGE_PASSWORD,
+                                          retry_policy=RetryPolicy(sleep=lambda seconds: None, clock=lambda: now[0]))
+
+  def trickle(chunk_size):
+    for chunk in (b"<a>", b"<b/>", b"</a>"):
+      now[0] += 10
+      yield chunk
+
+  response = MagicMock(status_code=200, encoding='utf-8')
+  response.iter_content.side_effect = trickle
+  connection.session = MagicMock()
+  connection.session.post.return_value = response
+
+  received = []
+  with raises(ExchangeTransientConnectionException):
+    for chunk in connection.send_streaming(b'yo', timeout=25):
+      received.append(chunk)
+
+  assert received == [b"<a>", b"<b/>"]
+  assert response.close.called
+
+
+def test_pool_settings_are_applied_to_the_session():
+  connection = ExchangeNTLMAuthConnection(url=FAKE_EXCHANGE_URL,
+                                          username=FAKE_EXCHANGE_USERNAME,
+                                          password=FAKE_EXCHANGE_PASSWORD,
+                                          pool_connections=2, pool_maxsize=25, pool_block=True)
+
+  pool_settings = connection.build_session().get_adapter(FAKE_EXCHANGE_URL).poolmanager.connection_pool_kw
+
+  assert pool_settings['maxsize'] == 25
+  assert pool_settings['block'] is True
+
+
+def test_tcp_keepalive_is_turned_on_for_pooled_sockets():
+  connection = ExchangeNTLMAuthConnection(url=FAKE_EXCHANGE_URL,
+                                          username=FAKE_EXCHANGE_USERNAME,
+                                          password=FAKE_EXCHANGE_PASSWORD,
+                                          tcp_keepalive=30)
+
+  pool_settings = connection.build_session().get_adapter(FAKE_EXCHANGE_URL).poolmanager.connection_pool_kw
+
+  assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in pool_settings['socket_options']
+
+
+def test_keep_alive_can_be_turned_off():
+  connection = ExchangeNTLMAuthConnection(url=FAKE_EXCHANGE_URL,
+                                          username=FAKE_EXCHANGE_USERNAME,
+                                          password=FAKE_EXCHANGE_PASSWORD,
+                                          keep_alive=False)
+
+  assert connection.build_session().headers['Connection'] == 'close'
+
+
+def test_threads_share_one_session():
+  connection = ExchangeNTLMAuthConnection(url=FAKE_EXCHANGE_URL,
+                                          username=FAKE_EXCHANGE_USERNAME,
+                                          password=FAKE_EXCHANGE_PASSWORD)
+
+  pool = ThreadPool(8)
+  try:
+    sessions = pool.map(lambda _: connection.build_session(), range(32))
+  finally:
+    pool.close()
+    pool.join()
+
+  assert len(set(id(session) for session in sessions)) == 1
+
+
+def test_closing_starts_a_new_session():
+  connection = ExchangeNTLMAuthConnection(url=FAKE_EXCHANGE_URL,
+                                          username=FAKE_EXCHANGE_USERNAME,
+                                          password=FAKE_EXCHANGE_PASSWORD)
+  session = connection.build_session()
+
+  connection.close()
+
+  assert connection.build_session() is not session
@@ -0,0 +1,130 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+from pytz import timezone, utc
+
+from pyexchange import export, serialization
+from pyexchange.base.calendar import ExchangeEventOrganizer, ExchangeEventResponse
+from pyexchange.exchange2010 import Exchange2010CalendarEventRecord
+
+START = datetime(2050, 5, 1, 9, tzinfo=utc)
+END = datetime(2050, 5, 1, 10, tzinfo=utc)
+
+
+def make_events(count):
+  return [
+    Exchange2010CalendarEventRecord(
+      id=u'id%s' % i,
+      subject=u'event %s' % i,
+      start=START,
+      end=END,
+      organizer=ExchangeEventOrganizer(name=u'Org', email=u'org@example.com'),
+      attendees=[ExchangeEventResponse(name=u'Ann', email=u'ann@example.com', response=u'Accept', last_response=None, required=True)],
+      resources=[ExchangeEventResponse(name=u'Room', email=u'room@example.com', response=None, last_response=None, required=True)],
+    )
+    for i in range(count)
+  ]
+
+
+def test_events_are_batched():
+  batches = list(export.event_batches(make_events(5), batch_size=2))
+
+  assert [len(batch.events[u'id']) for batch in batches] == [2, 2, 1]
+  assert batches[0].events[u'organizer_email'] == [u'org@example.com', u'org@example.com']
+  assert batches[0].attendees[u'event_id'] == [u'id0', u'id0', u'id1', u'id1']
+  assert batches[0].attendees[u'is_resource'] == [False, True, False, True]
+
+
+def test_batch_size_must_be_positive():
+  with pytest.raises(ValueError):
+    list(export.event_batches(make_events(1), batch_size=0))
+
+
+def test_batches_are_built_as_events_are_consumed():
+  consumed = []
+
+  def events():
+    for event in make_events(4):
+      consumed.append(event.id)
+      yield event
+
+  batches = export.event_batches(events(), batch_size=2)
+  next(batches)
+
+  assert consumed == [u'id0', u'id1']
+
+
+def test_write_csv():
+  events_file, attendees_file = io.StringIO(), io.StringIO()
+
+  assert export.write(make_events(2), events_file, attendees_file, format=u'csv') == 2
+
+  events = list(csv.DictReader(io.StringIO(events_file.getvalue())))
+  attendees = list(csv.DictReader(io.StringIO(attendees_file.getvalue())))
+
+  assert [event[u'subject'] for event in events] == [u'event 0', u'event 1']
+  assert events[0][u'start'] == START.isoformat()
+  assert events[0][u'location'] == u''
+  assert len(attendees) == 4
+  assert attendees[1][u'email'] == u'room@example.com'
+
+
+def test_write_json_lines():
+  events_file, attendees_file = io.StringIO(), io.StringIO()
+
+  export.write(make_events(2), events_file, attendees_file, format=u'jsonl')
+
+  events = [json.loads(line) for line in events_file.getvalue().splitlines()]
+  attendees = [json.loads(line) for line in attendees_file.getvalue().splitlines()]
+
+  assert events[1][u'id'] == u'id1'
+  assert events[1][u'end'] == u'2050-05-01T10:00:00Z'
+  assert events[1][u'location'] is None
+  assert attendees[0] == {
+    u'event_id': u'id0', u'email': u'ann@example.com', u'name': u'Ann', u'required': True, u'response': u'Accept',
+    u'last_response': None, u'is_resource': False,
+  }
+
+
+def test_json_lines_times_are_utc_like_as_json():
+  events_file = io.StringIO()
+  start = START.astimezone(timezone(u'US/Pacific'))
+  event = Exchange2010CalendarEventRecord(id=u'id0', start=start, end=END)
+
+  export.write([event], events_file, format=u'jsonl')
+
+  row = json.loads(events_file.getvalue())
+  assert row[u'start'] == serialization.event_to_dict(event)[u'start'] == u'2050-05-01T09:00:00Z'
+
+
+def test_attendees_are_optional():
+  events_file = io.StringIO()
+
+  assert export.write(make_events(3), events_file, format=u'jsonl') == 3
+  assert len(events_file.getvalue().splitlines()) == 3
+
+
+def test_unknown_formats_are_rejected():
+  with pytest.raises(ValueError):
+    export.write(make_events(1), io.StringIO(), format=u'xlsx')
+
+
+def test_write_parquet(tmpdir):
+  pq = pytest.importorskip('pyarrow.parquet')
+  events_path, attendees_path = str(tmpdir.join(u'events.parquet')), str(tmpdir.join(u'attendees.parquet'))
+
+  assert export.write(make_events(3), events_path, attendees_path, format=u'parquet', batch_size=2) == 3
+
+  events = pq.read_table(events_path)
+  assert events.num_rows == 3
+  assert events.column(u'subject').to_pylist() == [u'event 0', u'event 1', u'event 2']
+  assert pq.read_table(attendees_path).num_rows == 6
@@ -0,0 +1,100 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import random
+from datetime import datetime, time, timedelta
+
+from pytz import timezone, utc
+
+from pyexchange.exchange2010 import Exchange2010CalendarEventRecord
+from pyexchange.intervals import EventIntervalIndex
+
+DAY = datetime(2030, 5, 2, tzinfo=utc)
+
+
+def make_event(id, start_hour, end_hour, **properties):
+  return Exchange2010CalendarEventRecord(
+    id=id, start=DAY + timedelta(hours=start_hour), end=DAY + timedelta(hours=end_hour), **properties
+  )
+
+
+def ids(events):
+  return [event.id for event in events]
+
+
+def hours(slots):
+  return [((start - DAY).total_seconds() / 3600, (end - DAY).total_seconds() / 3600) for start, end in slots]
+
+
+def test_overlapping():
+  index = EventIntervalIndex([make_event(u'c', 5, 6), make_event(u'a', 1, 3), make_event(u'long', 0, 10), make_event(u'b', 2, 4)])
+
+  assert ids(index.overlapping(DAY + timedelta(hours=3), DAY + timedelta(hours=5))) == [u'long', u'b']
+  assert ids(index.overlapping(DAY + timedelta(hours=11), DAY + timedelta(hours=12))) == []
+
+
+def test_at():
+  index = EventIntervalIndex([make_event(u'a', 1, 3), make_event(u'b', 3, 4)])
+
+  assert ids(index.at(DAY + timedelta(hours=3))) == [u'b']
+  assert ids(index.at(DAY + timedelta(hours=2))) == [u'a']
+  assert ids(index.at(DAY + timedelta(hours=4))) == []
+
+
+def test_queries_match_a_scan():
+  rng = random.Random(1)
+  events = []
+  for i in range(300):
+    start = rng.randrange(0, 24 * 60)
+    events.append(Exchange2010CalendarEventRecord(
+      id=u'id%s' % i, start=DAY + timedelta(minutes=start), end=DAY + timedelta(minutes=start + rng.choice([15, 30, 60, 600])),
+    ))
+  index = EventIntervalIndex(events)
+  by_start = sorted(events, key=lambda event: event.start)
+
+  for _ in range(100):
+    start = DAY + timedelta(minutes=rng.randrange(0, 30 * 60))
+    end = start + timedelta(minutes=rng.randrange(1, 120))
+
+    expected = [event for event in by_start if event.start < end and event.end > start]
+    assert sorted(ids(index.overlapping(start, end))) == sorted(ids(expected))
+
+  expected_pairs = set(
+    frozenset([a.id, b.id]) for a in events for b in events if a.id != b.id and a.start < b.end and b.start < a.end
+  )
+  assert set(frozenset([a.id, b.id]) for a, b in index.conflicts()) == expected_pairs
+
+
+def test_conflicts_leave_out_events_that_only_touch():
+  index = EventIntervalIndex([make_event(u'a', 1, 3), make_event(u'b', 3, 4), make_event(u'c', 2, 5)])
+
+  assert [(a.id, b.id) for a, b in index.conflicts()] == [(u'a', u'c'), (u'c', u'b')]
+
+
+def test_free_slots():
+  index = EventIntervalIndex([
+    make_event(u'a', 9, 10), make_event(u'b', 9.5, 11), make_event(u'c', 12, 12.25), make_event(u'free', 14, 16, availability=u'Free'),
+  ])
+
+  slots = index.free_slots(DAY + timedelta(hours=8), DAY + timedelta(hours=17), min_duration=timedelta(minutes=30))
+
+  assert hours(slots) == [(8, 9), (11, 12), (12.25, 17)]
+
+
+def test_free_slots_keep_to_working_hours():
+  tz = timezone(u'America/New_York')
+  index = EventIntervalIndex([make_event(u'a', 14, 15)])
+
+  # 9 to 5 in New York is 13:00 to 21:00 UTC in May
+  slots = index.free_slots(DAY, DAY + timedelta(days=2), working_hours=(time(9), time(17)), tz=tz)
+
+  assert hours(slots) == [(13, 14), (15, 21), (37, 45)]
+
+
+def test_events_without_times_are_left_out():
+  index = EventIntervalIndex([Exchange2010CalendarEventRecord(id=u'no times'), make_event(u'a', 1, 2)])
+
+  assert len(index) == 1
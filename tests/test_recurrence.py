@@ -0,0 +1,107 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+from datetime import date, datetime, timedelta
+from itertools import islice
+
+import pytest
+from pytz import timezone, utc
+
+from pyexchange import recurrence
+from pyexchange.base.calendar import ExchangeModifiedOccurrence
+from pyexchange.exchange2010 import Exchange2010CalendarEventRecord
+
+START = datetime(2050, 5, 20, 9, tzinfo=utc)  # a Friday
+
+
+def master(recurrence_type, start=START, duration=timedelta(hours=1), **properties):
+  return Exchange2010CalendarEventRecord(start=start, end=start + duration, recurrence=recurrence_type, **properties)
+
+
+def starts(occurrences):
+  return [occurrence.start for occurrence in occurrences]
+
+
+def test_daily():
+  event = master(u'daily', recurrence_interval=2, recurrence_end_date=date(2050, 5, 26))
+
+  occurrences = list(recurrence.expand(event))
+
+  assert starts(occurrences) == [START, START + timedelta(days=2), START + timedelta(days=4), START + timedelta(days=6)]
+  assert [occurrence.index for occurrence in occurrences] == [1, 2, 3, 4]
+  assert occurrences[0].end == START + timedelta(hours=1)
+
+
+def test_weekly():
+  event = master(u'weekly', recurrence_days=u'Monday Friday', recurrence_interval=2, recurrence_end_date=date(2050, 6, 30))
+
+  days = [occurrence.start.date() for occurrence in recurrence.expand(event)]
+
+  assert days == [date(2050, 5, 20), date(2050, 5, 30), date(2050, 6, 3), date(2050, 6, 13), date(2050, 6, 17), date(2050, 6, 27)]
+
+
+def test_weekly_needs_days():
+  with pytest.raises(ValueError):
+    list(recurrence.expand(master(u'weekly', recurrence_days=u'Caturday')))
+
+
+def test_monthly_falls_back_to_the_last_day_of_the_month():
+  start = datetime(2050, 1, 31, 9, tzinfo=utc)
+  event = master(u'monthly', start=start, recurrence_end_date=date(2050, 4, 30))
+
+  assert [occurrence.start.date() for occurrence in recurrence.expand(event)] == [
+    date(2050, 1, 31), date(2050, 2, 28), date(2050, 3, 31), date(2050, 4, 30),
+  ]
+
+
+def test_yearly():
+  event = master(u'yearly', recurrence_end_date=date(2052, 12, 31))
+
+  assert [occurrence.start.year for occurrence in recurrence.expand(event)] == [2050, 2051, 2052]
+
+
+def test_series_without_an_end_go_on():
+  occurrences = list(islice(recurrence.expand(master(u'daily')), 1000))
+
+  assert occurrences[-1].start == START + timedelta(days=999)
+
+
+@pytest.mark.parametrize(u'recurrence_type, days', [(u'daily', None), (u'weekly', u'Tuesday Thursday Saturday'), (u'monthly', None), (u'yearly', None)])
+def test_windows_match_expanding_everything(recurrence_type, days):
+  event = master(recurrence_type, recurrence_days=days, recurrence_interval=3, recurrence_end_date=date(2080, 1, 1))
+  window_start, window_end = datetime(2061, 3, 4, 9, 30, tzinfo=utc), datetime(2066, 8, 1, tzinfo=utc)
+
+  everything = [o for o in recurrence.expand(event) if o.end > window_start and o.start < window_end]
+
+  assert list(recurrence.expand(event, start=window_start, end=window_end)) == everything
+  assert everything
+
+
+def test_occurrences_keep_their_wall_clock_time():
+  chicago = timezone(u'America/Chicago')
+  event = master(u'weekly', start=datetime(2030, 3, 5, 15, tzinfo=utc), recurrence_days=u'Tuesday', recurrence_end_date=date(2030, 3, 19))
+
+  hours = [occurrence.start.hour for occurrence in recurrence.expand(event, tz=chicago)]
+
+  # Daylight saving time starts on the 10th
+  assert hours == [15, 14, 14]
+
+
+def test_deleted_and_modified_occurrences():
+  moved = ExchangeModifiedOccurrence(
+    id=u'moved', change_key=u'ck', start=START + timedelta(days=1, hours=3), end=START + timedelta(days=1, hours=5),
+    original_start=START + timedelta(days=1),
+  )
+  event = master(
+    u'daily', recurrence_end_date=date(2050, 5, 23),
+    deleted_occurrences=[START + timedelta(days=2)], modified_occurrences=[moved],
+  )
+
+  occurrences = list(recurrence.expand(event))
+
+  assert [occurrence.index for occurrence in occurrences] == [1, 2, 4]
+  assert (occurrences[1].start, occurrences[1].end, occurrences[1].id) == (moved.start, moved.end, u'moved')
+  assert occurrences[1].original_start == moved.original_start
@@ -0,0 +1,109 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+from pytest import raises
+
+from pyexchange.exceptions import ExchangeServerBusyException, FailedExchangeException
+from pyexchange.retry import RetryPolicy
+
+from .fixtures import FakeClock
+
+
+def fake_policy(**kwargs):
+  clock = FakeClock()
+  return RetryPolicy(sleep=clock.sleep, clock=clock, **kwargs), clock
+
+
+def failing(*errors):
+  """ A function that raises each of errors in turn, then returns how much time it was given the last time. """
+  errors = list(errors)
+
+  def func(remaining):
+    if errors:
+      raise errors.pop(0)
+    return remaining
+
+  return func
+
+
+def test_delay_grows_exponentially_with_jitter():
+  policy = RetryPolicy(base_delay=1, max_delay=100)
+
+  for attempt in range(5):
+    for _ in range(20):
+      assert 0 <= policy.delay(attempt) <= 2 ** attempt
+
+
+def test_delay_is_capped():
+  policy = RetryPolicy(base_delay=1, max_delay=3)
+
+  assert all(policy.delay(10) <= 3 for _ in range(20))
+
+
+def test_delay_honors_the_servers_back_off():
+  policy = RetryPolicy(base_delay=1, max_delay=3)
+
+  assert policy.delay(0, back_off=7.5) == 7.5
+
+
+def test_call_retries_until_it_works():
+  policy, clock = fake_policy()
+
+  policy.call(failing(ExchangeServerBusyException(u'busy'), ExchangeServerBusyException(u'busy')), retries=2, timeout=None, retry_on=(ExchangeServerBusyException,))
+
+  assert len(clock.sleeps) == 2
+
+
+def test_call_gives_up_after_retries():
+  policy, clock = fake_policy()
+
+  with raises(ExchangeServerBusyException):
+    policy.call(failing(*[ExchangeServerBusyException(u'busy')] * 3), retries=2, timeout=None, retry_on=(ExchangeServerBusyException,))
+
+  assert len(clock.sleeps) == 2
+
+
+def test_call_does_not_retry_other_errors():
+  policy, clock = fake_policy()
+
+  with raises(FailedExchangeException):
+    policy.call(failing(FailedExchangeException(u'nope')), retries=2, timeout=None, retry_on=(ExchangeServerBusyException,))
+
+  assert clock.sleeps == []
+
+
+def test_call_waits_for_the_back_off_hint():
+  policy, clock = fake_policy(base_delay=0.001)
+
+  policy.call(failing(ExchangeServerBusyException(u'busy', back_off=5)), retries=2, timeout=None, retry_on=(ExchangeServerBusyException,))
+
+  assert clock.sleeps == [5]
+
+
+def test_call_does_not_wait_past_the_deadline():
+  policy, clock = fake_policy()
+
+  with raises(ExchangeServerBusyException):
+    policy.call(failing(ExchangeServerBusyException(u'busy', back_off=60)), retries=2, timeout=30, retry_on=(ExchangeServerBusyException,))
+
+  assert clock.sleeps == []
+
+
+def test_attempts_get_the_time_that_is_left():
+  policy, clock = fake_policy(base_delay=0.001)
+
+  remaining = policy.call(failing(ExchangeServerBusyException(u'busy', back_off=10)), retries=2, timeout=30, retry_on=(ExchangeServerBusyException,))
+
+  assert remaining == 20
+
+
+def test_next_delay_says_when_to_stop():
+  policy, clock = fake_policy(base_delay=1)
+
+  assert 0 <= policy.next_delay(0, retries=1, deadline=None) <= 1
+  assert policy.next_delay(1, retries=1, deadline=None) is None
+  assert policy.next_delay(0, retries=1, deadline=clock.now + 5, back_off=10) is None
+  assert clock.sleeps == []
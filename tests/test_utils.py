@@ -2,7 +2,7 @@ from datetime import datetime
 from pytz import timezone, utc
 from pytest import mark
 
-from pyexchange.utils import convert_datetime_to_utc
+from pyexchange.utils import convert_datetime_to_utc, localize
 
 
 def test_converting_none_returns_none():
@@ -22,3 +22,12 @@ def test_converting_tz_aware_date_returns_tz_aware_date():
   utc_time = utc.localize(datetime(year=2014, month=4, day=1, hour=8, minute=0, second=0))
 
   assert convert_datetime_to_utc(pacific_time) == utc_time
+
+def test_localize_uses_the_zone_offset_in_effect_on_the_day():
+  pacific = timezone("US/Pacific")
+
+  assert localize(pacific, datetime(2014, 1, 1, 9)).utcoffset() == pacific.localize(datetime(2014, 1, 1, 9)).utcoffset()
+  assert localize(pacific, datetime(2014, 7, 1, 9)).astimezone(utc) == datetime(2014, 7, 1, 16, tzinfo=utc)
+
+def test_localize_works_with_plain_tzinfo():
+  assert localize(utc, datetime(2014, 1, 1, 9)) == datetime(2014, 1, 1, 9, tzinfo=utc)